@@ -0,0 +1,50 @@
+"""
+Benchmark de services/analytics.py sobre progresso sintético.
+
+Uso: python benchmarks/analytics_benchmark.py [linhas] [exercícios]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analytics import analyze_progress  # noqa: E402
+
+
+def synthetic_progress(rows: int, exercises: int, seed: int = 42):
+    """Progresso de um ano: datas ordenadas, exercício aleatório, carga com tendência."""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    recorded_at = np.sort(now - rng.random(rows) * 365 * 86400)
+    exercise_idx = rng.integers(0, exercises, rows)
+    base = rng.uniform(10, 120, exercises)[exercise_idx]
+    elapsed_weeks = (recorded_at - recorded_at[0]) / (7 * 86400)
+    load = np.round(base + elapsed_weeks * 0.3 + rng.normal(0, 2.5, rows), 1)
+    return recorded_at, exercise_idx, np.clip(load, 1, None)
+
+
+def run(rows: int = 1_000_000, exercises: int = 300, repeat: int = 5) -> None:
+    recorded_at, exercise_idx, load = synthetic_progress(rows, exercises)
+    analyze_progress(recorded_at, exercise_idx, load)  # aquecimento
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = analyze_progress(recorded_at, exercise_idx, load)
+        timings.append(time.perf_counter() - start)
+
+    print(f"Linhas: {rows:,} | exercícios: {exercises} | repetições: {repeat}")
+    print(f"Melhor: {min(timings) * 1000:.1f} ms | mediana: {np.median(timings) * 1000:.1f} ms")
+    print(
+        f"Exercícios analisados: {len(result.exercise_idx)} | "
+        f"semanas: {len(result.weekly_volume)} | "
+        f"tendência média do 1RM: {result.e1rm_trend.mean():.2f} kg/semana"
+    )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
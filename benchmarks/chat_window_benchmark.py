@@ -0,0 +1,134 @@
+"""
+Mede a abertura do chat do treinador com históricos de tamanhos diferentes
+e a rolagem pelo histórico inteiro com a ChatWindow.
+
+O histórico é servido por uma versão em memória do RPC
+get_trainer_history_page (mesmos cursores p_before/p_after/p_limit).
+Abrir o chat deve custar o mesmo com 100 ou 10.000 mensagens, e a
+ListView nunca passa de MAX_CHAT_CONTROLS balões, por mais que se role.
+
+Uso: python benchmarks/chat_window_benchmark.py
+"""
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flet as ft  # noqa: E402
+from pages.trainer_chat.chat_window import ChatWindow, MAX_CHAT_CONTROLS  # noqa: E402
+from pages.trainer_chat.message import ChatMessage  # noqa: E402
+
+
+class HistoryRPC:
+    """get_trainer_history_page sobre uma lista em memória."""
+
+    def __init__(self, size: int):
+        self.messages = [
+            {
+                "role": "user" if n % 2 == 0 else "assistant",
+                "content": f"Mensagem {n + 1}",
+                "timestamp": "2026-10-19T10:00:00",
+            }
+            for n in range(size)
+        ]
+        self.calls = 0
+
+    def rpc(self, name, params):
+        self.calls += 1
+        before, after, limit = params["p_before"], params["p_after"], params["p_limit"]
+        rows = [{"seq": n + 1, "message": m} for n, m in enumerate(self.messages)]
+        if before is not None:
+            rows = [r for r in rows if r["seq"] < before]
+        if after is not None:
+            rows = rows[after : after + limit]
+        else:
+            rows = rows[-limit:]
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=rows))
+
+
+class CountingPage:
+    """Página mínima: sessão, threads executadas na hora e contador de envios."""
+
+    window = None
+
+    def __init__(self):
+        self.session = self
+        self._values = {}
+        self.updates = 0
+
+    def get(self, key):
+        return self._values.get(key)
+
+    def set(self, key, value):
+        self._values[key] = value
+
+    def update(self, *controls):
+        self.updates += 1
+
+    def run_task(self, handler, *args):
+        # O UpdateScheduler agenda o envio do quadro; aqui ele é descartado
+        handler(*args).close()
+
+    def run_thread(self, handler, *args):
+        handler(*args)
+
+
+def built_messages() -> int:
+    """Balões construídos até agora (instâncias novas, sem contar reuso)."""
+    return ChatMessage.built
+
+
+def open_chat(size: int):
+    rpc = HistoryRPC(size)
+    page = CountingPage()
+    list_view = ft.ListView()
+    list_view.page = page
+    window = ChatWindow(
+        page, SimpleNamespace(client=rpc), list_view, None, {}, "user-1"
+    )
+    started = time.perf_counter()
+    window.open()
+    return window, rpc, (time.perf_counter() - started) * 1000
+
+
+def run() -> None:
+    original_init = ChatMessage.__init__
+    ChatMessage.built = 0
+
+    def counting_init(self, *args, **kwargs):
+        ChatMessage.built += 1
+        original_init(self, *args, **kwargs)
+
+    ChatMessage.__init__ = counting_init
+
+    for size in (100, 1_000, 10_000):
+        window, _, elapsed = open_chat(size)
+        print(
+            f"Histórico {size:>6}: abertura {elapsed:6.2f} ms, "
+            f"{len(window.controls)} balões na lista"
+        )
+
+    window, rpc, _ = open_chat(2_000)
+    ChatMessage.built = 0
+    peak = len(window.controls)
+    while window.has_older:
+        window.load_older()
+        peak = max(peak, len(window.controls))
+    oldest = window.controls[1].seq
+    while not window.at_latest:
+        window.load_newer()
+        peak = max(peak, len(window.controls))
+    newest = window.controls[-1].seq
+    print(
+        f"Rolagem 2000 → 1 → 2000: {rpc.calls} páginas, pico {peak} balões "
+        f"(limite {MAX_CHAT_CONTROLS}), {built_messages()} construídos, "
+        f"seq {oldest}..{newest}"
+    )
+    assert peak <= MAX_CHAT_CONTROLS and oldest == 1 and newest == 2_000
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,145 @@
+"""
+Compara o carregamento do feed da comunidade antes e depois da view
+`community_feed`, contra um servidor local que imita o PostgREST.
+
+O fluxo antigo (vitórias + public_profile_info + user_profiles +
+victory_likes + curtidas do usuário) é reproduzido aqui como referência;
+o fluxo atual é o próprio CommunityService.
+
+Uso: python benchmarks/community_feed_benchmark.py [vitórias] [latência_ms]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase import create_client  # noqa: E402
+from pages.community.service import CommunityService, FEED_PAGE_SIZE  # noqa: E402
+
+USER_ID = str(uuid.uuid4())
+
+
+def build_dataset(total: int):
+    now = datetime.now(timezone.utc)
+    authors = [str(uuid.uuid4()) for _ in range(max(total // 5, 1))]
+    victories = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": authors[i % len(authors)],
+            "content": f"Vitória {i}",
+            "category": "Força",
+            "created_at": (now - timedelta(minutes=i)).isoformat(),
+            "likes_count": i % 7,
+        }
+        for i in range(total)
+    ]
+    profiles = [{"user_id": a, "name": f"Atleta {n}"} for n, a in enumerate(authors)]
+    likes = [
+        {"victory_id": v["id"], "user_id": USER_ID}
+        for v in victories[::3]
+    ]
+    feed = [
+        dict(
+            v,
+            author_name=f"Atleta {authors.index(v['user_id'])}",
+            liked_by_me=(i % 3 == 0),
+        )
+        for i, v in enumerate(victories)
+    ]
+    return {
+        "victories": victories,
+        "public_profile_info": profiles,
+        "user_profiles": profiles,
+        "victory_likes": likes,
+        "community_feed": feed,
+    }
+
+
+class PostgrestStandIn(BaseHTTPRequestHandler):
+    """Responde GET /rest/v1/<tabela> com as linhas da tabela (sem filtros)."""
+
+    dataset = {}
+    requests = 0
+    latency = 0.0
+
+    def do_GET(self):
+        type(self).requests += 1
+        time.sleep(self.latency)
+        table = urlparse(self.path).path.rsplit("/", 1)[-1]
+        body = json.dumps(self.dataset.get(table, [])[:FEED_PAGE_SIZE]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_feed(client, user_id: str):
+    """Fluxo anterior à view: cinco requisições sequenciais por página."""
+    victories = (
+        client.table("victories")
+        .select("id, user_id, content, category, created_at")
+        .order("created_at", desc=True)
+        .limit(FEED_PAGE_SIZE)
+        .execute()
+        .data
+    )
+    user_ids = [v["user_id"] for v in victories]
+    victory_ids = [v["id"] for v in victories]
+    client.table("public_profile_info").select("user_id, name").in_(
+        "user_id", user_ids
+    ).execute()
+    client.table("user_profiles").select("user_id, name").in_(
+        "user_id", user_ids
+    ).execute()
+    client.table("victory_likes").select("victory_id").in_(
+        "victory_id", victory_ids
+    ).execute()
+    client.table("victory_likes").select("victory_id").eq("user_id", user_id).in_(
+        "victory_id", victory_ids
+    ).execute()
+    return victories
+
+
+def measure(label, fn, repeat):
+    PostgrestStandIn.requests = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(
+        f"{label:<22} {PostgrestStandIn.requests / repeat:>4.0f} requisições/página  "
+        f"{elapsed * 1000:>7.1f} ms/página"
+    )
+
+
+def run(total: int = 500, latency_ms: float = 40.0, repeat: int = 10) -> None:
+    PostgrestStandIn.dataset = build_dataset(total)
+    PostgrestStandIn.latency = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PostgrestStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = create_client(f"http://127.0.0.1:{server.server_port}", "bench.anon.key")
+    service = CommunityService(SimpleNamespace(client=client))
+
+    print(f"Vitórias: {total} | latência simulada: {latency_ms:.0f} ms por requisição")
+    measure("Antes (5 consultas)", lambda: legacy_feed(client, USER_ID), repeat)
+    measure("community_feed", lambda: service.fetch_victories_page("Todas"), repeat)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:3]]
+    run(int(args[0]) if args else 500, *(args[1:2]))
@@ -0,0 +1,116 @@
+"""
+Tamanho do payload da página /history para um usuário com muito progresso.
+
+Compara, em JSON, o que cada caminho transfere:
+
+- linhas de progress com o exercício aninhado (carregamento original);
+- janela colunar de 365 dias (get_history_columns antes do teto);
+- janela colunar de 90 dias, ou `truncated` acima de HISTORY_MAX_ROWS;
+- agregados do período inteiro (get_history_stats).
+
+Os agregados são montados com HistoryStats no mesmo formato que a RPC
+devolve (load_progression como lista).
+
+Uso: python benchmarks/history_payload_benchmark.py [registros_por_dia] [exercícios]
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.analytics_benchmark import synthetic_progress  # noqa: E402
+from services.history_stats import (  # noqa: E402
+    HistoryStats,
+    HISTORY_MAX_ROWS,
+    HISTORY_WINDOW_DAYS,
+)
+
+MUSCLES = ["Peito", "Costas", "Pernas", "Ombros", "Bíceps", "Tríceps", "Abdômen"]
+
+
+def _size(payload) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:,.1f} KB"
+
+
+def columns_payload(exercises, recorded_at, exercise_idx, load, days, max_rows=None):
+    """Formato de get_history_columns para os últimos `days` dias."""
+    start = int(np.searchsorted(recorded_at, time.time() - days * 86400))
+    rows = len(recorded_at) - start
+    truncated = max_rows is not None and rows > max_rows
+    window = slice(len(recorded_at), None) if truncated else slice(start, None)
+    return {
+        "truncated": truncated,
+        "total_plans": 6,
+        "total_exercises": 48,
+        "plans_by_day": {},
+        "exercises_by_muscle": {},
+        "exercises": exercises,
+        "recorded_at": [round(float(t), 3) for t in recorded_at[window]],
+        "exercise_idx": [int(i) for i in exercise_idx[window]],
+        "load": [float(v) for v in load[window]],
+    }
+
+
+def run(per_day: int = 20, exercise_count: int = 60) -> None:
+    rows = per_day * 365
+    recorded_at, exercise_idx, load = synthetic_progress(rows, exercise_count)
+    exercises = [
+        {
+            "id": f"ex-{i:04d}",
+            "nome": f"Exercício {i}",
+            "grupo_muscular": MUSCLES[i % len(MUSCLES)],
+        }
+        for i in range(exercise_count)
+    ]
+
+    nested_rows = [
+        {
+            "id": i,
+            "exercise_id": exercises[int(e)]["id"],
+            "load": float(v),
+            "recorded_at": datetime.fromtimestamp(t, tz=timezone.utc).isoformat(),
+            "exercicios": {
+                "nome": exercises[int(e)]["nome"],
+                "grupo_muscular": exercises[int(e)]["grupo_muscular"],
+            },
+        }
+        for i, (t, e, v) in enumerate(zip(recorded_at, exercise_idx, load))
+    ]
+
+    year = columns_payload(exercises, recorded_at, exercise_idx, load, 365)
+    window = columns_payload(
+        exercises, recorded_at, exercise_idx, load, HISTORY_WINDOW_DAYS, HISTORY_MAX_ROWS
+    )
+
+    stats = HistoryStats(year).statistics(365)
+    aggregate = dict(stats)
+    aggregate.pop("workout_frequency")
+    aggregate.pop("avg_exercises_per_plan")
+    aggregate["load_progression"] = [
+        {"exercise_name": name, **data} for name, data in stats["load_progression"].items()
+    ]
+
+    status = "truncated" if window["truncated"] else f"{len(window['load']):,} linhas"
+    print(f"Usuário: {rows:,} registros em 365 dias ({per_day}/dia, {exercise_count} exercícios)")
+    for label, payload in (
+        ("Linhas com exercício aninhado (original)", nested_rows),
+        ("Colunar 365 dias (antes do teto)", year),
+        (f"Colunar {HISTORY_WINDOW_DAYS} dias, teto {HISTORY_MAX_ROWS:,} ({status})", window),
+        ("Agregados get_history_stats (Todo período)", aggregate),
+    ):
+        print(f"{label:<48} {_kb(_size(payload)):>12}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
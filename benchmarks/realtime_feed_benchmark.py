@@ -0,0 +1,182 @@
+"""
+Mede a entrega de mudanças do feed da comunidade via Supabase Realtime,
+contra um servidor local que imita o canal Phoenix do Realtime (websocket)
+e o PostgREST (nomes de autores) na mesma porta.
+
+Cada evento publicado pelo servidor chega ao listener já convertido em
+vitória, sem recarregar o feed: só o primeiro insert de cada autor custa
+uma requisição HTTP (nome), os demais saem do cache de autores.
+
+Uso: python benchmarks/realtime_feed_benchmark.py [eventos] [autores]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http import HTTPStatus
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from websockets.asyncio.server import serve  # noqa: E402
+from websockets.protocol import State  # noqa: E402
+from supabase import create_client  # noqa: E402
+from services.author_names import AuthorNameCache  # noqa: E402
+from services.realtime_feed import FeedRealtime  # noqa: E402
+from pages.community.service import CommunityService  # noqa: E402
+
+USER_ID = str(uuid.uuid4())
+
+
+class RealtimeStandIn:
+    """Responde join/heartbeat do Realtime e publica postgres_changes."""
+
+    def __init__(self, authors):
+        self.profiles = [
+            {"user_id": a, "name": f"Atleta {n}"} for n, a in enumerate(authors)
+        ]
+        self.http_requests = 0
+        self.bindings = {}
+        self.socket = None
+        self.joined = asyncio.Event()
+
+    def process_request(self, connection, request):
+        if request.path.startswith("/rest/v1/"):
+            self.http_requests += 1
+            response = connection.respond(HTTPStatus.OK, json.dumps(self.profiles))
+            response.headers["Content-Type"] = "application/json"
+            return response
+        return None
+
+    async def handler(self, socket):
+        self.socket = socket
+        async for raw in socket:
+            if socket.state is not State.OPEN:
+                break
+            msg = json.loads(raw)
+            if msg["event"] == "phx_join":
+                changes = msg["payload"]["config"]["postgres_changes"]
+                for i, change in enumerate(changes, start=1):
+                    change["id"] = i
+                    self.bindings.setdefault(
+                        (change["table"], change["event"]), []
+                    ).append(i)
+                await self.reply(msg, {"postgres_changes": changes})
+                self.joined.set()
+            elif msg["event"] in ("heartbeat", "access_token", "phx_leave"):
+                await self.reply(msg, {})
+
+    async def reply(self, msg, response):
+        await self.socket.send(
+            json.dumps(
+                {
+                    "topic": msg["topic"],
+                    "event": "phx_reply",
+                    "payload": {"status": "ok", "response": response},
+                    "ref": msg["ref"],
+                }
+            )
+        )
+
+    async def publish(self, table, event, record, old_record=None):
+        await self.socket.send(
+            json.dumps(
+                {
+                    "topic": "realtime:community-feed",
+                    "event": "postgres_changes",
+                    "payload": {
+                        "ids": self.bindings.get((table, event), []),
+                        "data": {
+                            "type": event,
+                            "table": table,
+                            "schema": "public",
+                            "record": record,
+                            "old_record": old_record or {},
+                        },
+                    },
+                    "ref": None,
+                }
+            )
+        )
+
+
+def victory_row(author: str, n: int):
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": author,
+        "content": f"Vitória {n}",
+        "category": "Força",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "likes_count": 0,
+    }
+
+
+async def run(total: int = 200, author_count: int = 10) -> None:
+    authors = [str(uuid.uuid4()) for _ in range(author_count)]
+    stand_in = RealtimeStandIn(authors)
+    AuthorNameCache.get_instance().invalidate()
+
+    async with serve(
+        stand_in.handler, "127.0.0.1", 0, process_request=stand_in.process_request
+    ) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = create_client(f"http://127.0.0.1:{port}", "bench.anon.key")
+        # Como no Flet, o listener roda fora do loop de eventos
+        page = SimpleNamespace(
+            run_thread=lambda handler, *args: threading.Thread(
+                target=handler, args=args, daemon=True
+            ).start()
+        )
+        supabase_service = SimpleNamespace(client=client, page=page)
+        service = CommunityService(supabase_service)
+
+        received = {}
+        applied = []
+
+        def listener(event, table, record, old_record):
+            if table == "victories" and event == "INSERT":
+                applied.append(service.victory_from_record(record))
+            received[(event, record.get("id") or old_record.get("id"))] = (
+                time.perf_counter()
+            )
+
+        feed = FeedRealtime(supabase_service)
+        feed.listener = listener
+        await feed.start(USER_ID)
+        await asyncio.wait_for(stand_in.joined.wait(), 5)
+
+        sent = {}
+        for n in range(total):
+            row = victory_row(authors[n % author_count], n)
+            sent[("INSERT", row["id"])] = time.perf_counter()
+            await stand_in.publish("victories", "INSERT", row)
+        deleted = next(iter(sent))[1]
+        sent[("DELETE", deleted)] = time.perf_counter()
+        await stand_in.publish("victories", "DELETE", {}, {"id": deleted})
+
+        deadline = time.perf_counter() + 10
+        while len(received) < len(sent) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        await feed.close()
+
+    latencies = [(received[k] - sent[k]) * 1000 for k in sent if k in received]
+    assert len(applied) == total, f"{len(applied)} de {total} inserts aplicados"
+    names = {p["name"] for p in stand_in.profiles}
+    assert all(v.author_name in names for v in applied), "autor sem nome"
+    print(f"Eventos: {total} inserts + 1 delete | autores: {author_count}")
+    print(f"Recebidos: {len(latencies)} | requisições HTTP: {stand_in.http_requests}")
+    print(
+        f"Latência evento→listener: mediana {statistics.median(latencies):.2f} ms, "
+        f"máx {max(latencies):.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run(*args))
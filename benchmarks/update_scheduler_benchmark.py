@@ -0,0 +1,96 @@
+"""
+Conta as mensagens de atualização enviadas ao cliente Flet em uma sessão
+de treino simulada: iniciar o treino (enable_controls em todos os
+exercícios) e marcar as séries em sequência rápida.
+
+Antes, cada ExerciseTile chamava `update()` a cada mudança; com o
+UpdateScheduler as mudanças do mesmo quadro seguem em um só envio.
+
+Uso: python benchmarks/update_scheduler_benchmark.py [exercicios] [series]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.update_scheduler import UpdateScheduler  # noqa: E402
+from pages.training.exercise_tile import ExerciseTile  # noqa: E402
+
+
+class CountingPage:
+    """
+    Página mínima: sessão, run_task no loop atual e contador de envios.
+    `open` (snackbars) envia a própria mensagem, como no Flet.
+    """
+
+    def __init__(self):
+        self.session = self
+        self._values = {}
+        self.snack_bar = None
+        self.updates = 0
+        self.controls_sent = 0
+        self.page_updates = 0
+        self.overlays = 0
+
+    def get(self, key):
+        return self._values.get(key)
+
+    def set(self, key, value):
+        self._values[key] = value
+
+    def run_task(self, handler, *args):
+        return asyncio.get_running_loop().create_task(handler(*args))
+
+    def update(self, *controls):
+        self.updates += 1
+        self.controls_sent += len(controls)
+        if not controls:
+            self.page_updates += 1
+
+    def open(self, control):
+        control.open = True
+        self.overlays += 1
+
+
+def mount(control, page) -> None:
+    """Liga o controle e seus filhos à página, como faz o Flet ao adicioná-lo."""
+    control.page = page
+    for child in control._get_children():
+        mount(child, page)
+
+
+async def run(exercise_count: int = 8, series: int = 4) -> None:
+    page = CountingPage()
+    tiles = [
+        ExerciseTile(f"Exercício {n}", series, 10, 20.0, page=page)
+        for n in range(exercise_count)
+    ]
+    for tile in tiles:
+        mount(tile, page)
+
+    started = time.perf_counter()
+    for tile in tiles:
+        tile.enable_controls()
+    for tile in tiles:
+        for index in range(series):
+            tile._toggle_series(index)
+        # Intervalo entre séries reais é de segundos; aqui, um quadro
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.05)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    stats = UpdateScheduler.get(page).stats()
+    print(f"Exercícios: {exercise_count} | séries: {series}")
+    print(f"Atualizações pedidas (antes: uma mensagem cada): {stats['requested']}")
+    print(f"Mensagens enviadas: {page.updates} ({page.controls_sent} controles)")
+    print(f"Snackbars (page.open): {page.overlays}")
+    assert page.page_updates == 0, "a página inteira não deveria ser reenviada"
+    print(f"Tempo total: {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(run(*args))
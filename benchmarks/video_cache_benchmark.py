@@ -0,0 +1,113 @@
+"""
+Exercita o VideoCache contra um servidor HTTP local que imita o Supabase
+Storage (GET/HEAD com ETag):
+
+- primeira abertura baixa o vídeo; as seguintes saem do disco;
+- ETag nova no servidor troca o arquivo; sem conexão, a cópia local serve;
+- acima do limite de espaço, os vídeos menos usados saem primeiro;
+- o vídeo em reprodução (fixado) não sai até o player liberá-lo.
+
+Uso: python benchmarks/video_cache_benchmark.py [videos] [tamanho_kb]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.video_cache import VideoCache  # noqa: E402
+
+
+class StorageStandIn(BaseHTTPRequestHandler):
+    videos = {}
+    versions = {}
+    gets = 0
+
+    def _headers(self):
+        name = self.path.rsplit("/", 1)[-1]
+        if name not in self.videos:
+            self.send_response(404)
+            self.end_headers()
+            return None
+        body = self.videos[name]
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", f'"{name}-v{self.versions[name]}"')
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        self._headers()
+
+    def do_GET(self):
+        body = self._headers()
+        if body is not None:
+            type(self).gets += 1
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run(count: int = 8, size_kb: int = 2048) -> None:
+    for n in range(count):
+        StorageStandIn.videos[f"ex{n}.mp4"] = os.urandom(size_kb * 1024)
+        StorageStandIn.versions[f"ex{n}.mp4"] = 1
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StorageStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/storage/v1/object/public/videos"
+    urls = [f"{base}/ex{n}.mp4" for n in range(count)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Espaço para todos menos dois vídeos
+        cache = VideoCache(cache_dir, max_bytes=(count - 2) * size_kb * 1024)
+
+        cache.prefetch(urls)
+        while cache._queued:
+            time.sleep(0.01)
+        print(f"Prefetch de {count} vídeos: {StorageStandIn.gets} downloads")
+        cached = [u for u in urls if cache.local_path(u)]
+        print(f"No disco após LRU: {len(cached)} de {count} (limite {count - 2})")
+        assert cached == urls[2:], "LRU deveria remover os dois mais antigos"
+
+        gets = StorageStandIn.gets
+        path, first = timed(cache.fetch, urls[-1])
+        _, replay = timed(cache.source_for, urls[-1])
+        assert StorageStandIn.gets == gets and path.startswith(cache_dir)
+        print(f"Revalidação por ETag: {first:.1f} ms | replay do disco: {replay:.2f} ms")
+
+        StorageStandIn.versions[f"ex{count - 1}.mp4"] += 1
+        new_path = cache.fetch(urls[-1])
+        assert new_path != path and not os.path.exists(path)
+        print("ETag nova: vídeo baixado de novo, versão antiga removida")
+
+        server.shutdown()
+        server.server_close()
+        offline = cache.fetch(urls[-1])
+        assert offline == new_path
+        print("Sem conexão: cópia local usada")
+
+        playing = cache.source_for(urls[-1], pin=True)
+        cache.max_bytes = 0
+        cache.evict()
+        assert os.path.exists(playing) and not cache.local_path(urls[2])
+        cache.unpin(playing)
+        cache.evict()
+        assert not os.path.exists(playing)
+        print("Vídeo em reprodução mantido na limpeza até o player liberar")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
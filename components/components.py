@@ -3,6 +3,7 @@ import flet as ft
 import threading
 import time
 from flet import Icons
+from core.update_scheduler import schedule_update
 
 
 class CustomListTile(ft.ListTile):
@@ -439,13 +440,13 @@ class LoadEditor(ft.Row):
         self.enabled = True
         self.edit_button.disabled = False
         self.save_button.disabled = False
-        self.update()
+        schedule_update(self.page, self)
 
     def disable(self):
         self.enabled = False
         self.edit_button.disabled = True
         self.save_button.disabled = True
-        self.update()
+        schedule_update(self.page, self)
 
 
 # Componentes de Diálogos
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+import flet as ft
+from core.update_scheduler import schedule_update
+
+TICKER_SESSION_KEY = "supafit.ticker"
+# Intervalo entre atualizações dos timers (segundos)
+TICK_INTERVAL = 1.0
+
+# callback(agora) -> controles alterados no tick
+TickCallback = Callable[[float], Optional[Iterable[ft.Control]]]
+
+
+class Ticker:
+    """
+    Relógio único da página para os timers (treino e intervalo).
+
+    Uma só tarefa asyncio no loop do Flet (`page.run_task`) acorda a cada
+    `TICK_INTERVAL`, alinhada ao relógio monotônico para não acumular atraso,
+    e chama os assinantes com `time.monotonic()`. Cada timer calcula o tempo
+    exibido a partir desse instante, altera os controles e os retorna; o
+    ticker envia só esses controles em uma única atualização agendada por
+    tick. A tarefa termina quando não há assinantes.
+    """
+
+    def __init__(self, page: ft.Page, interval: float = TICK_INTERVAL):
+        self.page = page
+        self.interval = interval
+        self._subscribers: Dict[int, TickCallback] = {}
+        self._next_token = 0
+        self._running = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, page: ft.Page) -> "Ticker":
+        """Ticker da sessão (um por página)."""
+        ticker = page.session.get(TICKER_SESSION_KEY)
+        if ticker is None:
+            ticker = cls(page)
+            page.session.set(TICKER_SESSION_KEY, ticker)
+        return ticker
+
+    def subscribe(self, callback: TickCallback) -> int:
+        """
+        Registra `callback(agora)`, que retorna os controles alterados, e
+        retorna o token para cancelar.
+        """
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._subscribers[token] = callback
+            start = not self._running
+            self._running = True
+        if start:
+            self.page.run_task(self._run)
+        return token
+
+    def unsubscribe(self, token: Optional[int]) -> None:
+        if token is None:
+            return
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    async def _run(self) -> None:
+        origin = time.monotonic()
+        while True:
+            elapsed = time.monotonic() - origin
+            await asyncio.sleep(self.interval - elapsed % self.interval)
+            with self._lock:
+                callbacks = list(self._subscribers.values())
+                if not callbacks:
+                    self._running = False
+                    return
+            now = time.monotonic()
+            changed: List[ft.Control] = []
+            for callback in callbacks:
+                try:
+                    changed.extend(callback(now) or ())
+                except Exception as e:
+                    print(f"ERROR - ticker: Erro em assinante do ticker: {str(e)}")
+            if changed:
+                schedule_update(self.page, *changed)
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from typing import Dict, Optional
+import flet as ft
+
+UPDATE_SCHEDULER_SESSION_KEY = "supafit.update_scheduler"
+# Janela de agrupamento das atualizações (um quadro entre 16 e 33 ms)
+FRAME_INTERVAL = 0.025
+
+
+class UpdateScheduler:
+    """
+    Agrupa as atualizações de controles da página em um envio por quadro.
+
+    Cada `page.update()`/`control.update()` serializa e envia uma mensagem
+    ao cliente Flutter. Aqui os controles são apenas marcados como sujos;
+    no fim do quadro todos seguem em um único `page.update(*controles)` (ou
+    `page.update()` se a página inteira foi marcada). `requested` e `sent`
+    contam pedidos e mensagens efetivamente enviadas.
+    """
+
+    def __init__(self, page: ft.Page, interval: float = FRAME_INTERVAL):
+        self.page = page
+        self.interval = interval
+        self._dirty: Dict[int, ft.Control] = {}
+        self._page_dirty = False
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self.requested = 0
+        self.sent = 0
+
+    @classmethod
+    def get(cls, page: ft.Page) -> "UpdateScheduler":
+        """Agendador da sessão (um por página)."""
+        scheduler = page.session.get(UPDATE_SCHEDULER_SESSION_KEY)
+        if scheduler is None:
+            scheduler = cls(page)
+            page.session.set(UPDATE_SCHEDULER_SESSION_KEY, scheduler)
+        return scheduler
+
+    def mark(self, *controls: ft.Control) -> None:
+        """Marca controles (ou, sem argumentos, a página) para o próximo quadro."""
+        with self._lock:
+            self.requested += 1
+            if controls:
+                for control in controls:
+                    self._dirty[id(control)] = control
+            else:
+                self._page_dirty = True
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.page.run_task(self._flush_later)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        self.flush()
+
+    def flush(self) -> None:
+        """Envia agora o que estiver pendente, em uma única mensagem."""
+        with self._lock:
+            controls = list(self._dirty.values())
+            page_dirty = self._page_dirty
+            self._dirty.clear()
+            self._page_dirty = False
+            self._scheduled = False
+        try:
+            if page_dirty:
+                self.page.update()
+            else:
+                # Controles removidos da página antes do quadro são ignorados
+                controls = [c for c in controls if c.page]
+                if not controls:
+                    return
+                self.page.update(*controls)
+            self.sent += 1
+        except Exception as e:
+            print(f"ERROR - update_scheduler: Erro ao enviar atualização: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"requested": self.requested, "sent": self.sent}
+
+
+def schedule_update(page: Optional[ft.Page], *controls: ft.Control) -> None:
+    """
+    Atalho para `UpdateScheduler.get(page).mark(*controles)`; sem controles,
+    a página inteira é atualizada no próximo quadro.
+    """
+    if page:
+        UpdateScheduler.get(page).mark(*controls)
@@ -0,0 +1,140 @@
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set
+import flet as ft
+
+VIEW_CACHE_SESSION_KEY = "supafit.view_cache"
+
+
+@dataclass
+class ViewCachePolicy:
+    """Regras de cache de uma rota."""
+
+    # Tempo (segundos) até a view ser considerada desatualizada
+    ttl: float = 300.0
+    # Eventos de dados que invalidam a view (ex.: "plans", "progress")
+    tags: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class CachedView:
+    """Entrada do cache: a view construída e como reconstruí-la."""
+
+    view: ft.View
+    builder: Callable[[], ft.View]
+    built_at: float
+    refreshing: bool = False
+
+
+class ViewCache:
+    """
+    Cache de views por rota com limite de tamanho (LRU).
+
+    Apenas rotas com política registrada são cacheadas. Uma view dentro do TTL
+    é reutilizada como está; uma view desatualizada também é reutilizada, mas
+    é reconstruída em segundo plano e tem seus controles substituídos quando
+    os dados novos chegam.
+    """
+
+    def __init__(
+        self,
+        page: ft.Page,
+        policies: Dict[str, ViewCachePolicy],
+        max_size: int = 4,
+    ):
+        self.page = page
+        self.policies = policies
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, CachedView]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, route: str) -> bool:
+        return route in self.policies
+
+    def get_or_build(self, route: str, builder: Callable[[], ft.View]) -> ft.View:
+        """Retorna a view em cache para a rota ou constrói uma nova."""
+        if not self.is_cacheable(route):
+            return builder()
+
+        with self._lock:
+            entry = self._entries.get(route)
+            if entry:
+                self._entries.move_to_end(route)
+
+        if entry is None:
+            print(f"INFO - view_cache: Construindo view para {route}")
+            view = builder()
+            self._store(route, CachedView(view, builder, time.monotonic()))
+            return view
+
+        age = time.monotonic() - entry.built_at
+        if age > self.policies[route].ttl and not entry.refreshing:
+            print(
+                f"INFO - view_cache: View de {route} desatualizada ({age:.0f}s), atualizando em segundo plano"
+            )
+            entry.refreshing = True
+            self.page.run_thread(self._refresh, route, entry)
+        else:
+            print(f"INFO - view_cache: Reutilizando view de {route}")
+        return entry.view
+
+    def _store(self, route: str, entry: CachedView) -> None:
+        with self._lock:
+            self._entries[route] = entry
+            self._entries.move_to_end(route)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                print(f"INFO - view_cache: View de {evicted} removida (limite)")
+
+    def _refresh(self, route: str, entry: CachedView) -> None:
+        """Reconstrói a view e aplica os novos controles na view em cache."""
+        try:
+            fresh = entry.builder()
+            with self._lock:
+                if self._entries.get(route) is not entry:
+                    # Invalidada durante a reconstrução; descarta o resultado
+                    return
+                entry.view.controls = fresh.controls
+                entry.built_at = time.monotonic()
+            if entry.view.page:
+                entry.view.update()
+            print(f"INFO - view_cache: View de {route} atualizada")
+        except Exception as e:
+            print(f"ERROR - view_cache: Erro ao atualizar view de {route}: {str(e)}")
+        finally:
+            entry.refreshing = False
+
+    def invalidate(self, route: str) -> None:
+        """Remove a view de uma rota do cache."""
+        with self._lock:
+            if self._entries.pop(route, None):
+                print(f"INFO - view_cache: View de {route} invalidada")
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Remove as views cujas políticas dependem de algum dos eventos."""
+        for route, policy in self.policies.items():
+            if policy.tags.intersection(tags):
+                self.invalidate(route)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        print("INFO - view_cache: Cache de views limpo")
+
+
+def invalidate_views(page: Optional[ft.Page], *tags: str) -> None:
+    """
+    Invalida views em cache da sessão. Sem tags, limpa todo o cache
+    (usado no logout para não exibir dados de outro usuário).
+    """
+    if not page or not page.session:
+        return
+    cache = page.session.get(VIEW_CACHE_SESSION_KEY)
+    if not cache:
+        return
+    if tags:
+        cache.invalidate_tags(*tags)
+    else:
+        cache.clear()
@@ -120,6 +120,9 @@ class AppInitializer:
             if not self.supabase or not self.openai:
                 raise Exception("Falha na inicialização dos serviços")
 
+            # Sincroniza dados offline quando o app volta ao primeiro plano
+            self.page.on_app_lifecycle_state_change = self.handle_lifecycle_change
+
             print("[APP] Serviços inicializados com sucesso")
             return True
 
@@ -128,39 +131,33 @@ class AppInitializer:
             self.show_error_screen("Erro na inicialização dos serviços", str(e))
             return False
 
+    def handle_lifecycle_change(self, e: ft.AppLifecycleStateChangeEvent):
+        """Dispara a sincronização local ao retomar o app."""
+        if e.state == ft.AppLifecycleState.RESUME and self.supabase:
+            self.supabase.sync_engine.request_sync()
+
     def handle_authentication(self) -> str:
         """Gerencia a autenticação e direcionamento do usuário."""
         try:
             print("[APP] Verificando autenticação...")
 
-            # tokens serão lidos do client_storage e usados
-            self.supabase._restore_session()
-
-            if self.supabase.is_authenticated():
-                user = self.supabase.get_current_user()
-                if user:
-                    user_id = user.id
-                    print(f"[APP] Usuário autenticado: {user_id}")
-
-                    profile_response = self.supabase.get_profile(user_id)
-                    if profile_response.data and len(profile_response.data) > 0:
-                        profile = profile_response.data[0]
-                        print(f"[APP] Perfil encontrado: {profile.get('name', 'Usuário')}")
-                        apply_user_preferences(self.page, profile)
-                        self.page.client_storage.set("supafit.user_id", user_id)
-                        self.page.client_storage.set("supafit.profile_created", True)
-                        self.page.client_storage.set(
-                            "supafit.level", profile.get("level", "iniciante")
-                        )
-                        return "/home"
-                    else:
-                        print("[APP] Perfil não encontrado, redirecionando para criação")
-                        self.page.client_storage.set("supafit.user_id", user_id)
-                        self.page.client_storage.set("supafit.profile_created", False)
-                        return "/create_profile"
-
-            print("[APP] Usuário não autenticado, redirecionando para login")
-            return "/login"
+            # Tokens do client_storage validados uma vez, junto com o perfil
+            session = self.supabase.resolve_startup_session()
+
+            if not session.is_authenticated:
+                print("[APP] Usuário não autenticado, redirecionando para login")
+                return "/login"
+
+            print(f"[APP] Usuário autenticado: {session.user_id}")
+            if session.has_profile:
+                print(
+                    f"[APP] Perfil encontrado: {session.profile.get('name', 'Usuário')}"
+                )
+                apply_user_preferences(self.page, session.profile)
+                return "/home"
+
+            print("[APP] Perfil não encontrado, redirecionando para criação")
+            return "/create_profile"
 
         except Exception as e:
             print(f"[APP] Erro na verificação de autenticação: {e}")
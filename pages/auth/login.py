@@ -258,16 +258,11 @@ def LoginPage(page: ft.Page):
             if response and response.user:
                 logger.info(f"Login bem-sucedido para: {email}")
 
-                profile_response = supabase_service.get_profile(response.user.id)
-                profile_exists = bool(
-                    profile_response.data and len(profile_response.data) > 0
-                )
+                # Já carregado pelo login (_check_and_save_user): sem nova consulta
+                profile = supabase_service.load_profile(response.user.id)
+                profile_exists = profile is not None
 
-                level = (
-                    profile_response.data[0].get("level", "iniciante")
-                    if profile_exists
-                    else None
-                )
+                level = profile.get("level", "iniciante") if profile_exists else None
 
                 save_user_data(response.user.id, response.user.email, level)
                 page.close(loading_dialog)
@@ -1,5 +1,6 @@
 import flet as ft
 import logging
+import threading
 
 from utils.alerts import CustomSnackBar
 from .controller import CommunityController
@@ -17,10 +18,15 @@ formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(messag
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# Distância (px) do fim da lista que dispara a próxima página
+LOAD_MORE_THRESHOLD = 300
+
 
 def CommunityTab(page: ft.Page, supabase_service):
     """Aba da comunidade com design profissional e minimalista."""
     controller = CommunityController(page, supabase_service)
+    # Cards visíveis por id, para atualizações pontuais sem recarregar a lista
+    victory_cards = {}
 
     def handle_category_select(e):
         selected_category = e.control.label.value
@@ -31,9 +37,11 @@ def CommunityTab(page: ft.Page, supabase_service):
 
     def handle_post_victory():
         content, category = victory_form.get_form_data()
-        if controller.create_victory(content, category):
+        victory = controller.create_victory(content, category)
+        if victory:
             victory_form.clear_form()
-            update_victories(controller.get_selected_category())
+            if controller.get_selected_category() in ("Todas", victory.category):
+                prepend_victory(victory)
             page.open(
                 ft.SnackBar(
                     ft.Text("Vitória postada com sucesso!"),
@@ -46,13 +54,47 @@ def CommunityTab(page: ft.Page, supabase_service):
         logger.info(
             f"[LIKE_CLICK] Vitória: {victory_id}, Liked atualmente: {currently_liked}"
         )
-        if controller.toggle_like(victory_id, currently_liked):
-            logger.info(
-                f"[LIKE_SUCCESS] Toggle executado com sucesso para {victory_id}"
-            )
-            update_victories(controller.get_selected_category())
-        else:
-            logger.error(f"[LIKE_FAIL] Falha ao alternar like para {victory_id}")
+        if not controller.toggle_like(victory_id, currently_liked):
+            # Não enviado (ex.: sem login): desfaz a atualização otimista
+            handle_like_reverted(victory_id, currently_liked)
+
+    def handle_like_reverted(victory_id: str, liked: bool):
+        card = victory_cards.get(victory_id)
+        if card:
+            card.set_liked(liked)
+
+    def prepend_victory(victory):
+        """Insere uma vitória no topo do feed (post local ou evento remoto)."""
+        if victory.id in victory_cards:
+            return
+        if not victory_cards:
+            # Remove o estado vazio
+            victories_list.controls.clear()
+        victories_list.controls.insert(0, build_victory_card(victory))
+        if victories_list.page:
+            victories_list.update()
+
+    def remove_victory(victory_id: str):
+        card = victory_cards.pop(victory_id, None)
+        if not card:
+            return
+        if card.ref.current in victories_list.controls:
+            victories_list.controls.remove(card.ref.current)
+        if not victory_cards:
+            render_victories([])
+        if victories_list.page:
+            victories_list.update()
+
+    def handle_likes_changed(victory_id: str, likes: int):
+        card = victory_cards.get(victory_id)
+        if card:
+            card.set_likes(likes)
+
+    def handle_liked_changed(victory_id: str, liked: bool):
+        card = victory_cards.get(victory_id)
+        if card:
+            # A contagem chega pelo UPDATE de victories.likes_count
+            card.set_liked(liked, adjust_count=False)
 
     def handle_delete_victory(victory_id: str):
         success, message = controller.delete_victory(
@@ -65,8 +107,8 @@ def CommunityTab(page: ft.Page, supabase_service):
                     bgcolor=ft.Colors.GREEN_600,
                 )
             )
+            remove_victory(victory_id)
             page.update()
-            update_victories(controller.get_selected_category())
         else:
             page.open(
                 ft.SnackBar(
@@ -80,52 +122,20 @@ def CommunityTab(page: ft.Page, supabase_service):
         dialog = VictoryDetailsDialog(victory, page)
         dialog.show()
 
+    def on_victories_update(category: str, victories):
+        """Aplica o feed revalidado se a categoria ainda estiver selecionada."""
+        if controller.get_selected_category() != category:
+            return
+        render_victories(victories)
+        if victories_list.page:
+            victories_list.update()
+
     def update_victories(category: str = "Todas"):
         try:
-            victories_list.controls.clear()
-            victories = controller.load_victories(category)
-
-            if not victories:
-                # Estado vazio melhorado
-                empty_state = ft.Container(
-                    content=ft.Column(
-                        [
-                            ft.Icon(
-                                ft.Icons.CELEBRATION_OUTLINED,
-                                size=48,
-                                color=ft.Colors.GREY_400,
-                            ),
-                            ft.Text(
-                                "Nenhuma vitória encontrada",
-                                size=16,
-                                weight=ft.FontWeight.W_500,
-                                color=ft.Colors.GREY_600,
-                            ),
-                            ft.Text(
-                                "Seja o primeiro a compartilhar uma conquista!",
-                                size=12,
-                                color=ft.Colors.GREY_500,
-                            ),
-                        ],
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        spacing=8,
-                    ),
-                    padding=ft.padding.all(40),
-                    expand=True,
-                    alignment=ft.alignment.center,
-                )
-                victories_list.controls.append(empty_state)
-            else:
-                for victory in victories:
-                    card = VictoryCard(
-                        victory=victory,
-                        user_id=controller.get_current_user_id(),
-                        on_like_click=handle_like_click,
-                        on_delete_click=handle_delete_victory,
-                        on_details_click=handle_show_details,
-                        page=page,
-                    )
-                    victories_list.controls.append(card.build())
+            victories = controller.load_victories(
+                category, lambda fresh: on_victories_update(category, fresh)
+            )
+            render_victories(victories)
 
             page.update()
             logger.info(
@@ -146,13 +156,97 @@ def CommunityTab(page: ft.Page, supabase_service):
             else:
                 logger.error("Page não disponível para exibir SnackBar")
 
+    def build_victory_card(victory):
+        card = VictoryCard(
+            victory=victory,
+            user_id=controller.get_current_user_id(),
+            on_like_click=handle_like_click,
+            on_delete_click=handle_delete_victory,
+            on_details_click=handle_show_details,
+            page=page,
+        )
+        victory_cards[victory.id] = card
+        return card.build()
+
+    def handle_scroll(e: ft.OnScrollEvent):
+        """Carrega a próxima página ao se aproximar do fim da lista."""
+        if (
+            e.max_scroll_extent is not None
+            and e.pixels >= e.max_scroll_extent - LOAD_MORE_THRESHOLD
+            and controller.has_more_victories()
+        ):
+            page.run_thread(load_more_victories)
+
+    def load_more_victories():
+        # Eventos de rolagem chegam em rajada: só a primeira thread segue
+        if not loading_more.acquire(blocking=False):
+            return
+        try:
+            victories_list.controls.append(loading_more_indicator)
+            victories_list.update()
+            try:
+                victories = controller.load_more_victories()
+            finally:
+                if loading_more_indicator in victories_list.controls:
+                    victories_list.controls.remove(loading_more_indicator)
+            victories_list.controls.extend(build_victory_card(v) for v in victories)
+            victories_list.update()
+            logger.info(f"{len(victories)} vitórias adicionadas ao feed")
+        finally:
+            loading_more.release()
+
+    def render_victories(victories):
+        """Reconstrói os cards da lista de vitórias."""
+        victories_list.controls.clear()
+        victory_cards.clear()
+        if not victories:
+            # Estado vazio melhorado
+            empty_state = ft.Container(
+                content=ft.Column(
+                    [
+                        ft.Icon(
+                            ft.Icons.CELEBRATION_OUTLINED,
+                            size=48,
+                            color=ft.Colors.GREY_400,
+                        ),
+                        ft.Text(
+                            "Nenhuma vitória encontrada",
+                            size=16,
+                            weight=ft.FontWeight.W_500,
+                            color=ft.Colors.GREY_600,
+                        ),
+                        ft.Text(
+                            "Seja o primeiro a compartilhar uma conquista!",
+                            size=12,
+                            color=ft.Colors.GREY_500,
+                        ),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=8,
+                ),
+                padding=ft.padding.all(40),
+                expand=True,
+                alignment=ft.alignment.center,
+            )
+            victories_list.controls.append(empty_state)
+        else:
+            victories_list.controls.extend(build_victory_card(v) for v in victories)
+
     # Componentes principais
     victories_list = ft.ListView(
         expand=True,
         spacing=12,
         padding=ft.padding.symmetric(horizontal=16, vertical=8),
-        auto_scroll=True,
         animate_opacity=ft.Animation(300, ft.AnimationCurve.EASE_IN_OUT),
+        on_scroll=handle_scroll,
+        on_scroll_interval=200,
+    )
+
+    loading_more = threading.Lock()
+    loading_more_indicator = ft.Container(
+        content=ft.ProgressRing(width=20, height=20, stroke_width=2),
+        alignment=ft.alignment.center,
+        padding=ft.padding.all(12),
     )
 
     victory_form = VictoryForm(
@@ -170,8 +264,15 @@ def CommunityTab(page: ft.Page, supabase_service):
         padding=ft.padding.symmetric(horizontal=16, vertical=8),
     )
 
-    # Carrega as vitórias iniciais
+    controller.on_like_reverted = handle_like_reverted
+    controller.on_victory_added = prepend_victory
+    controller.on_victory_removed = remove_victory
+    controller.on_likes_changed = handle_likes_changed
+    controller.on_liked_changed = handle_liked_changed
+
+    # Carrega as vitórias iniciais e passa a receber as mudanças em tempo real
     update_victories()
+    controller.start_realtime()
 
     # Layout principal responsivo
     return ft.Container(
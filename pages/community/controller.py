@@ -1,13 +1,106 @@
-import asyncio
 import logging
+import threading
 from datetime import datetime, timezone
-from typing import List
+from typing import Callable, Dict, List, Optional
 from .models import Victory, VictoryPost
 from .service import CommunityService
 from .ui_components import SnackBarHelper
+from services.swr_cache import SWRCache
 
 logger = logging.getLogger("supafit.community.controller")
 
+# Intervalo sem novos toques antes de enviar a curtida ao servidor
+LIKE_DEBOUNCE_SECONDS = 0.6
+
+
+class LikeToggleQueue:
+    """
+    Fila de curtidas com debounce por vitória.
+
+    Toques rápidos na mesma vitória reiniciam o temporizador; ao final, só o
+    estado desejado é comparado com o último estado confirmado e, se
+    diferente, gravado com um único upsert ou delete. A entrada continua na
+    fila enquanto o envio está em curso: toques nesse intervalo esperam a
+    resposta e o próximo envio parte em seguida, nunca em paralelo.
+    """
+
+    def __init__(self, service, user_id: str, on_synced, delay=LIKE_DEBOUNCE_SECONDS):
+        self.service = service
+        self.user_id = user_id
+        self.on_synced = on_synced
+        self.delay = delay
+        self._pending: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def toggle(self, victory_id: str, liked_before: bool, liked_now: bool) -> None:
+        with self._lock:
+            entry = self._pending.get(victory_id)
+            if entry is None:
+                entry = {"confirmed": liked_before, "in_flight": False, "timer": None}
+                self._pending[victory_id] = entry
+            elif entry["timer"]:
+                entry["timer"].cancel()
+            entry["desired"] = liked_now
+            timer = threading.Timer(self.delay, self._flush, args=(victory_id,))
+            timer.daemon = True
+            entry["timer"] = timer
+            timer.start()
+
+    def is_pending(self, victory_id: str) -> bool:
+        """Há toques não enviados ou um envio em curso para esta vitória?"""
+        with self._lock:
+            return victory_id in self._pending
+
+    def _flush(self, victory_id: str) -> None:
+        with self._lock:
+            entry = self._pending.get(victory_id)
+            if not entry:
+                return
+            entry["timer"] = None
+            if entry["in_flight"]:
+                # O envio em curso encadeia este ao terminar
+                return
+        while True:
+            with self._lock:
+                desired, confirmed = entry["desired"], entry["confirmed"]
+                if desired == confirmed:
+                    self._pending.pop(victory_id, None)
+                    logger.info(f"[TOGGLE] Toques em {victory_id} se anularam; nada enviado")
+                    return
+                entry["in_flight"] = True
+
+            success = self.service.set_like(victory_id, self.user_id, desired)
+
+            with self._lock:
+                entry["in_flight"] = False
+                if not success:
+                    # Volta ao último estado confirmado, descartando toques novos
+                    if entry["timer"]:
+                        entry["timer"].cancel()
+                    self._pending.pop(victory_id, None)
+                    follow_up = False
+                else:
+                    entry["confirmed"] = desired
+                    # Toques durante o envio cujo debounce já venceu
+                    follow_up = entry["timer"] is None and entry["desired"] != desired
+                    if entry["timer"] is None and not follow_up:
+                        self._pending.pop(victory_id, None)
+            self.on_synced(victory_id, success, confirmed)
+            if not follow_up:
+                return
+
+
+def _with_liked(liked: bool) -> Callable[[Dict], Dict]:
+    """Atualização de item do feed: curtida do usuário e contagem coerente."""
+
+    def update(item: Dict) -> Dict:
+        if bool(item.get("liked")) == liked:
+            return item
+        likes = max((item.get("likes") or 0) + (1 if liked else -1), 0)
+        return {**item, "liked": liked, "likes": likes}
+
+    return update
+
 
 class CommunityController:
     """Controller responsável pela lógica de negócio da comunidade"""
@@ -18,30 +111,161 @@ class CommunityController:
         self.service = CommunityService(supabase_service)
         self.user_id = page.client_storage.get("supafit.user_id") or "supafit_user"
         self.selected_category = "Todas"
+        self.next_cursor = None
+        # Uma página por vez: rolagens seguidas disparam várias threads
+        self._loading_more = threading.Lock()
+        self.like_queue = LikeToggleQueue(
+            self.service, self.user_id, self._on_like_synced
+        )
+        # Chamado com (victory_id, liked) para desfazer a atualização otimista
+        self.on_like_reverted = None
+        # Diffs do feed em tempo real, aplicados pela aba sem recarregar a lista
+        self.on_victory_added = None
+        self.on_victory_removed = None
+        self.on_likes_changed = None
+        self.on_liked_changed = None
+
+    def start_realtime(self):
+        """Passa a receber inserts, deletes e contagens do feed em tempo real"""
+        if self.is_user_logged_in():
+            self.service.subscribe_feed(self.user_id, self._handle_realtime)
+
+    def _handle_realtime(self, event: str, table: str, record: Dict, old: Dict):
+        """Converte um evento do Realtime em um diff da lista visível"""
+        try:
+            if table == "victories":
+                if event == "INSERT":
+                    # A vitória nova entra no topo: só as páginas de "Todas" e
+                    # da categoria dela mudam de composição
+                    self.invalidate_victories("Todas", record.get("category"))
+                    if self.selected_category not in ("Todas", record.get("category")):
+                        return
+                    if self.on_victory_added:
+                        self.on_victory_added(self.service.victory_from_record(record))
+                elif event == "DELETE":
+                    victory_id = old.get("id")
+                    if not victory_id:
+                        return
+                    self._patch_cached_victories(victory_id, None)
+                    if self.on_victory_removed:
+                        self.on_victory_removed(victory_id)
+                elif event == "UPDATE":
+                    victory_id = record.get("id")
+                    likes = record.get("likes_count") or 0
+                    self._patch_cached_victories(
+                        victory_id, lambda item: {**item, "likes": likes}
+                    )
+                    # Com toques pendentes, o estado otimista local prevalece
+                    if self.on_likes_changed and not self.like_queue.is_pending(
+                        victory_id
+                    ):
+                        self.on_likes_changed(victory_id, likes)
+            elif table == "victory_likes":
+                # Só INSERTs filtrados por user_id; descurtidas de outro
+                # aparelho chegam apenas pela contagem
+                if event != "INSERT" or record.get("user_id") != self.user_id:
+                    return
+                victory_id = record.get("victory_id")
+                self._patch_cached_victories(victory_id, _with_liked(True))
+                if self.on_liked_changed and not self.like_queue.is_pending(victory_id):
+                    self.on_liked_changed(victory_id, True)
+        except Exception as e:
+            logger.error(f"Erro ao aplicar evento em tempo real: {str(e)}")
+
+    def _patch_cached_victories(
+        self, victory_id, update: Optional[Callable[[Dict], Dict]]
+    ) -> None:
+        """
+        Aplica o evento às páginas do feed em cache que contêm a vitória, sem
+        descartá-las: `update` devolve o item alterado; None o remove.
+        """
+
+        def transform(feed_page):
+            items = feed_page.get("items") or []
+            if not any(item.get("id") == victory_id for item in items):
+                return feed_page
+            if update is None:
+                items = [item for item in items if item.get("id") != victory_id]
+            else:
+                items = [
+                    update(item) if item.get("id") == victory_id else item
+                    for item in items
+                ]
+            return {**feed_page, "items": items}
+
+        SWRCache.get_instance(self.page).patch(
+            f"community.victories:{self.user_id}:", transform
+        )
 
-    def load_victories(self, category: str = "Todas") -> List[Victory]:
-        """Carrega as vitórias filtradas por categoria"""
+    def load_victories(self, category: str = "Todas", on_update=None) -> List[Victory]:
+        """
+        Carrega a primeira página do feed da categoria a partir do cache SWR.
+        `on_update` recebe a página revalidada quando ela chega da rede.
+        """
         self.selected_category = category
-        return self.service.load_victories(category, self.user_id)
-
-    def create_victory(self, content: str, category: str) -> bool:
-        """Cria uma nova vitória com validações"""
+        self.next_cursor = None
+
+        def handle_update(fresh_page):
+            if self.selected_category != category:
+                return
+            self.next_cursor = fresh_page.get("next_cursor")
+            if on_update:
+                on_update([Victory.from_dict(v) for v in fresh_page["items"]])
+
+        feed_page = SWRCache.get_instance(self.page).read(
+            f"community.victories:{self.user_id}:{category}",
+            lambda: self.service.fetch_victories_page(category),
+            handle_update,
+        )
+        if not feed_page:
+            return []
+        self.next_cursor = feed_page.get("next_cursor")
+        return [Victory.from_dict(v) for v in feed_page["items"]]
+
+    def load_more_victories(self) -> List[Victory]:
+        """Busca a próxima página do feed (rolagem infinita)"""
+        if not self.next_cursor or not self._loading_more.acquire(blocking=False):
+            return []
+        category = self.selected_category
+        try:
+            victories, next_cursor = self.service.load_victories(
+                category, self.next_cursor
+            )
+            if category != self.selected_category:
+                # Categoria trocada durante a busca: descarta a página
+                return []
+            self.next_cursor = next_cursor
+            return victories
+        finally:
+            self._loading_more.release()
+
+    def has_more_victories(self) -> bool:
+        return self.next_cursor is not None and not self._loading_more.locked()
+
+    def invalidate_victories(self, *categories: Optional[str]):
+        """Descarta do cache as páginas do feed das categorias informadas"""
+        cache = SWRCache.get_instance(self.page)
+        for category in {c for c in categories if c}:
+            cache.invalidate(f"community.victories:{self.user_id}:{category}")
+
+    def create_victory(self, content: str, category: str) -> Optional[Victory]:
+        """Cria uma nova vitória com validações e retorna a vitória criada"""
         # Validação de login
         if self.user_id == "supafit_user":
             SnackBarHelper.show_error(
                 self.page, "Você precisa estar logado para postar!"
             )
-            return False
+            return None
 
         # Validação de campos obrigatórios
         if not content or not category:
             SnackBarHelper.show_error(self.page, "Preencha todos os campos!")
-            return False
+            return None
 
         # Validação de tamanho
         if len(content) > 50:
             SnackBarHelper.show_error(self.page, "Limite de 50 caracteres excedido!")
-            return False
+            return None
 
         # Criar vitória
         victory_post = VictoryPost(
@@ -51,89 +275,52 @@ class CommunityController:
             created_at=datetime.now(timezone.utc),
         )
 
-        success = self.service.create_victory(victory_post)
+        victory = self.service.create_victory(victory_post)
 
-        if success:
+        if victory:
+            self.invalidate_victories("Todas", category)
             SnackBarHelper.show_success(self.page, "Vitória postada com sucesso!")
         else:
             SnackBarHelper.show_error(self.page, "Erro ao postar vitória!")
 
-        return success
+        return victory
 
 
     def toggle_like(self, victory_id: str, currently_liked: bool) -> bool:
-        """Alterna o like de uma vitória"""
+        """
+        Registra o toque no like. A interface já foi atualizada de forma
+        otimista; o envio é agrupado pela fila e só o estado final é gravado.
+        """
         logger.info(
-            f"[TOGGLE] Iniciando toggle_like para {victory_id}, currently_liked: {currently_liked}"
+            f"[TOGGLE] Like em {victory_id}, currently_liked: {currently_liked}"
         )
 
         if self.user_id == "supafit_user":
             SnackBarHelper.show_error(self.page, "Você precisa estar logado para curtir!")
             return False
 
-        success = self.service.toggle_like(victory_id, self.user_id, currently_liked)
-
-        if not success:
-            logger.error(f"[TOGGLE_FAIL] Erro ao curtir/descurtir {victory_id}")
-            SnackBarHelper.show_error(self.page, "Erro ao curtir/descurtir!")
+        self.like_queue.toggle(victory_id, currently_liked, not currently_liked)
+        return True
 
-        return success
+    def _on_like_synced(self, victory_id: str, success: bool, confirmed: bool):
+        if success:
+            # A lista visível já está certa; as páginas em cache recebem o
+            # estado enviado (o oposto do último confirmado)
+            self._patch_cached_victories(victory_id, _with_liked(not confirmed))
+            return
+        logger.error(f"[TOGGLE_FAIL] Erro ao curtir/descurtir {victory_id}")
+        SnackBarHelper.show_error(self.page, "Erro ao curtir/descurtir!")
+        if self.on_like_reverted:
+            self.on_like_reverted(victory_id, confirmed)
 
     def delete_victory(self, victory_id: str, user_id: str) -> tuple[bool, str]:
         """Deleta uma vitória se o usuário for o autor"""
-        try:
-            # Verifica se o usuário é o autor da vitória
-            victory = (
-                self.supabase_service.client.table("victories")
-                .select("user_id")
-                .eq("id", victory_id)
-                .execute()
-            )
-
-            if not victory.data or victory.data[0]["user_id"] != user_id:
-                return False, "Você não pode excluir esta vitória!"
-
-            # Deleta a vitória
-            delete_resp = (
-                self.supabase_service.client.table("victories")
-                .delete()
-                .eq("id", victory_id)
-                .execute()
-            )
-
-            if not delete_resp.data:
-                logger.warning(f"Nenhuma linha deletada para vitória {victory_id}")
-                return False, "Falha ao excluir vitória. Verifique suas permissões."
-
-            # Deleta os likes associados
-            self.supabase_service.client.table("victory_likes").delete().eq(
-                "victory_id", victory_id
-            ).execute()
-
-            # Pequeno atraso para consistência eventual
-            import time
-
-            asyncio.sleep(0.2)
-
-            # Verifica se ainda existe
-            check_victory = (
-                self.supabase_service.client.table("victories")
-                .select("id")
-                .eq("id", victory_id)
-                .execute()
-            )
-
-            if check_victory.data:
-                logger.error(
-                    f"Vitória {victory_id} ainda existe após tentativa de exclusão!"
-                )
-                return False, "Erro ao excluir vitória: ela ainda existe no banco."
-
-            return True, "Vitória excluída com sucesso!"
-
-        except Exception as e:
-            logger.error(f"Erro ao excluir vitória: {str(e)}")
-            return False, f"Erro ao excluir vitória: {str(e)}"
+        success, message = self.service.delete_victory(victory_id, user_id)
+        if success:
+            self._patch_cached_victories(victory_id, None)
+        else:
+            logger.warning(f"Vitória {victory_id} não excluída: {message}")
+        return success, message
 
     def get_categories(self) -> List[str]:
         """Retorna as categorias disponíveis"""
@@ -1,76 +1,129 @@
 import logging
 import hashlib
 from datetime import datetime, timezone
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Tuple
+from services import query_specs
+from services.query_specs import Projection
+from services.author_names import AuthorNameCache
+from services.realtime_feed import FeedRealtime
 from .models import Victory, VictoryPost
 
 logger = logging.getLogger("supafit.community.service")
 
+# Vitórias por página do feed
+FEED_PAGE_SIZE = 20
+
 
 class CommunityService:
     """Serviço responsável pelas operações de dados da comunidade"""
 
     def __init__(self, supabase_service):
         self.supabase = supabase_service
-
-
-    def load_victories(self, category: str = "Todas", user_id: str = None) -> List[Victory]:
-        """Carrega as vitórias filtradas por categoria"""
+        self.author_names = AuthorNameCache.get_instance()
+
+
+    def load_victories(
+        self,
+        category: str = "Todas",
+        cursor: Optional[Dict] = None,
+        page_size: int = FEED_PAGE_SIZE,
+        projection: Projection = query_specs.COMMUNITY_FEED,
+    ) -> Tuple[List[Victory], Optional[Dict]]:
+        """Carrega uma página de vitórias e o cursor da próxima página"""
+        feed_page = self.fetch_victories_page(category, cursor, page_size, projection)
+        if not feed_page:
+            return [], None
+        return (
+            [Victory.from_dict(v) for v in feed_page["items"]],
+            feed_page["next_cursor"],
+        )
+
+    def fetch_victories_page(
+        self,
+        category: str = "Todas",
+        cursor: Optional[Dict] = None,
+        page_size: int = FEED_PAGE_SIZE,
+        projection: Projection = query_specs.COMMUNITY_FEED,
+    ) -> Optional[Dict]:
+        """
+        Busca uma página do feed por keyset em (created_at, id), do mais
+        recente para o mais antigo. `cursor` é a última vitória da página
+        anterior. A view `community_feed` já traz autor, likes e
+        `liked_by_me` do usuário autenticado: uma única requisição por página.
+
+        Retorna {"items": [...], "next_cursor": {...} | None} ou None em erro.
+        """
         try:
-            query = self.supabase.client.table("victories").select("*")
+            query = self.supabase.client.table("community_feed").select(
+                projection.select
+            )
             if category != "Todas":
                 query = query.eq("category", category)
+            if cursor:
+                created_at, victory_id = cursor["created_at"], cursor["id"]
+                query = query.or_(
+                    f'created_at.lt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.lt."{victory_id}")'
+                )
 
-            resp_victories = query.order("created_at", desc=True).execute()
+            resp_victories = (
+                query.order("created_at", desc=True)
+                .order("id", desc=True)
+                .limit(page_size)
+                .execute()
+            )
             victories_data = resp_victories.data or []
             logger.info(
                 f"Vitórias carregadas do Supabase: {len(victories_data)} itens para categoria {category}"
             )
+
+            next_cursor = None
+            if len(victories_data) == page_size:
+                last = victories_data[-1]
+                next_cursor = {"created_at": last["created_at"], "id": last["id"]}
+
             if not victories_data:
                 logger.info("Nenhuma vitória encontrada.")
-                return []
+                return {"items": [], "next_cursor": None}
 
-            # Enriquecer os dados das vitórias
-            victories = self._enrich_victories_data(victories_data, user_id)
-            return [Victory.from_dict(v) for v in victories]
+            return {
+                "items": self._apply_feed_fields(victories_data),
+                "next_cursor": next_cursor,
+            }
 
         except Exception as e:
             logger.error(f"Erro ao carregar vitórias: {str(e)}")
-            return []
-
-    def _enrich_victories_data(
-        self, victories_data: List[Dict], user_id: str = None
-    ) -> List[Dict]:
-        """Enriquece os dados das vitórias com nomes e likes"""
-        user_ids = [v["user_id"] for v in victories_data]
-        victory_ids = [v["id"] for v in victories_data]
-
-        # Buscar nomes dos usuários
-        name_map = self._get_user_names(user_ids)
-
-        # Buscar dados de likes
-        likes_map = self._get_likes_count(victory_ids)
-        user_liked_ids = self._get_user_liked_victories(victory_ids, user_id)
-
-        # Aplicar os dados enriquecidos
+            return None
+
+    def _apply_feed_fields(self, victories_data: List[Dict]) -> List[Dict]:
+        """Mapeia as colunas da view para os campos usados por Victory"""
+        # Os nomes vindos da view alimentam o cache de autores
+        self.author_names.put_many(
+            {v["user_id"]: v.get("author_name") for v in victories_data}
+        )
         for victory in victories_data:
-            uid = victory["user_id"]
-            vid = victory["id"]
-
-            victory["author_name"] = name_map.get(uid, self._generate_fallback_name(uid))
-            victory["likes"] = likes_map.get(vid, 0)
-            victory["liked"] = vid in user_liked_ids
+            victory["author_name"] = victory.get(
+                "author_name"
+            ) or self._generate_fallback_name(victory["user_id"])
+            victory["likes"] = victory.get("likes_count") or 0
+            victory["liked"] = bool(victory.get("liked_by_me"))
 
         return victories_data
 
-    def _get_user_names(self, user_ids: List[str]) -> Dict[str, str]:
-        """Busca os nomes dos usuários com fallback"""
+    def get_author_names(self, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Nomes dos autores para linhas que não vêm da view (ex.: eventos em
+        tempo real). Apenas ids ausentes do cache são buscados.
+        """
+        names = self.author_names.resolve(user_ids, self._fetch_user_names)
+        return {
+            uid: names.get(uid) or self._generate_fallback_name(uid)
+            for uid in user_ids
+        }
+
+    def _fetch_user_names(self, user_ids: List[str]) -> Optional[Dict[str, str]]:
+        """Busca nomes em public_profile_info, com fallback para user_profiles"""
         name_map = {}
-
-        if not user_ids:
-            return name_map
-
-        # 1. Buscar em public_profile_info
         try:
             resp_pub = (
                 self.supabase.client.table("public_profile_info")
@@ -81,13 +134,9 @@ class CommunityService:
             for profile in resp_pub.data or []:
                 if profile.get("name"):
                     name_map[profile["user_id"]] = profile["name"]
-        except Exception as e:
-            logger.error(f"Erro ao buscar public_profile_info: {str(e)}")
 
-        # 2. Fallback para user_profiles
-        missing_ids = [uid for uid in user_ids if uid not in name_map]
-        if missing_ids:
-            try:
+            missing_ids = [uid for uid in user_ids if uid not in name_map]
+            if missing_ids:
                 resp_profiles = (
                     self.supabase.client.table("user_profiles")
                     .select("user_id, name")
@@ -97,8 +146,9 @@ class CommunityService:
                 for profile in resp_profiles.data or []:
                     if profile.get("name"):
                         name_map[profile["user_id"]] = profile["name"]
-            except Exception as e:
-                logger.error(f"Erro ao buscar user_profiles: {str(e)}")
+        except Exception as e:
+            logger.error(f"Erro ao buscar nomes de autores: {str(e)}")
+            return None
 
         return name_map
 
@@ -106,75 +156,59 @@ class CommunityService:
         """Gera um nome de fallback baseado no hash do user_id"""
         return f"Usuário_{hashlib.sha1(user_id.encode()).hexdigest()[:6]}"
 
-    def _get_likes_count(self, victory_ids: List[str]) -> Dict[str, int]:
-        """Busca a contagem de likes para cada vitória"""
-        likes_map = {}
-
-        if not victory_ids:
-            return likes_map
-
-        try:
-            resp_likes = (
-                self.supabase.client.table("victory_likes")
-                .select("victory_id", count="exact")
-                .in_("victory_id", victory_ids)
-                .execute()
-            )
-            for item in resp_likes.data or []:
-                vid = item["victory_id"]
-                likes_map[vid] = likes_map.get(vid, 0) + 1
-        except Exception as e:
-            logger.error(f"Erro ao buscar likes: {str(e)}")
-
-        return likes_map
-
-    def _get_user_liked_victories(
-        self, victory_ids: List[str], user_id: str = None
-    ) -> Set[str]:
-        """Busca quais vitórias o usuário curtiu"""
-        if not user_id or not victory_ids:
-            return set()
-
+    def subscribe_feed(self, user_id: str, listener) -> None:
+        """
+        Assina as mudanças de `victories` e `victory_likes` via Supabase
+        Realtime. `listener(evento, tabela, registro, registro_antigo)` é
+        chamado a cada mudança; a conexão é única por sessão e só o último
+        listener registrado recebe os eventos.
+        """
+        feed = FeedRealtime.get_instance(self.supabase)
+        feed.listener = listener
+        self.supabase.page.run_task(feed.start, user_id)
+
+    def victory_from_record(self, record: Dict) -> Victory:
+        """Monta a vitória de uma linha crua de `victories` (insert/evento)"""
+        data = dict(record)
+        data["author_name"] = self.get_author_names([record["user_id"]])[
+            record["user_id"]
+        ]
+        data["likes"] = record.get("likes_count") or 0
+        data["liked"] = False
+        return Victory.from_dict(data)
+
+    def create_victory(self, victory_post: VictoryPost) -> Optional[Victory]:
+        """Cria uma nova vitória e retorna a linha inserida"""
         try:
-            resp_user_likes = (
-                self.supabase.client.table("victory_likes")
-                .select("victory_id")
-                .eq("user_id", user_id)
-                .in_("victory_id", victory_ids)
+            resp = (
+                self.supabase.client.table("victories")
+                .insert(victory_post.to_dict())
                 .execute()
             )
-            return {item["victory_id"] for item in resp_user_likes.data or []}
-        except Exception as e:
-            logger.error(f"Erro ao buscar likes do usuário: {str(e)}")
-            return set()
-
-    def create_victory(self, victory_post: VictoryPost) -> bool:
-        """Cria uma nova vitória"""
-        try:
-            self.supabase.client.table("victories").insert(
-                victory_post.to_dict()
-            ).execute()
-            return True
+            if not resp.data:
+                return None
+            return self.victory_from_record(resp.data[0])
         except Exception as e:
             logger.error(f"Erro ao criar vitória: {str(e)}")
-            return False
+            return None
 
-    def toggle_like(self, victory_id: str, user_id: str, currently_liked: bool) -> bool:
-        """Alterna o like de uma vitória"""
+    def set_like(self, victory_id: str, user_id: str, liked: bool) -> bool:
+        """Grava o estado final da curtida: um upsert ou um delete"""
         try:
-            if currently_liked:
-                # Remove curtida
-                self.supabase.client.table("victory_likes").delete().eq(
-                    "victory_id", victory_id
-                ).eq("user_id", user_id).execute()
-            else:
-                # Adiciona curtida
-                self.supabase.client.table("victory_likes").insert(
+            likes = self.supabase.client.table("victory_likes")
+            if liked:
+                likes.upsert(
                     {
                         "victory_id": victory_id,
                         "user_id": user_id,
                         "created_at": datetime.now(timezone.utc).isoformat(),
-                    }
+                    },
+                    on_conflict="victory_id,user_id",
+                    ignore_duplicates=True,
+                ).execute()
+            else:
+                likes.delete().eq("victory_id", victory_id).eq(
+                    "user_id", user_id
                 ).execute()
             return True
         except Exception as e:
@@ -182,28 +216,21 @@ class CommunityService:
             return False
 
     def delete_victory(self, victory_id: str, user_id: str) -> tuple[bool, str]:
-        """Deleta uma vitória se o usuário for o autor"""
+        """
+        Deleta uma vitória do autor em uma única requisição. O filtro por
+        user_id e a RLS garantem a autoria; as curtidas saem em cascata no
+        banco. A linha devolvida pelo DELETE confirma a exclusão.
+        """
         try:
-            # Verifica se o usuário é o autor
-            victory = (
+            resp = (
                 self.supabase.client.table("victories")
-                .select("user_id")
+                .delete()
                 .eq("id", victory_id)
+                .eq("user_id", user_id)
                 .execute()
             )
-
-            if not victory.data or victory.data[0]["user_id"] != user_id:
+            if not resp.data:
                 return False, "Você não pode excluir esta vitória!"
-
-            # Deleta a vitória e seus likes
-            self.supabase.client.table("victories").delete().eq(
-                "id", victory_id
-            ).execute()
-
-            self.supabase.client.table("victory_likes").delete().eq(
-                "victory_id", victory_id
-            ).execute()
-
             return True, "Vitória excluída com sucesso!"
 
         except Exception as e:
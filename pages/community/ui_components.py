@@ -46,7 +46,7 @@ class VictoryCard:
         self.ref = ft.Ref[ft.Dismissible]()
 
     def build(self) -> ft.Dismissible:
-        like_icon = ft.IconButton(
+        self.like_icon = like_icon = ft.IconButton(
             icon=ft.Icons.FAVORITE_BORDER,
             selected_icon=ft.Icons.FAVORITE,
             selected=self.victory.liked,
@@ -61,6 +61,12 @@ class VictoryCard:
             on_click=lambda e: self._handle_like_with_animation(e),
         )
 
+        self.likes_text = ft.Text(
+            str(self.victory.likes),
+            size=12,
+            color=ft.Colors.GREY_600,
+        )
+
         content = ft.Container(
             content=ft.Column(
                 [
@@ -115,11 +121,7 @@ class VictoryCard:
                         content=ft.Row(
                             [
                                 like_icon,
-                                ft.Text(
-                                    str(self.victory.likes),
-                                    size=12,
-                                    color=ft.Colors.GREY_600,
-                                ),
+                                self.likes_text,
                                 ft.Container(width=16),
                                 ft.IconButton(
                                     icon=ft.Icons.VISIBILITY,
@@ -192,7 +194,32 @@ class VictoryCard:
     def _handle_like_with_animation(self, e):
         """Manipula o clique do like com animação de feedback"""
         AnimationHelpers.animate_button_click(e.control, self.page)
-        self.on_like_click(self.victory.id, e.control.selected)
+        currently_liked = self.victory.liked
+        # Atualização otimista: o envio ao servidor é agrupado pelo controller
+        self.set_liked(not currently_liked)
+        self.on_like_click(self.victory.id, currently_liked)
+
+    def set_liked(self, liked: bool, adjust_count: bool = True):
+        """Aplica o estado de curtida no card (contagem e ícone)"""
+        if liked == self.victory.liked:
+            return
+        self.victory.liked = liked
+        if adjust_count:
+            self.victory.likes = max(self.victory.likes + (1 if liked else -1), 0)
+        self.like_icon.selected = liked
+        self.likes_text.value = str(self.victory.likes)
+        if self.like_icon.page:
+            self.like_icon.update()
+            self.likes_text.update()
+
+    def set_likes(self, count: int):
+        """Atualiza a contagem de curtidas vinda do servidor"""
+        if count == self.victory.likes:
+            return
+        self.victory.likes = count
+        self.likes_text.value = str(count)
+        if self.likes_text.page:
+            self.likes_text.update()
 
     def _handle_hover(self, e):
         """Aplica efeito hover com animação suave"""
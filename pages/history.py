@@ -1,7 +1,13 @@
 import flet as ft
 from services.supabase import SupabaseService
-from datetime import datetime, timedelta
-from collections import defaultdict
+from services.swr_cache import SWRCache
+from services.history_stats import (
+    HistoryStats,
+    aggregate_statistics,
+    HISTORY_WINDOW_DAYS,
+    HISTORY_MAX_ROWS,
+)
+from datetime import datetime
 import calendar
 
 
@@ -28,160 +34,84 @@ def HistoryPage(page: ft.Page, supabase):
             loading_indicator.current.visible = show
             page.update()
 
-    def load_real_data(period_days=30):
-        """Carrega dados reais do Supabase."""
+    def load_real_data():
+        """Carrega a janela curta do histórico em formato colunar (RPC)."""
         try:
             show_loading(True)
+            response = supabase_service.client.rpc(
+                "get_history_columns",
+                {"p_days": HISTORY_WINDOW_DAYS, "p_max_rows": HISTORY_MAX_ROWS},
+            ).execute()
+            show_loading(False)
+            return response.data or {}
 
-            # Data limite baseada no período
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=period_days)
-
-            # 1. Carrega planos do usuário com exercícios
-            plans_response = (
-                supabase_service.client.table("user_plans")
-                .select("*, plan_exercises(*, exercicios(nome, grupo_muscular))")
-                .eq("user_id", user_id)
-                .execute()
-            )
+        except Exception as e:
+            show_loading(False)
+            print(f"ERROR - history: Erro ao carregar histórico: {str(e)}")
+            return None
+
+    def pending_progress():
+        """Cargas gravadas no aparelho e ainda não enviadas (ex.: sem conexão)."""
+        return supabase_service.local_store.get_pending_progress(user_id)
+
+    def read_data():
+        """Lê a janela do histórico do cache SWR, revalidando em segundo plano."""
+        data = SWRCache.get_instance(page).read(
+            f"history.columns:{user_id}",
+            load_real_data,
+            on_data_update,
+        )
+        history[0] = HistoryStats(data, pending_progress())
 
-            # 2. Carrega histórico de progresso
-            progress_response = (
-                supabase_service.client.table("progress")
-                .select("*, exercicios(nome, grupo_muscular)")
-                .eq("user_id", user_id)
-                .gte("recorded_at", start_date.isoformat())
-                .order("recorded_at", desc=False)
-                .execute()
-            )
+    def on_data_update(data):
+        """Recria os arrays e re-renderiza quando chegam dados revalidados."""
+        history[0] = HistoryStats(data, pending_progress())
+        refresh_stats(period_statistics(current_period[0]))
 
+    def load_aggregate(period_days):
+        """Carrega os agregados de um período longo (RPC get_history_stats)."""
+        try:
+            show_loading(True)
+            response = supabase_service.client.rpc(
+                "get_history_stats", {"p_days": period_days}
+            ).execute()
             show_loading(False)
-            return {
-                "plans": plans_response.data or [],
-                "progress": progress_response.data or [],
-            }
+            return response.data or {}
 
         except Exception as e:
             show_loading(False)
-            print(f"ERROR - history: Erro ao carregar dados reais: {str(e)}")
-            return {"plans": [], "progress": []}
-
-    def calculate_statistics(data, period_days=30):
-        """Calcula estatísticas detalhadas baseadas nos dados reais."""
-        plans = data.get("plans", [])
-        progress = data.get("progress", [])
-
-        stats = {
-            "total_plans": len(plans),
-            "total_exercises": 0,
-            "total_progress_records": len(progress),
-            "plans_by_day": defaultdict(list),
-            "exercises_by_muscle": defaultdict(set),
-            "progress_by_exercise": defaultdict(list),
-            "recent_activities": [],
-            "avg_exercises_per_plan": 0,
-            "muscle_group_frequency": defaultdict(int),
-            "load_progression": {},
-            "workout_frequency": defaultdict(int),
-        }
-
-        # Processa planos
-        for plan in plans:
-            day = plan.get("day", "").lower()
-            title = plan.get("title", "")
-            exercises = plan.get("plan_exercises", [])
-
-            stats["total_exercises"] += len(exercises)
-            stats["plans_by_day"][day].append(
-                {
-                    "title": title,
-                    "exercises": len(exercises),
-                    "created_at": plan.get("created_at", ""),
-                    "plan_id": plan.get("plan_id", ""),
-                }
-            )
+            print(f"ERROR - history: Erro ao carregar estatísticas: {str(e)}")
+            return None
 
-            # Agrupa exercícios por músculo
-            for exercise in exercises:
-                if exercise.get("exercicios"):
-                    muscle_group = exercise["exercicios"].get(
-                        "grupo_muscular", "Outros"
-                    )
-                    exercise_name = exercise["exercicios"].get("nome", "")
-                    stats["exercises_by_muscle"][muscle_group].add(exercise_name)
-
-        # Converte sets para contagem
-        for muscle, exercises_set in stats["exercises_by_muscle"].items():
-            stats["exercises_by_muscle"][muscle] = len(exercises_set)
-
-        # Processa progresso
-        for record in progress:
-            exercise_id = record.get("exercise_id", "")
-            load = record.get("load", 0)
-            recorded_at = record.get("recorded_at", "")
-            exercise_info = record.get("exercicios", {})
-            exercise_name = exercise_info.get("nome", "Exercício")
-            muscle_group = exercise_info.get("grupo_muscular", "Outros")
-
-            # Histórico por exercício
-            stats["progress_by_exercise"][exercise_name].append(
-                {"load": load, "date": recorded_at, "exercise_id": exercise_id}
-            )
+    def read_aggregate(period_days):
+        """Lê os agregados do período do cache SWR, revalidando em segundo plano."""
 
-            # Frequência por grupo muscular
-            stats["muscle_group_frequency"][muscle_group] += 1
-
-            # Atividades recentes (últimas 10)
-            stats["recent_activities"].append(
-                {
-                    "exercise_name": exercise_name,
-                    "load": load,
-                    "date": recorded_at,
-                    "muscle_group": muscle_group,
-                }
-            )
+        def on_aggregate_update(data):
+            if current_period[0] == period_days:
+                refresh_stats(aggregate_statistics(data, pending_progress()))
 
-        stats["recent_activities"].sort(key=lambda x: x.get("date", ""), reverse=True)
-        stats["recent_activities"] = stats["recent_activities"][:10]
-
-        # Calcula progressão de carga para exercícios principais
-        for exercise_name, records in stats["progress_by_exercise"].items():
-            if len(records) >= 2:
-                sorted_records = sorted(records, key=lambda x: x.get("date", ""))
-                first_load = sorted_records[0]["load"]
-                last_load = sorted_records[-1]["load"]
-
-                if first_load > 0:
-                    progression = ((last_load - first_load) / first_load) * 100
-                    stats["load_progression"][exercise_name] = {
-                        "progression_percent": round(progression, 1),
-                        "first_load": first_load,
-                        "last_load": last_load,
-                        "records_count": len(records),
-                    }
-
-        # Frequência de treino por dia da semana
-        days_map = {
-            "segunda": "Segunda",
-            "terça": "Terça",
-            "quarta": "Quarta",
-            "quinta": "Quinta",
-            "sexta": "Sexta",
-            "sábado": "Sábado",
-            "domingo": "Domingo",
-        }
-
-        for day_key in stats["plans_by_day"]:
-            day_name = days_map.get(day_key, day_key.title())
-            stats["workout_frequency"][day_name] = len(stats["plans_by_day"][day_key])
-
-        # Média de exercícios por plano
-        if stats["total_plans"] > 0:
-            stats["avg_exercises_per_plan"] = round(
-                stats["total_exercises"] / stats["total_plans"], 1
-            )
-
-        return stats
+        data = SWRCache.get_instance(page).read(
+            f"history.stats:{user_id}:{period_days or 'all'}",
+            lambda: load_aggregate(period_days),
+            on_aggregate_update,
+        )
+        return aggregate_statistics(data, pending_progress())
+
+    def period_statistics(period_days):
+        """
+        Estatísticas do período: recorte local da janela colunar quando ela
+        cobre o período; senão, agregados calculados no servidor.
+        """
+        if history[0].covers(period_days):
+            return history[0].statistics(period_days)
+        return read_aggregate(period_days)
+
+    def refresh_stats(stats):
+        if not stats_container.current:
+            return
+        render_stats(stats)
+        if stats_container.current.page:
+            stats_container.current.update()
 
     def create_enhanced_stats_cards(stats):
         """Cria cards aprimorados com estatísticas reais."""
@@ -632,19 +562,12 @@ def HistoryPage(page: ft.Page, supabase):
         except:
             return "Data inválida"
 
-    def on_period_change(e):
-        """Atualiza estatísticas quando o período é alterado."""
-        period_map = {"7 dias": 7, "30 dias": 30, "90 dias": 90, "Todo período": 365}
-        selected_days = period_map.get(e.control.value, 30)
-
-        data = load_real_data(selected_days)
-        stats = calculate_statistics(data, selected_days)
-
-        # Atualiza o container de estatísticas
+    def build_stats_content(stats):
+        """Monta o conteúdo do container de estatísticas."""
         stats_cards = create_enhanced_stats_cards(stats)
         weekly_cards = create_weekly_plan_view(stats)
 
-        stats_container.current.content = ft.Column(
+        return ft.Column(
             [
                 ft.Text(
                     "📈 Estatísticas do Período", size=20, weight=ft.FontWeight.BOLD
@@ -664,10 +587,28 @@ def HistoryPage(page: ft.Page, supabase):
             spacing=20,
         )
 
+    def render_stats(stats):
+        """Atualiza o container de estatísticas."""
+        stats_container.current.content = build_stats_content(stats)
+
+    def on_period_change(e):
+        """Atualiza estatísticas quando o período é alterado."""
+        period_map = {"7 dias": 7, "30 dias": 30, "90 dias": 90, "Todo período": None}
+        selected_days = period_map.get(e.control.value, 30)
+        current_period[0] = selected_days
+
+        # Até a janela colunar: recorte local, sem consulta ao Supabase
+        render_stats(period_statistics(selected_days))
+
         page.update()
 
-    initial_data = load_real_data(30)
-    initial_stats = calculate_statistics(initial_data, 30)
+    current_period = [30]
+    history = [None]
+    # Container principal de estatísticas, criado antes da leitura: a
+    # revalidação pode chamar on_data_update antes de esta função retornar
+    main_content = ft.Container(ref=stats_container, padding=10)
+    read_data()
+    render_stats(period_statistics(current_period[0]))
 
     period_selector = ft.Container(
         content=ft.Row(
@@ -695,34 +636,6 @@ def HistoryPage(page: ft.Page, supabase):
         padding=10,
     )
 
-    # Container principal de estatísticas
-    stats_cards = create_enhanced_stats_cards(initial_stats)
-    weekly_cards = create_weekly_plan_view(initial_stats)
-
-    main_content = ft.Container(
-        ref=stats_container,
-        content=ft.Column(
-            [
-                ft.Text(
-                    "📈 Estatísticas do Período", size=20, weight=ft.FontWeight.BOLD
-                ),
-                ft.Column(stats_cards, spacing=10),
-                ft.Text(
-                    "📋 Planos por Dia da Semana", size=20, weight=ft.FontWeight.BOLD
-                ),
-                ft.ResponsiveRow(
-                    [
-                        ft.Container(card, col={"sm": 12, "md": 6, "lg": 4})
-                        for card in weekly_cards
-                    ],
-                    spacing=10,
-                ),
-            ],
-            spacing=20,
-        ),
-        padding=10,
-    )
-
     return ft.Container(
         content=ft.Column(
             [period_selector,
@@ -4,6 +4,8 @@ from datetime import datetime
 import os
 from groq import Groq
 from dotenv import load_dotenv
+from services.swr_cache import SWRCache
+from services.video_cache import prefetch_day_videos
 
 # Mapeamento de título para imagem local
 IMAGE_MAP = {
@@ -62,14 +64,10 @@ def Homepage(page: ft.Page, supabase_service):
         return ft.Container()
 
     def load_workouts():
-        resp = (
-            supabase_service.client.table("user_plans")
-            .select("day, title, plan_exercises(order, sets, reps, exercicios(nome))")
-            .eq("user_id", user_id)
-            .order("order", desc=False, foreign_table="plan_exercises")
-            .execute()
-        )
-        data = resp.data or []
+        # Planos vêm do banco local, sincronizado por delta de updated_at
+        supabase_service.sync_engine.ensure_plans(user_id)
+        supabase_service.sync_engine.request_sync()
+        data = supabase_service.local_store.get_plans_with_exercises(user_id)
         workouts_by_day = {day: None for day in WEEK_DAYS_ORDER}
 
         for plan in data:
@@ -81,7 +79,7 @@ def Homepage(page: ft.Page, supabase_service):
             exercises = sorted(
                 plan.get("plan_exercises", []), key=lambda x: x.get("order", 0)
             )
-            ex_names = [ex["exercicios"]["nome"] for ex in exercises]
+            ex_names = [(ex.get("exercicios") or {}).get("nome", "") for ex in exercises]
 
             # aqui usamos IA para escolher a imagem
             img_key = detect_image_key(title, ex_names)
@@ -99,7 +97,21 @@ def Homepage(page: ft.Page, supabase_service):
 
         return [wk for wk in workouts_by_day.values() if wk]
 
-    workouts = load_workouts()
+    def build_workout_tiles(workouts):
+        return [
+            ft.Container(
+                content=WorkoutTile(
+                    workout_name=wk["name"],
+                    day=wk["day"],
+                    image_url=wk["image_url"],
+                    is_current_day=(wk["day"] == current_day),
+                    on_view_click=lambda e, day=wk["day"]: page.go(f"/treino/{day}"),
+                ),
+                col=10,
+                padding=10,
+            )
+            for wk in workouts
+        ]
 
     today_en = datetime.now().strftime("%A").lower()
     day_map = {
@@ -113,26 +125,28 @@ def Homepage(page: ft.Page, supabase_service):
     }
     current_day = day_map.get(today_en, "segunda")
 
+    # Criado antes da leitura: a revalidação pode chamar on_workouts_update
+    # antes de esta função retornar
     workout_grid = ft.ResponsiveRow(
-        controls=[
-            ft.Container(
-                content=WorkoutTile(
-                    workout_name=wk["name"],
-                    day=wk["day"],
-                    image_url=wk["image_url"],
-                    is_current_day=(wk["day"] == current_day),
-                    on_view_click=lambda e, day=wk["day"]: page.go(f"/treino/{day}"),
-                ),
-                col=10,
-                padding=10,
-            )
-            for wk in workouts
-        ],
         columns=12,
         spacing=10,
         run_spacing=10,
     )
 
+    def on_workouts_update(workouts):
+        workout_grid.controls = build_workout_tiles(workouts)
+        if workout_grid.page:
+            workout_grid.update()
+
+    workouts = SWRCache.get_instance(page).read(
+        f"home.workouts:{user_id}", load_workouts, on_workouts_update
+    )
+    workout_grid.controls = build_workout_tiles(workouts)
+
+    if any(wk["day"] == current_day for wk in workouts or []):
+        # Vídeos do treino de hoje já ficam no disco antes de abrir o treino
+        prefetch_day_videos(supabase_service, user_id, current_day)
+
     return ft.Container(
         content=ft.Column(
             [
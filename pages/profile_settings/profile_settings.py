@@ -1,6 +1,8 @@
 from typing import Any, Dict
 import flet as ft
 from services.supabase import SupabaseService
+from services.swr_cache import SWRCache
+from services.author_names import AuthorNameCache
 from utils.logger import get_logger
 from .profile_components import (
     ProfileSections,
@@ -59,8 +61,7 @@ class ProfileSettingsController:
             logger.error(f"Erro ao recuperar email do Supabase Auth: {str(e)}")
             self.email = self.page.client_storage.get("supafit.email", "")
 
-        profile_response = self.supabase_service.get_profile(self.user_id)
-        self.profile = profile_response.data[0] if profile_response.data else {}
+        self.profile = self.supabase_service.load_profile(self.user_id) or {}
 
         return True
 
@@ -130,10 +131,20 @@ class ProfileSettingsController:
                 "font_family": form_data["font_family"],
                 "primary_color": form_data["primary_color"],
             }
-            self.supabase_service.client.table("user_profiles").upsert(
-                profile_data
-            ).execute()
+            response = (
+                self.supabase_service.client.table("user_profiles")
+                .upsert(profile_data)
+                .execute()
+            )
+            # Nova versão do perfil para todas as telas
+            self.supabase_service.profiles.put(
+                self.user_id, response.data[0] if response.data else profile_data
+            )
             self.page.client_storage.set("supafit.level", profile_data["level"])
+            swr_cache = SWRCache.get_instance(self.page)
+            # O nome aparece nos posts da comunidade
+            AuthorNameCache.get_instance().invalidate(self.user_id)
+            swr_cache.invalidate("community.victories:")
             logger.info(f"Perfil salvo com sucesso para user_id: {self.user_id}")
             NotificationHelper.show_success(
                 self.page, "Perfil salvo com sucesso!", form_data["primary_color"]
@@ -4,12 +4,15 @@ import time
 from datetime import datetime
 import uuid
 import json
-from .message import Message, ChatMessage
+from .message import Message
+from .chat_window import ChatWindow
 from services.supabase import SupabaseService
 from services.openai import OpenAIService
 from postgrest.exceptions import APIError
 from utils.quebra_mensagem import integrate_with_chat
 from services.trainer_functions import TOOLS
+from core.view_cache import invalidate_views
+from core.update_scheduler import schedule_update
 
 
 COOLDOWN_SECONDS = 2
@@ -19,106 +22,20 @@ def filtered(history):
     return [msg for msg in history if msg.get("role") != "tool"]
 
 
-async def load_chat_history(
-    supabase_service: SupabaseService,
-    user_id: str,
-    chat_container: ft.ListView,
-    page: ft.Page,
-    haptic_feedback: ft.HapticFeedback,
-    user_data: dict,
-):
+async def load_chat_history(chat_window: ChatWindow, page: ft.Page):
+    """Abre o chat com a página mais recente do histórico (ChatWindow)."""
     try:
-        chat_container.controls.clear()
-        chat_container.controls.append(
-            ChatMessage(
-                Message(
-                    user_name="Treinador Coachito",
-                    text="Olá! Como posso ajudar com seu treino hoje? 😄",
-                    user_type="trainer",
-                    created_at=datetime.now().isoformat(),
-                    show_avatar=True,
-                ),
-                page,
-                haptic_feedback,
-            )
-        )
-
-        resp = (
-            supabase_service.client.table("trainer_qa")
-            .select("message")
-            .eq("user_id", user_id)
-            .order("updated_at")
-            .limit(50)
-            .execute()
-        )
-
-        history = []
-        for item in resp.data:
-            raw_message = item.get("message", [])
-            if raw_message is None:
-                print(f"WARNING: Mensagem nula encontrada para user_id: {user_id}")
-                raw_message = []
-            if isinstance(raw_message, str):
-                try:
-                    messages = json.loads(raw_message)
-                except Exception as e:
-                    print(
-                        f"ERROR: Falha ao decodificar mensagem JSON para user_id: {user_id} - {e}"
-                    )
-                    continue
-            else:
-                messages = raw_message
-            history.extend(messages)
-
-        for msg in history:
-            if msg.get("role") == "tool":
-                continue
-
-            if (
-                not isinstance(msg, dict)
-                or not msg.get("role")
-                or not msg.get("content")
-            ):
-                print(f"WARNING: Mensagem inválida ignorada: {msg}")
-                continue
-
-            created_at = (
-                msg.get("timestamp")
-                or msg.get("created_at")
-                or datetime.now().isoformat()
-            )
-
-            chat_container.controls.append(
-                ChatMessage(
-                    Message(
-                        user_name="Você" if msg.get("role") == "user" else "Treinador",
-                        text=msg.get("content") or "Mensagem vazia",
-                        user_type=msg.get("role", "user"),
-                        created_at=created_at,
-                        show_avatar=True,
-                        gender=(
-                            user_data.get("gender", "neutro")
-                            if msg.get("role") == "user"
-                            else "neutro"
-                        ),
-                        user_id=user_id if msg.get("role") == "user" else None,
-                    ),
-                    page,
-                    haptic_feedback,
-                )
-            )
+        chat_window.open()
     except APIError as ex:
         print(
-            f"ERROR: Falha ao carregar histórico de chat para user_id: {user_id} - {ex}"
+            f"ERROR: Falha ao carregar histórico de chat para user_id: {chat_window.user_id} - {ex}"
         )
-        page.update()
-        return []
+        chat_window.reset()
     except Exception as ex:
         print(
-            f"ERROR: Erro inesperado ao carregar histórico para user_id: {user_id} - {ex}"
+            f"ERROR: Erro inesperado ao carregar histórico para user_id: {chat_window.user_id} - {ex}"
         )
-        page.update()
-        return []
+        chat_window.reset()
 
     page.update()
     return []
@@ -127,7 +44,7 @@ async def load_chat_history(
 async def clear_chat(
     supabase_service: SupabaseService,
     user_id: str,
-    chat_container: ft.ListView,
+    chat_window: ChatWindow,
     page: ft.Page,
     haptic_feedback: ft.HapticFeedback,
 ):
@@ -141,20 +58,7 @@ async def clear_chat(
                 supabase_service.client.table("trainer_qa").delete().eq(
                     "user_id", user_id
                 ).execute()
-                chat_container.controls.clear()
-                chat_container.controls.append(
-                    ChatMessage(
-                        Message(
-                            user_name="Treinador Coachito",
-                            text="Olá! Como posso ajudar com seu treino hoje? 😄",
-                            user_type="trainer",
-                            created_at=datetime.now().isoformat(),
-                            show_avatar=True,
-                        ),
-                        page,
-                        haptic_feedback,
-                    )
-                )
+                chat_window.reset()
                 page.update()
                 haptic_feedback.light_impact()
                 page.open(ft.SnackBar(ft.Text("Chat limpo com sucesso!")))
@@ -247,11 +151,12 @@ async def save_conversation_history(
         ).execute()
 
         print(f"INFO: Histórico salvo para {user_id}")
-        return True
+        # Posição (seq) da última mensagem salva no histórico
+        return len(updated_history)
 
     except Exception as err:
         print(f"ERROR: Falha ao salvar histórico: {err}")
-        return False
+        return None
 
 
 async def ask_question(
@@ -261,7 +166,7 @@ async def ask_question(
     openai: OpenAIService,
     question_field: ft.TextField,
     ask_button: ft.IconButton,
-    chat_container: ft.ListView,
+    chat_window: ChatWindow,
     user_data: dict,
     user_id: str,
     last_question_time: list,
@@ -276,48 +181,41 @@ async def ask_question(
                 ft.Text(f"Espere {COOLDOWN_SECONDS} segundos antes de outra pergunta.")
             )
         )
-        page.update()
         return
 
     question = question_field.value.strip()
     if not question:
         question_field.error_text = "Digite uma mensagem!"
-        page.update()
+        schedule_update(page, question_field)
         return
     if len(question) > 50:
         question_field.error_text = "Mensagem muito longa (máx. 50 chars)."
-        page.update()
+        schedule_update(page, question_field)
         return
     if await openai.is_sensitive_question(question):
         print("INFO: Pergunta sensível detectada")
         haptic_feedback.medium_impact()
         page.open(ft.SnackBar(ft.Text("Pergunta sensível detectada.")))
-        page.update()
         return
 
     ask_button.disabled = True
     ask_button.icon_color = ft.Colors.GREY_400
     question_field.value = ""
-    page.update()
+    schedule_update(page, ask_button, question_field)
 
     try:
         question_id = str(uuid.uuid4())
-        chat_container.controls.append(
-            ChatMessage(
-                Message(
-                    user_name="Você",
-                    text=question,
-                    user_type="user",
-                    created_at=datetime.now().isoformat(),
-                    show_avatar=True,
-                    gender=user_data.get("gender", "neutro"),
-                ),
-                page,
-                haptic_feedback,
+        question_control = chat_window.append(
+            Message(
+                user_name="Você",
+                text=question,
+                user_type="user",
+                created_at=datetime.now().isoformat(),
+                show_avatar=True,
+                gender=user_data.get("gender", "neutro"),
             )
         )
-        if len(chat_container.controls) > 50:
-            chat_container.controls.pop(0)
+        chat_window.scroll_to_end()
 
         typing = ft.AnimatedSwitcher(
             content=ft.Row(
@@ -399,6 +297,13 @@ async def ask_question(
                                 "update_plan_exercise requer new_exercise_name"
                             )
                     fres = await openai.execute_function_by_name(fname, args)
+                    if (
+                        fname == "update_plan_exercise"
+                        and isinstance(fres, dict)
+                        and fres.get("success")
+                    ):
+                        invalidate_views(page, "plans")
+                        supabase_service.invalidate_plan_queries(user_id)
                     tool_msg = {
                         "role": "tool",
                         "tool_call_id": tc.id,
@@ -425,30 +330,26 @@ async def ask_question(
                     }
                     messages.append(error_msg)
 
+        answer_controls = []
         for chunk, delay in integrate_with_chat(assistant_content):
             if not chunk.strip():
                 continue
-            chat_container.controls.append(typing)
-            page.update()
+            chat_window.show_typing(typing)
             await asyncio.sleep(0.3)
-            chat_container.controls.remove(typing)
+            chat_window.hide_typing(typing)
 
-            chat_container.controls.append(
-                ChatMessage(
+            answer_controls.append(
+                chat_window.append(
                     Message(
                         "Treinador Coachito",
                         chunk.strip(),
                         "assistant",
                         datetime.now().isoformat(),
                         True,
-                    ),
-                    page,
-                    haptic_feedback,
+                    )
                 )
             )
-            if len(chat_container.controls) > 50:
-                chat_container.controls.pop(0)
-            page.update()
+            chat_window.scroll_to_end()
             await asyncio.sleep(delay * 0.3)
 
         new_messages = [
@@ -465,20 +366,23 @@ async def ask_question(
             },
         ]
 
-        await save_conversation_history(supabase_service, user_id, new_messages)
+        saved_seq = await save_conversation_history(
+            supabase_service, user_id, new_messages
+        )
+        if saved_seq:
+            chat_window.mark_saved([question_control], saved_seq - 1)
+            chat_window.mark_saved(answer_controls, saved_seq)
 
         haptic_feedback.light_impact()
         page.open(ft.SnackBar(ft.Text("Pergunta enviada com sucesso!")))
-        page.update()
         last_question_time[0] = current_time
 
     except Exception as ex:
         print(f"ERROR: ask_question falhou: {ex}")
         haptic_feedback.heavy_impact()
         page.open(ft.SnackBar(ft.Text(f"Erro: {ex}")))
-        page.update()
 
     finally:
         ask_button.disabled = False
         ask_button.icon_color = ft.Colors.BLUE_400
-        page.update()
+        schedule_update(page, ask_button)
@@ -0,0 +1,299 @@
+import itertools
+import threading
+from datetime import datetime
+from typing import List, Optional
+import flet as ft
+from core.update_scheduler import UpdateScheduler, schedule_update
+from services.supabase import SupabaseService
+from .data import HISTORY_PAGE_SIZE, fetch_history_page
+from .message import Message, ChatMessage
+
+# Máximo de balões construídos na lista do chat
+MAX_CHAT_CONTROLS = 50
+# Distância (px) da borda da lista que dispara a carga de outra página
+LOAD_PAGE_THRESHOLD = 150
+# Balões guardados para reuso
+MAX_POOL_SIZE = 20
+GREETING_TEXT = "Olá! Como posso ajudar com seu treino hoje? 😄"
+
+_keys = itertools.count(1)
+
+
+class ChatWindow:
+    """
+    Janela deslizante sobre o histórico do chat do treinador.
+
+    A ListView nunca tem mais que `max_controls` balões. Ao abrir, só a
+    página mais recente do histórico é construída; rolar até o topo busca a
+    página anterior (get_trainer_history_page) e, se a janela passar do
+    limite, descarta balões do fim, que voltam ao rolar para baixo. Balões
+    descartados vão para um pool e são reaproveitados com `ChatMessage.bind`.
+
+    Cada balão guarda `seq`, a posição da mensagem no histórico salvo;
+    mensagens ainda não salvas (seq None) nunca saem da janela.
+    """
+
+    def __init__(
+        self,
+        page: ft.Page,
+        supabase_service: SupabaseService,
+        list_view: ft.ListView,
+        haptic_feedback: ft.HapticFeedback,
+        user_data: dict,
+        user_id: str,
+        max_controls: int = MAX_CHAT_CONTROLS,
+        page_size: int = HISTORY_PAGE_SIZE,
+    ):
+        self.page = page
+        self.supabase_service = supabase_service
+        self.list_view = list_view
+        self.haptic_feedback = haptic_feedback
+        self.user_data = user_data
+        self.user_id = user_id
+        self.max_controls = max_controls
+        self.page_size = page_size
+        self.has_older = False
+        self.at_latest = True
+        self._pool: List[ChatMessage] = []
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+
+        # A rolagem até a última mensagem é feita aqui (scroll_to), para que
+        # páginas inseridas no topo não levem a lista de volta ao fim
+        list_view.auto_scroll = False
+        list_view.on_scroll = self._handle_scroll
+        list_view.on_scroll_interval = 200
+
+    @property
+    def controls(self) -> List[ft.Control]:
+        return self.list_view.controls
+
+    # Construção e reuso dos balões
+
+    def _build(self, message: Message, seq: Optional[int] = None) -> ChatMessage:
+        if self._pool:
+            control = self._pool.pop()
+            control.bind(message, seq)
+            return control
+        control = ChatMessage(message, self.page, self.haptic_feedback, seq)
+        control.key = f"chat-{next(_keys)}"
+        return control
+
+    def _recycle(self, controls: List[ft.Control]) -> None:
+        for control in controls:
+            if isinstance(control, ChatMessage) and len(self._pool) < MAX_POOL_SIZE:
+                self._pool.append(control)
+
+    def _greeting(self) -> ChatMessage:
+        return self._build(
+            Message(
+                user_name="Treinador Coachito",
+                text=GREETING_TEXT,
+                user_type="trainer",
+                created_at=datetime.now().isoformat(),
+                show_avatar=True,
+            ),
+            seq=0,
+        )
+
+    def _from_row(self, row: dict) -> Optional[ChatMessage]:
+        msg = row.get("message")
+        if not isinstance(msg, dict) or not msg.get("content"):
+            print(f"WARNING: Mensagem inválida ignorada: {msg}")
+            return None
+        is_user = msg.get("role") == "user"
+        return self._build(
+            Message(
+                user_name="Você" if is_user else "Treinador",
+                text=msg["content"],
+                user_type=msg.get("role", "user"),
+                created_at=(
+                    msg.get("timestamp")
+                    or msg.get("created_at")
+                    or datetime.now().isoformat()
+                ),
+                show_avatar=True,
+                gender=self.user_data.get("gender", "neutro") if is_user else "neutro",
+                user_id=self.user_id if is_user else None,
+            ),
+            seq=row["seq"],
+        )
+
+    def _build_rows(self, rows: List[dict]) -> List[ft.Control]:
+        return [c for c in (self._from_row(row) for row in rows) if c is not None]
+
+    @staticmethod
+    def _seq(control: ft.Control) -> Optional[int]:
+        return getattr(control, "seq", None)
+
+    # Janela
+
+    def reset(self) -> None:
+        """Esvazia o chat, deixando só a saudação."""
+        with self._lock:
+            self._recycle(self.controls)
+            self.controls.clear()
+            self.controls.append(self._greeting())
+            self.has_older = False
+            self.at_latest = True
+
+    def open(self) -> None:
+        """Constrói só a página mais recente do histórico. Erros são propagados."""
+        rows = fetch_history_page(self.supabase_service, limit=self.page_size)
+        with self._lock:
+            self._recycle(self.controls)
+            self.controls.clear()
+            self.has_older = len(rows) == self.page_size
+            if not self.has_older:
+                self.controls.append(self._greeting())
+            self.controls.extend(self._build_rows(rows))
+            self.at_latest = True
+        print(f"INFO: Chat aberto com {len(rows)} mensagens do histórico")
+
+    def load_older(self) -> None:
+        """Insere no topo a página anterior e descarta o excesso do fim."""
+        if not self._loading.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                if not self.has_older or not self.controls:
+                    return
+                anchor = self.controls[0]
+                before = self._seq(anchor)
+            if not before:
+                return
+            rows = fetch_history_page(
+                self.supabase_service, before=before, limit=self.page_size
+            )
+            with self._lock:
+                if not self.controls or self.controls[0] is not anchor:
+                    return  # a janela mudou durante a busca
+                self.has_older = len(rows) == self.page_size
+                older = self._build_rows(rows)
+                if not self.has_older:
+                    older.insert(0, self._greeting())
+                self.controls[0:0] = older
+                self._trim_end()
+            # Mantém na tela a mensagem que estava no topo
+            self.list_view.scroll_to(key=anchor.key, duration=0)
+            print(f"INFO: {len(rows)} mensagens antigas carregadas no chat")
+        except Exception as e:
+            print(f"ERROR: Falha ao carregar mensagens antigas: {e}")
+        finally:
+            self._loading.release()
+
+    def load_newer(self) -> None:
+        """Traz de volta ao fim da janela as mensagens descartadas ao subir."""
+        if not self._loading.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                if self.at_latest or not self.controls:
+                    return
+                tail = self.controls[-1]
+                after = self._seq(tail)
+            if after is None:
+                return
+            rows = fetch_history_page(
+                self.supabase_service, after=after, limit=self.page_size
+            )
+            with self._lock:
+                if not self.controls or self.controls[-1] is not tail:
+                    return
+                self.at_latest = len(rows) < self.page_size
+                self.controls.extend(self._build_rows(rows))
+                self._trim_start()
+            schedule_update(self.page, self.list_view)
+        except Exception as e:
+            print(f"ERROR: Falha ao carregar mensagens recentes: {e}")
+        finally:
+            self._loading.release()
+
+    def _trim_start(self) -> None:
+        """Descarta balões do topo acima do limite, sem partir uma mensagem."""
+        drop = self._trim_count(self.controls)
+        if drop:
+            self._recycle(self.controls[:drop])
+            del self.controls[:drop]
+            self.has_older = True
+
+    def _trim_end(self) -> None:
+        """Descarta balões do fim acima do limite, sem partir uma mensagem."""
+        drop = self._trim_count(self.controls[::-1])
+        if drop:
+            self._recycle(self.controls[-drop:])
+            del self.controls[-drop:]
+            self.at_latest = False
+
+    def _trim_count(self, controls: List[ft.Control]) -> int:
+        """
+        Quantos balões do começo de `controls` podem sair: o excesso sobre o
+        limite, mais os pedaços restantes da mesma mensagem. Para em
+        mensagens não salvas.
+        """
+        excess = len(controls) - self.max_controls
+        drop = 0
+        while drop < len(controls):
+            seq = self._seq(controls[drop])
+            if seq is None:
+                break
+            if drop >= excess and (drop == 0 or seq != self._seq(controls[drop - 1])):
+                break
+            drop += 1
+        return drop
+
+    # Mensagens da conversa atual
+
+    def append(self, message: Message) -> ChatMessage:
+        """Acrescenta uma mensagem nova (ainda não salva) ao fim do chat."""
+        if not self.at_latest:
+            try:
+                self.open()
+            except Exception as e:
+                print(f"ERROR: Falha ao voltar ao fim do chat: {e}")
+        with self._lock:
+            control = self._build(message)
+            self.controls.append(control)
+            self._trim_start()
+        schedule_update(self.page, self.list_view)
+        return control
+
+    def show_typing(self, indicator: ft.Control) -> None:
+        with self._lock:
+            self.controls.append(indicator)
+        schedule_update(self.page, self.list_view)
+
+    def hide_typing(self, indicator: ft.Control) -> None:
+        with self._lock:
+            if self.controls and self.controls[-1] is indicator:
+                self.controls.pop()
+            elif indicator in self.controls:
+                self.controls.remove(indicator)
+        schedule_update(self.page, self.list_view)
+
+    def mark_saved(self, controls: List[ChatMessage], seq: int) -> None:
+        """Registra a posição no histórico de balões recém-salvos."""
+        for control in controls:
+            control.seq = seq
+
+    def scroll_to_end(self) -> None:
+        if self.list_view.page:
+            # Balões marcados neste quadro precisam chegar antes da rolagem
+            UpdateScheduler.get(self.page).flush()
+            self.list_view.scroll_to(offset=-1, duration=300)
+
+    def _handle_scroll(self, e: ft.OnScrollEvent) -> None:
+        if e.pixels is None:
+            return
+        if (
+            self.has_older
+            and e.min_scroll_extent is not None
+            and e.pixels <= e.min_scroll_extent + LOAD_PAGE_THRESHOLD
+        ):
+            self.page.run_thread(self.load_older)
+        elif (
+            not self.at_latest
+            and e.max_scroll_extent is not None
+            and e.pixels >= e.max_scroll_extent - LOAD_PAGE_THRESHOLD
+        ):
+            self.page.run_thread(self.load_newer)
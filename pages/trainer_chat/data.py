@@ -1,45 +1,55 @@
 import flet as ft
 from services.supabase import SupabaseService
+from services import query_specs
 from utils.alerts import CustomSnackBar
 import sys
+from typing import List, Optional
+
+HISTORY_PAGE_SIZE = 20
+
+
+def _default_profile(user_id: str) -> dict:
+    return {
+        "name": "Usuário",
+        "age": "N/A",
+        "weight": "N/A",
+        "height": "N/A",
+        "goal": "N/A",
+        "level": "N/A",
+        "user_id": user_id,
+    }
 
 
 def get_user_profile(supabase_service: SupabaseService, user_id: str) -> dict:
-    """Carrega os dados do perfil do usuário do Supabase com cache."""
+    """Carrega os dados do perfil do usuário a partir do ProfileStore."""
     try:
-        user_profile = (
-            supabase_service.client.table("user_profiles")
-            .select("name, age, weight, height, goal, level")
-            .eq("user_id", user_id)
-            .execute()
-            .data
-        )
-        profile = (
-            user_profile[0]
-            if user_profile
-            else {
-                "name": "Usuário",
-                "age": "N/A",
-                "weight": "N/A",
-                "height": "N/A",
-                "goal": "N/A",
-                "level": "N/A",
-                "user_id": user_id,
-            }
-        )
+        profile = supabase_service.load_profile(user_id)
         print(f"INFO: Perfil carregado para user_id: {user_id}")
-        return profile
     except Exception as e:
         print(f"ERROR: Falha ao carregar perfil do usuário {user_id}: {str(e)}", file=sys.stderr)
-        return {
-            "name": "Usuário",
-            "age": "N/A",
-            "weight": "N/A",
-            "height": "N/A",
-            "goal": "N/A",
-            "level": "N/A",
-            "user_id": user_id,
-        }
+        profile = None
+    if not profile:
+        return _default_profile(user_id)
+    # Só as colunas que o contexto do treinador usa
+    return {field: profile.get(field) for field in query_specs.PROFILE_TRAINER.columns}
+
+
+def fetch_history_page(
+    supabase_service: SupabaseService,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = HISTORY_PAGE_SIZE,
+) -> List[dict]:
+    """
+    Uma página do histórico do chat (RPC get_trainer_history_page), em ordem
+    cronológica. Cada item traz `seq` (posição no histórico) e `message`.
+    Sem cursores, devolve as mensagens mais recentes. Erros são propagados.
+    """
+    response = supabase_service.client.rpc(
+        "get_trainer_history_page",
+        {"p_before": before, "p_after": after, "p_limit": limit},
+    ).execute()
+    return response.data or []
 
 
 async def validate_user_session(
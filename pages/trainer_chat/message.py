@@ -1,5 +1,6 @@
 import flet as ft
 from datetime import datetime
+from core.update_scheduler import schedule_update
 
 
 class Message:
@@ -24,54 +25,39 @@ class Message:
 
 class ChatMessage(ft.Container):
     def __init__(
-        self, message: Message, page: ft.Page, haptic_feedback: ft.HapticFeedback = None
+        self,
+        message: Message,
+        page: ft.Page,
+        haptic_feedback: ft.HapticFeedback = None,
+        seq: int = None,
     ):
         super().__init__()
-        self.message = message
         self.page = page
         self.haptic_feedback = haptic_feedback
-        self.is_user = message.user_type == "user"
-
-        # Criar avatar com fallback
-        avatar = None
-        if message.show_avatar:
-            if self.is_user:
-                avatar = self._create_user_avatar(message)
-            else:
-                avatar = self._create_trainer_avatar()
-
-        self.time_str = self._format_timestamp(message.created_at)
 
         self.message_text_ref = ft.Ref[ft.Markdown]()
         self.time_display_ref = ft.Ref[ft.Text]()
 
         self.message_text = ft.Markdown(
             ref=self.message_text_ref,
-            value=message.text,
             selectable=True,
             extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
             on_tap_link=self._handle_link_tap,
             opacity=1,
             animate_opacity=ft.Animation(300, ft.AnimationCurve.EASE_IN),
         )
-        self.opacity = 1
-        self.offset = ft.Offset(0, 0)
 
         self.time_display = ft.Text(
             ref=self.time_display_ref,
-            value=self.time_str,
             size=11,
             text_align=ft.TextAlign.RIGHT,
             weight=ft.FontWeight.W_400,
         )
 
-        list_tile = ft.ListTile(
-            leading=avatar,
-            title=ft.Text(
-                message.user_name,
-                size=15,
-                weight=ft.FontWeight.W_600,
-            ),
+        self.name_text = ft.Text(size=15, weight=ft.FontWeight.W_600)
+
+        self.list_tile = ft.ListTile(
+            title=self.name_text,
             subtitle=ft.Column(
                 [
                     self.message_text,
@@ -85,12 +71,9 @@ class ChatMessage(ft.Container):
             min_leading_width=40,
         )
 
-        self.content = list_tile
+        self.content = self.list_tile
         self.padding = ft.padding.symmetric(horizontal=4, vertical=2)
         self.border_radius = 12
-        self.alignment = (
-            ft.alignment.center_right if self.is_user else ft.alignment.center_left
-        )
 
         window_width = 800  # Valor padrão
         if page.window and hasattr(page.window, "width") and page.window.width:
@@ -101,10 +84,39 @@ class ChatMessage(ft.Container):
         self.clip_behavior = ft.ClipBehavior.HARD_EDGE
         self.animate_opacity = ft.Animation(400, ft.AnimationCurve.EASE_OUT)
         self.animate_offset = ft.Animation(400, ft.AnimationCurve.EASE_OUT)
-        self.offset = ft.Offset(0.2 if self.is_user else -0.2, 0)
-        self.opacity = 0
 
+        self.bind(message, seq)
+
+    def bind(self, message: Message, seq: int = None):
+        """
+        Preenche o balão com outra mensagem. Permite reaproveitar o controle
+        quando ele sai da janela do chat, em vez de construir um novo.
+        `seq` é a posição da mensagem no histórico salvo (None se ainda não
+        foi salva).
+        """
+        self.message = message
+        self.seq = seq
+        self.is_user = message.user_type == "user"
+
+        # Criar avatar com fallback
+        avatar = None
+        if message.show_avatar:
+            if self.is_user:
+                avatar = self._create_user_avatar(message)
+            else:
+                avatar = self._create_trainer_avatar()
+        self.list_tile.leading = avatar
+
+        self.time_str = self._format_timestamp(message.created_at)
+        self.name_text.value = message.user_name
+        self.message_text.value = message.text
+        self.time_display.value = self.time_str
 
+        self.alignment = (
+            ft.alignment.center_right if self.is_user else ft.alignment.center_left
+        )
+        self.offset = ft.Offset(0.2 if self.is_user else -0.2, 0)
+        self.opacity = 0
 
     def _create_user_avatar(self, message: Message) -> ft.CircleAvatar:
         """Cria avatar do usuário usando a API thumbs da DiceBear"""
@@ -163,7 +175,7 @@ class ChatMessage(ft.Container):
     def did_mount(self):
         self.opacity = 1
         self.offset = ft.Offset(0, 0)
-        self.update()
+        schedule_update(self.page, self)
 
     def _format_timestamp(self, created_at: str) -> str:
         """Formata timestamp com fuso horário local ou UTC"""
@@ -211,7 +223,6 @@ class ChatMessage(ft.Container):
                     self.message.created_at
                 )
 
-            if self.page:
-                self.page.update()
+            schedule_update(self.page, self)
         except Exception as e:
             print(f"ERROR: Falha ao atualizar texto da mensagem: {e}")
\ No newline at end of file
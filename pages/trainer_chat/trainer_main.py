@@ -6,6 +6,7 @@ from pages.trainer_chat.components import (
     create_clear_button,
 )
 from pages.trainer_chat.chat_logic import load_chat_history, clear_chat, ask_question
+from pages.trainer_chat.chat_window import ChatWindow
 from pages.trainer_chat.data import get_user_profile, validate_user_session
 from services.supabase import SupabaseService
 from services.openai import OpenAIService
@@ -25,6 +26,7 @@ class TrainerChatInitializer:
         self.user_id = page.client_storage.get("supafit.user_id")
         self.user_data = {}
         self.history_cache = []
+        self.chat_window = None
         self.haptic_feedback = ft.HapticFeedback()
         self.initialization_complete = False
 
@@ -153,14 +155,15 @@ class TrainerChatInitializer:
         try:
             print("[TRAINER] Carregando histórico do chat...")
 
-            self.history_cache = await load_chat_history(
+            self.chat_window = ChatWindow(
+                self.page,
                 self.supabase_service,
-                self.user_id,
                 chat_container,
-                self.page,
                 self.haptic_feedback,
                 self.user_data,
+                self.user_id,
             )
+            self.history_cache = await load_chat_history(self.chat_window, self.page)
 
             print(f"[TRAINER] Histórico carregado: {len(self.history_cache)} mensagens")
             return True
@@ -239,7 +242,7 @@ class TrainerChatInitializer:
                 self.openai,
                 question_field,
                 ask_button,
-                chat_container,
+                self.chat_window,
                 self.user_data,
                 self.user_id,
                 last_question_time,
@@ -251,7 +254,7 @@ class TrainerChatInitializer:
             await clear_chat(
                 self.supabase_service,
                 self.user_id,
-                chat_container,
+                self.chat_window,
                 self.page,
                 self.haptic_feedback,
             )
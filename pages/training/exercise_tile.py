@@ -1,10 +1,11 @@
 import flet as ft
-from flet_video import Video, VideoMedia
 import logging
 import os
 
 from components.components import LoadEditor, TimerDialog
+from core.update_scheduler import schedule_update
 from .training_components import RestTimerDialog
+from .video_player import LazyVideoPlayer
 
 logger = logging.getLogger("supafit.exercise_tile")
 
@@ -18,6 +19,7 @@ class ExerciseTile(ft.Container):
         load: float,
         video_url: str = None,
         image_url: str = None,
+        thumbnail_url: str = None,
         exercise_id: str = None,
         plan_id: str = None,
         user_id: str = None,
@@ -38,7 +40,8 @@ class ExerciseTile(ft.Container):
         self.plan_id = plan_id
         self.user_id = user_id
         self.video_url = video_url
-        self.image_url = image_url or "https://picsum.photos/200"
+        self.thumbnail_url = thumbnail_url
+        self.image_url = image_url or thumbnail_url or "https://picsum.photos/200"
         self.page = page
         self.supabase = supabase
         self.on_favorite_click = on_favorite_click
@@ -55,34 +58,12 @@ class ExerciseTile(ft.Container):
         ] * self.series
         self._was_completed = False  # Rastreia se já foi concluído anteriormente
 
-        def get_video_source():
-            logger.info(
-                f"Carregando vídeo diretamente do Supabase para {self.exercise_name}: {self.video_url}"
-            )
-            return self.video_url
-
-        url = get_video_source()
+        url = self.video_url
         if url:
-            media = Video(
-                playlist=[VideoMedia(url)],
-                expand=True,
-                aspect_ratio=16 / 9,
-                fit=ft.ImageFit.COVER,
-                autoplay=False,
-                show_controls=True,
-                filter_quality=ft.FilterQuality.MEDIUM,
-                on_loaded=lambda e: logger.info(
-                    f"Vídeo carregado para {self.exercise_name}"
-                ),
-                on_error=lambda e: logger.error(
-                    f"Erro ao carregar vídeo para {self.exercise_name}: {e}"
-                ),
-                on_enter_fullscreen=lambda e: logger.info(
-                    f"Entrou em tela cheia para {self.exercise_name}"
-                ),
-                on_exit_fullscreen=lambda e: logger.info(
-                    f"Saiu de tela cheia para {self.exercise_name}"
-                ),
+            # O player nativo só é criado quando o usuário toca no pôster e
+            # toca a cópia do VideoCache quando ela já existe
+            media = LazyVideoPlayer(
+                url, title=self.exercise_name, poster_src=self.thumbnail_url
             )
         else:
             logger.warning(
@@ -330,16 +311,17 @@ class ExerciseTile(ft.Container):
             if self.on_complete:
                 self.on_complete(increment=True)
             if self.page:
-                self.page.snack_bar = ft.SnackBar(
-                    content=ft.Text(
-                        f"🎉 {self.exercise_name} - Todas as séries concluídas!",
-                        color=ft.Colors.WHITE,
-                    ),
-                    bgcolor=ft.Colors.GREEN_700,
-                    duration=3000,
+                # page.open já envia a própria atualização do overlay
+                self.page.open(
+                    ft.SnackBar(
+                        content=ft.Text(
+                            f"🎉 {self.exercise_name} - Todas as séries concluídas!",
+                            color=ft.Colors.WHITE,
+                        ),
+                        bgcolor=ft.Colors.GREEN_700,
+                        duration=3000,
+                    )
                 )
-                self.page.snack_bar.open = True
-                self.page.update()
         elif not all_series_completed and self.is_completed:
             self.is_completed = False
             self.completion_overlay.visible = False
@@ -348,20 +330,20 @@ class ExerciseTile(ft.Container):
             if self.on_complete:
                 self.on_complete(increment=False)
             if self.page:
-                self.page.snack_bar = ft.SnackBar(
-                    content=ft.Text(
-                        f"↩️ {self.exercise_name} - Série desmarcada!",
-                        color=ft.Colors.WHITE,
-                    ),
-                    bgcolor=ft.Colors.BLUE_700,
-                    duration=2000,
+                self.page.open(
+                    ft.SnackBar(
+                        content=ft.Text(
+                            f"↩️ {self.exercise_name} - Série desmarcada!",
+                            color=ft.Colors.WHITE,
+                        ),
+                        bgcolor=ft.Colors.BLUE_700,
+                        duration=2000,
+                    )
                 )
-                self.page.snack_bar.open = True
-                self.page.update()
 
         self._update_series_buttons()
         self._update_progress_indicator()
-        self.update()
+        schedule_update(self.page, self)
 
         logger.info(
             f"Série {series_index + 1} {'marcada' if self.series_completed[series_index] else 'desmarcada'} "
@@ -415,16 +397,16 @@ class ExerciseTile(ft.Container):
 
             def on_timer_complete():
                 if self.page:
-                    self.page.snack_bar = ft.SnackBar(
-                        content=ft.Text(
-                            f"⏰ Tempo de descanso finalizado para {self.exercise_name}!",
-                            color=ft.Colors.WHITE,
-                        ),
-                        bgcolor=ft.Colors.PRIMARY,
-                        duration=2000,
+                    self.page.open(
+                        ft.SnackBar(
+                            content=ft.Text(
+                                f"⏰ Tempo de descanso finalizado para {self.exercise_name}!",
+                                color=ft.Colors.WHITE,
+                            ),
+                            bgcolor=ft.Colors.PRIMARY,
+                            duration=2000,
+                        )
                     )
-                    self.page.snack_bar.open = True
-                    self.page.update()
                     logger.info(
                         f"Timer de descanso finalizado para {self.exercise_name}"
                     )
@@ -450,7 +432,7 @@ class ExerciseTile(ft.Container):
         logger.info(
             f"Exercício {self.exercise_name} {'favoritado' if self.is_favorited else 'desfavoritado'}"
         )
-        self.update()
+        schedule_update(self.page, self)
 
     def enable_controls(self):
         """Habilita os controles do exercício quando o treino inicia"""
@@ -460,7 +442,7 @@ class ExerciseTile(ft.Container):
             for i, button in enumerate(self.series_buttons):
                 button.disabled = i > self.completed_sets
         logger.debug(f"Controles habilitados para {self.exercise_name}")
-        self.update()
+        schedule_update(self.page, self)
 
     def disable_controls(self):
         """Desabilita os controles do exercício"""
@@ -469,7 +451,7 @@ class ExerciseTile(ft.Container):
         for button in self.series_buttons:
             button.disabled = True
         logger.debug(f"Controles desabilitados para {self.exercise_name}")
-        self.update()
+        schedule_update(self.page, self)
 
     def reset_exercise(self):
         """Reseta o estado do exercício"""
@@ -484,4 +466,4 @@ class ExerciseTile(ft.Container):
         for button in self.series_buttons:
             button.disabled = True
         logger.debug(f"Exercício {self.exercise_name} resetado")
-        self.update()
+        schedule_update(self.page, self)
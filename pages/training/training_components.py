@@ -1,9 +1,9 @@
 import flet as ft
-import asyncio
-import threading
+import math
 import time
 from datetime import datetime
 import logging
+from core.ticker import Ticker
 logger = logging.getLogger(__name__)
 
 class TrainingTimer(ft.Container):
@@ -12,9 +12,11 @@ class TrainingTimer(ft.Container):
     def __init__(
         self, on_start=None, on_pause=None, on_resume=None, on_finish=None, ref=None
     ):
-        self.training_time = 0
         self.is_running = False
-        self.timer_thread = None
+        # Tempo acumulado até a última pausa e início do trecho atual (monotônico)
+        self._elapsed = 0.0
+        self._running_since = None
+        self._tick_token = None
         self.on_start = on_start
         self.on_pause = on_pause
         self.on_resume = on_resume
@@ -102,34 +104,61 @@ class TrainingTimer(ft.Container):
             ref=ref,
         )
 
-    def _run_timer(self):
-        """Timer rodando em thread separada"""
-        while self.is_running:
-            if self.page:
-                self.training_time += 1
-                hours, remainder = divmod(self.training_time, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                self.time_display.value = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                try:
-                    self.time_display.update()
-                except:
-                    pass
-            time.sleep(1)
+    @property
+    def training_time(self) -> int:
+        """Segundos de treino, sem contar as pausas."""
+        elapsed = self._elapsed
+        if self._running_since is not None:
+            elapsed += time.monotonic() - self._running_since
+        return int(elapsed)
 
-    def _handle_start(self, e):
+    def _format_training_time(self) -> str:
+        hours, remainder = divmod(self.training_time, 3600)
+        minutes, seconds = divmod(remainder, 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+    def _on_tick(self, now: float):
+        self.time_display.value = self._format_training_time()
+        return [self.time_display]
+
+    def _start_clock(self):
         self.is_running = True
+        self._running_since = time.monotonic()
+        if self._tick_token is None:
+            self._tick_token = Ticker.get(self.page).subscribe(self._on_tick)
+
+    def _stop_clock(self):
+        self.is_running = False
+        if self._running_since is not None:
+            self._elapsed += time.monotonic() - self._running_since
+            self._running_since = None
+        if self._tick_token is not None:
+            Ticker.get(self.page).unsubscribe(self._tick_token)
+            self._tick_token = None
+        self.time_display.value = self._format_training_time()
+
+    def did_mount(self):
+        # Volta a exibir o tempo se a view for remontada com o treino em curso
+        if self.is_running and self._tick_token is None:
+            self._tick_token = Ticker.get(self.page).subscribe(self._on_tick)
+
+    def will_unmount(self):
+        if self._tick_token is not None and self.page:
+            Ticker.get(self.page).unsubscribe(self._tick_token)
+            self._tick_token = None
+
+    def _handle_start(self, e):
         self.page = e.page
         self.start_button.visible = False
         self.pause_button.visible = True
         self.finish_button.visible = True
         if self.on_start:
             self.on_start()
-        self.timer_thread = threading.Thread(target=self._run_timer, daemon=True)
-        self.timer_thread.start()
+        self._start_clock()
         self.update()
 
     def _handle_pause(self, e):
-        self.is_running = False
+        self._stop_clock()
         self.pause_button.visible = False
         self.resume_button.visible = True
         if self.on_pause:
@@ -137,17 +166,15 @@ class TrainingTimer(ft.Container):
         self.update()
 
     def _handle_resume(self, e):
-        self.is_running = True
         self.pause_button.visible = True
         self.resume_button.visible = False
         if self.on_resume:
             self.on_resume()
-        self.timer_thread = threading.Thread(target=self._run_timer, daemon=True)
-        self.timer_thread.start()
+        self._start_clock()
         self.update()
 
     def _handle_finish(self, e):
-        self.is_running = False
+        self._stop_clock()
         if self.on_finish:
             self.on_finish()
 
@@ -158,14 +185,16 @@ class RestTimerDialog(ft.AlertDialog):
     def __init__(self, duration=60, exercise_name="", on_complete=None, page=None):
         super().__init__(modal=True)
         self.duration = duration
-        self.remaining_time = duration
+        # Fim do intervalo no relógio monotônico (ou segundos restantes na pausa)
+        self._ends_at = None
+        self._paused_remaining = float(duration)
         self.exercise_name = exercise_name
         self.on_complete = on_complete
         self.page = page
         self.is_running = False
         self.is_paused = False
         self.haptic = ft.HapticFeedback()
-        self._task = None
+        self._tick_token = None
 
         self.time_text_ref = ft.Ref[ft.Text]()
         self.progress_ring_ref = ft.Ref[ft.ProgressRing]()
@@ -274,6 +303,7 @@ class RestTimerDialog(ft.AlertDialog):
 
     def will_unmount(self):
         self.is_running = False
+        self._stop_ticking()
         if self.page and self.haptic in self.page.overlay:
             self.page.overlay.remove(self.haptic)
 
@@ -282,32 +312,43 @@ class RestTimerDialog(ft.AlertDialog):
         minutes, secs = divmod(seconds, 60)
         return f"{minutes:02d}:{secs:02d}"
 
-    async def _run_timer(self):
-        while self.is_running and self.remaining_time > 0:
-            if not self.is_paused:
-                self.time_text_ref.current.value = self._format_time(
-                    self.remaining_time
-                )
-                self.progress_ring_ref.current.value = (
-                    self.remaining_time / self.duration
-                )
-                try:
-                    self.time_text_ref.current.update()
-                    self.progress_ring_ref.current.update()
-                except Exception as e:
-                    logger.error(f"Erro ao atualizar UI do timer: {e}")
-                self.remaining_time -= 1
-            await asyncio.sleep(1)
-        if self.remaining_time <= 0 and self.is_running:
+    @property
+    def remaining_time(self) -> int:
+        """Segundos restantes, calculados a partir do relógio monotônico."""
+        if self.is_paused or self._ends_at is None:
+            remaining = self._paused_remaining
+        else:
+            remaining = self._ends_at - time.monotonic()
+        return max(math.ceil(remaining), 0)
+
+    def _render(self):
+        remaining = self.remaining_time
+        self.time_text_ref.current.value = self._format_time(remaining)
+        self.progress_ring_ref.current.value = remaining / self.duration
+        return [self.time_text_ref.current, self.progress_ring_ref.current]
+
+    def _on_tick(self, now: float):
+        if not self.is_running or self.is_paused:
+            return None
+        changed = self._render()
+        if self.remaining_time <= 0:
+            self._stop_ticking()
             self._timer_completed()
+        return changed
+
+    def _stop_ticking(self):
+        if self._tick_token is not None and self.page:
+            Ticker.get(self.page).unsubscribe(self._tick_token)
+        self._tick_token = None
 
     def start_timer(self, page):
         self.page = page
         self.is_running = True
+        self._ends_at = time.monotonic() + self.duration
         if self.page and self.haptic not in self.page.overlay:
             self.page.overlay.append(self.haptic)
         self.page.open(self)
-        self._task = page.run_task(self._run_timer)
+        self._tick_token = Ticker.get(page).subscribe(self._on_tick)
 
     def _timer_completed(self):
         if self.page and self.haptic in self.page.overlay:
@@ -332,6 +373,10 @@ class RestTimerDialog(ft.AlertDialog):
         self._close_dialog(None)
 
     def _toggle_pause(self, e):
+        if self.is_paused:
+            self._ends_at = time.monotonic() + self._paused_remaining
+        else:
+            self._paused_remaining = max(self._ends_at - time.monotonic(), 0)
         self.is_paused = not self.is_paused
         self.play_pause_btn.icon = (
             ft.Icons.PLAY_ARROW_ROUNDED if self.is_paused else ft.Icons.PAUSE_ROUNDED
@@ -342,10 +387,10 @@ class RestTimerDialog(ft.AlertDialog):
             logger.error(f"Erro ao atualizar botão de pausa: {e}")
 
     def _reset_timer(self, e):
-        self.remaining_time = self.duration
+        self._ends_at = time.monotonic() + self.duration
+        self._paused_remaining = float(self.duration)
         self.is_paused = False
-        self.time_text_ref.current.value = self._format_time(self.duration)
-        self.progress_ring_ref.current.value = 1.0
+        self._render()
         self.play_pause_btn.icon = ft.Icons.PAUSE_ROUNDED
         try:
             self.time_text_ref.current.update()
@@ -356,9 +401,7 @@ class RestTimerDialog(ft.AlertDialog):
 
     def _close_dialog(self, e):
         self.is_running = False
-        if self._task:
-            self._task.cancel()
-            self._task = None
+        self._stop_ticking()
         if self.page:
             try:
                 self.page.close(self)
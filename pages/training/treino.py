@@ -5,6 +5,8 @@ from dotenv import load_dotenv
 from supabase import create_client, Client
 import logging
 from pages.training.exercise_tile import ExerciseTile
+from services.swr_cache import SWRCache
+from services.video_cache import VideoCache
 from .training_components import (
     TrainingTimer,
     EmptyTrainingState,
@@ -33,66 +35,55 @@ def Treinopage(page: ft.Page, supabase: any, day: str, user_id: str):
     exercises_column_ref = ft.Ref[ft.Column]()
 
     def load_exercises(day: str, user_id: str):
-        print(
-            f"INFO - treino: Ignorando cache. Carregando exercícios diretamente do Supabase para {day} e user_id {user_id}"
-        )
-        raw_day = day.capitalize()
-        print(
-            f"DEBUG - treino: Filtrando exercícios para day = '{raw_day}' (via raw param '{day}')"
-        )
-        try:
-            response = (
-                supabase.client.table("user_plans")
-                .select(
-                    "plan_id, plan_exercises(exercise_id, sets, reps, order, exercicios(nome, url_video))"
-                )
-                .eq("user_id", user_id)
-                .eq("day", raw_day)
-                .order("order", desc=False, foreign_table="plan_exercises")
-                .execute()
+        print(f"INFO - treino: Carregando exercícios de {day} para user_id {user_id}")
+        if not supabase.sync_engine.ensure_plans(user_id):
+            print(
+                f"WARNING - treino: Nenhum plano disponível localmente para user_id {user_id}"
+            )
+            return None
+        supabase.sync_engine.request_sync()
+        exercises = load_local_exercises(day, user_id)
+        if not exercises:
+            print(
+                f"WARNING - treino: Nenhum exercício encontrado para {day} e user_id {user_id}"
             )
-            data = response.data or []
-            exercises = []
-            if data and data[0].get("plan_exercises"):
-                plan_id = data[0].get("plan_id")
-                for plan_ex in data[0]["plan_exercises"]:
-                    exercise = plan_ex.get("exercicios", {})
-                    exercises.append(
-                        {
-                            "name": exercise.get("nome", ""),
-                            "series": plan_ex.get("sets", 0),
-                            "repetitions": plan_ex.get("reps", ""),
-                            "load": supabase.get_latest_exercise_load(
-                                user_id, plan_ex.get("exercise_id", "")
-                            ),
-                            "video_url": exercise.get("url_video", None),
-                            "exercise_id": plan_ex.get("exercise_id", ""),
-                            "plan_id": plan_id,
-                        }
-                    )
-                print(
-                    f"INFO - treino: Carregados {len(exercises)} exercícios para {raw_day} e user_id {user_id}"
-                )
-            else:
-                print(
-                    f"WARNING - treino: Nenhum exercício encontrado para {raw_day} e user_id {user_id}"
-                )
-                return []
-            return exercises
-        except Exception as e:
-            print(f"ERROR - treino: Erro ao carregar exercícios do Supabase: {str(e)}")
             return []
+        return exercises
+
+    def load_local_exercises(day: str, user_id: str):
+        """Monta os exercícios do dia a partir do banco local (funciona offline)."""
+        store = supabase.local_store
+        plan = store.get_day_plan(user_id, day)
+        if not plan:
+            return None
+        plan_id = plan.get("plan_id")
+        exercises = []
+        for plan_ex in store.get_plan_exercises(plan_id):
+            exercise = plan_ex.get("exercicios") or {}
+            exercise_id = plan_ex.get("exercise_id", "")
+            latest_load = store.get_latest_load(user_id, exercise_id)
+            exercises.append(
+                {
+                    "name": exercise.get("nome", ""),
+                    "series": plan_ex.get("sets", 0),
+                    "repetitions": plan_ex.get("reps", ""),
+                    "load": latest_load if latest_load is not None else 0.0,
+                    "video_url": exercise.get("url_video", None),
+                    "thumbnail_url": exercise.get("thumbnail_url"),
+                    "exercise_id": exercise_id,
+                    "plan_id": plan_id,
+                }
+            )
+        print(
+            f"INFO - treino: {len(exercises)} exercícios de {day} carregados do banco local"
+        )
+        return exercises
 
     def load_rest_duration(user_id: str):
         try:
-            profile_response = (
-                supabase.client.table("user_profiles")
-                .select("rest_duration")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            if profile_response.data and len(profile_response.data) > 0:
-                rest_duration = profile_response.data[0].get("rest_duration", 60)
+            profile = supabase.load_profile(user_id)
+            if profile:
+                rest_duration = profile.get("rest_duration") or 60
                 print(
                     f"INFO - treino: rest_duration carregado para user_id {user_id}: {rest_duration}s"
                 )
@@ -108,13 +99,19 @@ def Treinopage(page: ft.Page, supabase: any, day: str, user_id: str):
             )
             return 60
 
-    rest_duration = load_rest_duration(user_id)
-    exercises = load_exercises(day, user_id)
+    def on_exercises_update(fresh_exercises):
+        """Aplica exercícios revalidados se o treino ainda não começou."""
+        nonlocal exercises
+        if training_started or not fresh_exercises:
+            return
+        exercises = fresh_exercises
+        build_exercise_tiles()
+        if progress_ref.current:
+            progress_ref.current.total_exercises = len(exercises)
+        if exercises_column.page:
+            exercises_column.update()
 
-    if not exercises:
-        return EmptyTrainingState(
-            day
-        )
+    rest_duration = load_rest_duration(user_id)
 
     exercise_refs = []
 
@@ -197,9 +194,6 @@ def Treinopage(page: ft.Page, supabase: any, day: str, user_id: str):
         on_resume=on_training_resume,
         on_finish=on_training_finish,
     )
-    progress_container = TrainingProgress(
-        completed_exercises, len(exercises), ref=progress_ref, visible=False
-    )
     exercises_column = ft.Column(
         ref=exercises_column_ref,
         spacing=15,
@@ -208,32 +202,56 @@ def Treinopage(page: ft.Page, supabase: any, day: str, user_id: str):
         controls=[],
     )
 
-    for ex in exercises:
-        exercise_ref = ft.Ref[ExerciseTile]()
-        exercise_refs.append(exercise_ref)
-        exercise_tile = ExerciseTile(
-            ref=exercise_ref,
-            exercise_name=ex["name"],
-            series=ex["series"],
-            repetitions=ex["repetitions"],
-            load=ex["load"],
-            video_url=ex["video_url"],
-            exercise_id=ex["exercise_id"],
-            plan_id=ex["plan_id"],
-            user_id=user_id,
-            on_favorite_click=favorite_ex,
-            on_load_save=lambda v, name=ex["name"]: print(
-                f"INFO - treino: Carga salva para {name}: {v}kg"
-            ),
-            on_complete=on_exercise_complete,
-            page=page,
-            supabase=supabase,
-            rest_duration=rest_duration,
-        )
-        exercises_column.controls.append(
-            exercise_tile
+    def build_exercise_tiles():
+        exercise_refs.clear()
+        exercises_column.controls.clear()
+        for ex in exercises:
+            exercise_ref = ft.Ref[ExerciseTile]()
+            exercise_refs.append(exercise_ref)
+            exercise_tile = ExerciseTile(
+                ref=exercise_ref,
+                exercise_name=ex["name"],
+                series=ex["series"],
+                repetitions=ex["repetitions"],
+                load=ex["load"],
+                video_url=ex["video_url"],
+                thumbnail_url=ex.get("thumbnail_url"),
+                exercise_id=ex["exercise_id"],
+                plan_id=ex["plan_id"],
+                user_id=user_id,
+                on_favorite_click=favorite_ex,
+                on_load_save=lambda v, name=ex["name"]: print(
+                    f"INFO - treino: Carga salva para {name}: {v}kg"
+                ),
+                on_complete=on_exercise_complete,
+                page=page,
+                supabase=supabase,
+                rest_duration=rest_duration,
+            )
+            exercises_column.controls.append(exercise_tile)
+
+    # Lido só depois de definidos os controles e callbacks que
+    # on_exercises_update usa: a revalidação pode chegar a qualquer momento
+    exercises = SWRCache.get_instance(page).read(
+        f"treino.exercises:{user_id}:{day}",
+        lambda: load_exercises(day, user_id),
+        on_exercises_update,
+    )
+
+    if not exercises:
+        return EmptyTrainingState(
+            day
         )
 
+    # Baixa em segundo plano os vídeos do dia para tocar do disco/offline
+    VideoCache.get_instance().prefetch(ex.get("video_url") for ex in exercises)
+
+    progress_container = TrainingProgress(
+        completed_exercises, len(exercises), ref=progress_ref, visible=False
+    )
+
+    build_exercise_tiles()
+
     return ft.Column(
         [
             ft.Container(height=10),
@@ -0,0 +1,149 @@
+import flet as ft
+from flet_video import Video, VideoMedia
+import logging
+from typing import Optional
+
+from core.update_scheduler import schedule_update
+from services.video_cache import VideoCache
+
+logger = logging.getLogger("supafit.video_player")
+
+ACTIVE_VIDEO_SESSION_KEY = "supafit.active_video"
+
+
+class LazyVideoPlayer(ft.Container):
+    """
+    Vídeo de exercício criado sob demanda.
+
+    Mostra só um placeholder (pôster ou ícone) até o usuário tocar nele;
+    aí cria o `Video` nativo e começa a tocar. Fechar o player, abrir outro
+    ou sair da tela remove o `Video` da árvore, o que libera o player
+    nativo. A página guarda em `page.session` o player ativo: no máximo
+    um por vez.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        title: str = "",
+        poster_src: Optional[str] = None,
+    ):
+        super().__init__(expand=True, aspect_ratio=16 / 9)
+        self.url = url
+        self.title = title
+        self.poster_src = poster_src
+        self.player: Optional[Video] = None
+        # Arquivo do cache em reprodução, fixado até o player ser liberado
+        self._pinned_path: Optional[str] = None
+        self.border_radius = ft.border_radius.all(10)
+        self.clip_behavior = ft.ClipBehavior.HARD_EDGE
+        self.content = self._build_placeholder()
+
+    @property
+    def is_active(self) -> bool:
+        return self.player is not None
+
+    def _build_placeholder(self) -> ft.Control:
+        if self.poster_src:
+            background = ft.Image(
+                src=self.poster_src,
+                expand=True,
+                fit=ft.ImageFit.COVER,
+                gapless_playback=True,
+                error_content=ft.Container(bgcolor=ft.Colors.BLACK87),
+            )
+        else:
+            background = ft.Container(bgcolor=ft.Colors.BLACK87, expand=True)
+
+        return ft.Stack(
+            [
+                background,
+                ft.Container(
+                    content=ft.Icon(
+                        ft.Icons.PLAY_CIRCLE_FILL_ROUNDED,
+                        size=56,
+                        color=ft.Colors.WHITE,
+                    ),
+                    alignment=ft.alignment.center,
+                    expand=True,
+                    on_click=self.activate,
+                    tooltip=f"Ver vídeo: {self.title}" if self.title else "Ver vídeo",
+                ),
+            ],
+            expand=True,
+        )
+
+    def _build_player(self) -> Video:
+        # Arquivo do cache em disco quando já baixado; senão, streaming
+        source = VideoCache.get_instance().source_for(self.url, pin=True)
+        if source != self.url:
+            self._pinned_path = source
+        return Video(
+            playlist=[VideoMedia(source)],
+            expand=True,
+            aspect_ratio=16 / 9,
+            fit=ft.ImageFit.COVER,
+            autoplay=True,
+            show_controls=True,
+            filter_quality=ft.FilterQuality.MEDIUM,
+            on_loaded=lambda e: logger.info(f"Vídeo carregado para {self.title}"),
+            on_error=lambda e: logger.error(
+                f"Erro ao carregar vídeo para {self.title}: {e}"
+            ),
+            on_enter_fullscreen=lambda e: logger.info(
+                f"Entrou em tela cheia para {self.title}"
+            ),
+            on_exit_fullscreen=lambda e: logger.info(
+                f"Saiu de tela cheia para {self.title}"
+            ),
+        )
+
+    def activate(self, e=None):
+        """Cria o player e começa a tocar, fechando o que estiver ativo."""
+        if self.is_active or not self.page:
+            return
+        current = self.page.session.get(ACTIVE_VIDEO_SESSION_KEY)
+        if current is not None and current is not self:
+            current.deactivate()
+
+        self.player = self._build_player()
+        self.content = ft.Stack(
+            [
+                self.player,
+                ft.Container(
+                    content=ft.IconButton(
+                        icon=ft.Icons.CLOSE_ROUNDED,
+                        icon_color=ft.Colors.WHITE,
+                        bgcolor=ft.Colors.with_opacity(0.5, ft.Colors.BLACK),
+                        tooltip="Fechar vídeo",
+                        on_click=self.deactivate,
+                    ),
+                    top=4,
+                    right=4,
+                ),
+            ],
+            expand=True,
+        )
+        self.page.session.set(ACTIVE_VIDEO_SESSION_KEY, self)
+        logger.info(f"Player de vídeo criado para {self.title}")
+        schedule_update(self.page, self)
+
+    def deactivate(self, e=None, update: bool = True):
+        """Remove o player (liberando o nativo) e volta ao placeholder."""
+        if not self.is_active:
+            return
+        self.player = None
+        if self._pinned_path:
+            VideoCache.get_instance().unpin(self._pinned_path)
+            self._pinned_path = None
+        self.content = self._build_placeholder()
+        page = self.page
+        if page and page.session.get(ACTIVE_VIDEO_SESSION_KEY) is self:
+            page.session.remove(ACTIVE_VIDEO_SESSION_KEY)
+        logger.info(f"Player de vídeo liberado para {self.title}")
+        if update:
+            schedule_update(page, self)
+
+    def will_unmount(self):
+        # A tela saiu: o Video nativo já vai embora com ela
+        self.deactivate(update=False)
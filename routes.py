@@ -12,6 +12,7 @@ from pages.terms_page import TermsPage
 from pages.support.support import SupportPageView
 from pages.profile_user.create_profile import CreateProfilePage
 from utils.alerts import CustomSnackBar
+from core.view_cache import ViewCache, ViewCachePolicy, VIEW_CACHE_SESSION_KEY
 
 
 def setup_routes(page: ft.Page, supabase, openai):
@@ -33,7 +34,15 @@ def setup_routes(page: ft.Page, supabase, openai):
         "/history",
     ]
 
+    # Rotas que reutilizam a view já construída ao navegar de volta
+    CACHED_ROUTES = {
+        "/home": ViewCachePolicy(ttl=300, tags={"plans"}),
+        "/history": ViewCachePolicy(ttl=120, tags={"plans", "progress"}),
+    }
+
     mobile_appbar = MobileAppBar(page)
+    view_cache = ViewCache(page, CACHED_ROUTES, max_size=4)
+    page.session.set(VIEW_CACHE_SESSION_KEY, view_cache)
 
     def show_snackbar(message: str, color: str = ft.Colors.RED_700):
         """Exibe feedback para o usuário com estilo consistente."""
@@ -59,12 +68,12 @@ def setup_routes(page: ft.Page, supabase, openai):
         page.views.clear()
 
         # Sempre adiciona a view raiz
-        page.views.append(build_root_view())
+        page.views.append(root_view)
 
         # Rota raiz - redireciona para home ou login
         if route == "/":
             if is_authenticated() and has_profile():
-                page.views.append(build_home_view())
+                page.views.append(view_cache.get_or_build("/home", build_home_view))
             else:
                 page.views.append(build_login_view())
                 return
@@ -105,7 +114,7 @@ def setup_routes(page: ft.Page, supabase, openai):
                 return
 
             if route == "/home":
-                page.views.append(build_home_view())
+                page.views.append(view_cache.get_or_build("/home", build_home_view))
             elif route == "/community":
                 page.views.append(build_community_view())
             elif route == "/trainer":
@@ -113,7 +122,9 @@ def setup_routes(page: ft.Page, supabase, openai):
             elif route == "/profile_settings":
                 page.views.append(build_profile_settings_view())
             elif route == "/history":
-                page.views.append(build_history_view())
+                page.views.append(
+                    view_cache.get_or_build("/history", build_history_view)
+                )
             elif route.startswith("/treino/"):
                 day = route.split("/")[-1]
                 user_id = page.client_storage.get("supafit.user_id")
@@ -139,6 +150,9 @@ def setup_routes(page: ft.Page, supabase, openai):
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
         )
 
+    # A view raiz não tem conteúdo; é criada uma única vez
+    root_view = build_root_view()
+
     def build_login_view():
         """Constrói a view de login."""
         return ft.View(
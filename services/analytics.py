@@ -0,0 +1,174 @@
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Union
+import numpy as np
+
+SECONDS_PER_WEEK = 7 * 86400
+# Repetições assumidas quando o progresso não registra reps (faixa de hipertrofia)
+DEFAULT_REPS = 10
+# Janela (em registros) da média móvel de carga por exercício
+ROLLING_WINDOW = 4
+# 1970-01-01 foi quinta-feira: desloca para as semanas começarem na segunda
+_WEEK_OFFSET = 3 * 86400
+
+
+def estimate_1rm(load: np.ndarray, reps: Union[np.ndarray, float]) -> np.ndarray:
+    """1RM estimado pela fórmula de Epley: carga × (1 + reps / 30)."""
+    return load * (1.0 + np.asarray(reps, dtype=np.float64) / 30.0)
+
+
+@dataclass
+class ProgressAnalytics:
+    """
+    Resultado da análise, com uma posição por exercício presente nos dados.
+
+    Os arrays `sorted_*` guardam os registros ordenados por (exercício, data);
+    `series` recorta deles a série temporal de um exercício para gráficos.
+    """
+
+    exercise_idx: np.ndarray
+    count: np.ndarray
+    first_load: np.ndarray
+    last_load: np.ndarray
+    progression_percent: np.ndarray
+    pr_load: np.ndarray
+    pr_recorded_at: np.ndarray
+    e1rm_last: np.ndarray
+    # Variação do 1RM estimado em kg por semana (mínimos quadrados)
+    e1rm_trend: np.ndarray
+    rolling_load: np.ndarray
+    weeks: np.ndarray
+    weekly_volume: np.ndarray
+    sorted_recorded_at: np.ndarray
+    sorted_load: np.ndarray
+    sorted_rolling: np.ndarray
+    sorted_e1rm: np.ndarray
+    group_start: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "ProgressAnalytics":
+        return cls(**{f.name: np.empty(0) for f in fields(cls)})
+
+    def position(self, exercise: int) -> Optional[int]:
+        """Posição do exercício nos arrays de resultado (None se ausente)."""
+        pos = int(np.searchsorted(self.exercise_idx, exercise))
+        if pos < len(self.exercise_idx) and self.exercise_idx[pos] == exercise:
+            return pos
+        return None
+
+    def series(self, exercise: int) -> Dict[str, np.ndarray]:
+        """Série temporal de um exercício: datas, carga, média móvel e 1RM."""
+        pos = self.position(exercise)
+        if pos is None:
+            empty = np.empty(0)
+            return {"recorded_at": empty, "load": empty, "rolling": empty, "e1rm": empty}
+        window = slice(self.group_start[pos], self.group_start[pos] + self.count[pos])
+        return {
+            "recorded_at": self.sorted_recorded_at[window],
+            "load": self.sorted_load[window],
+            "rolling": self.sorted_rolling[window],
+            "e1rm": self.sorted_e1rm[window],
+        }
+
+
+def analyze_progress(
+    recorded_at: np.ndarray,
+    exercise_idx: np.ndarray,
+    load: np.ndarray,
+    reps: Union[np.ndarray, float, None] = None,
+    rolling_window: int = ROLLING_WINDOW,
+) -> ProgressAnalytics:
+    """
+    Calcula, em uma única passada agrupada, as métricas de progressão de
+    carga por exercício: primeira/última carga, recorde pessoal, tendência do
+    1RM estimado, média móvel e volume semanal.
+
+    Os registros são ordenados uma vez por (exercício, data); todos os
+    agregados por grupo saem de `reduceat` sobre os limites de cada grupo.
+    """
+    recorded_at = np.asarray(recorded_at, dtype=np.float64)
+    exercise_idx = np.asarray(exercise_idx, dtype=np.int64)
+    load = np.asarray(load, dtype=np.float64)
+    reps = np.broadcast_to(
+        np.asarray(DEFAULT_REPS if reps is None else reps, dtype=np.float64),
+        load.shape,
+    )
+    n = len(load)
+
+    order = np.lexsort((recorded_at, exercise_idx))
+    ex = exercise_idx[order]
+    t = recorded_at[order]
+    w = load[order]
+    r = reps[order]
+
+    if n == 0:
+        return ProgressAnalytics.empty()
+
+    # Limites dos grupos (um por exercício)
+    starts = np.flatnonzero(np.r_[True, ex[1:] != ex[:-1]])
+    ends = np.r_[starts[1:], n]
+    count = ends - starts
+    group_of_row = np.repeat(np.arange(len(starts)), count)
+
+    first_load = w[starts]
+    last_load = w[ends - 1]
+    progression = np.zeros_like(first_load)
+    np.divide(
+        (last_load - first_load) * 100.0,
+        first_load,
+        out=progression,
+        where=first_load > 0,
+    )
+
+    # Recorde pessoal e a primeira data em que foi atingido
+    pr_load = np.maximum.reduceat(w, starts)
+    at_pr = np.flatnonzero(w == pr_load[group_of_row])
+    _, first_hit = np.unique(group_of_row[at_pr], return_index=True)
+    pr_recorded_at = t[at_pr[first_hit]]
+
+    # 1RM estimado e sua tendência (regressão linear por grupo, x em semanas)
+    e1rm = estimate_1rm(w, r)
+    x = (t - t[starts][group_of_row]) / SECONDS_PER_WEEK
+    sum_x = np.add.reduceat(x, starts)
+    sum_y = np.add.reduceat(e1rm, starts)
+    sum_xy = np.add.reduceat(x * e1rm, starts)
+    sum_xx = np.add.reduceat(x * x, starts)
+    denominator = count * sum_xx - sum_x * sum_x
+    trend = np.zeros_like(sum_x)
+    np.divide(
+        count * sum_xy - sum_x * sum_y,
+        denominator,
+        out=trend,
+        where=np.abs(denominator) > 1e-12,
+    )
+
+    # Média móvel dos últimos `rolling_window` registros de cada exercício
+    cumulative = np.r_[0.0, np.cumsum(w)]
+    positions = np.arange(n)
+    lower = np.maximum(positions - rolling_window + 1, starts[group_of_row])
+    rolling = (cumulative[positions + 1] - cumulative[lower]) / (positions + 1 - lower)
+
+    # Volume semanal (carga × reps) de todos os exercícios
+    week = np.floor((t + _WEEK_OFFSET) / SECONDS_PER_WEEK).astype(np.int64)
+    first_week = week.min()
+    weekly_volume = np.bincount(week - first_week, weights=w * r)
+    weeks = (np.arange(len(weekly_volume)) + first_week) * SECONDS_PER_WEEK - _WEEK_OFFSET
+
+    return ProgressAnalytics(
+        exercise_idx=ex[starts],
+        count=count,
+        first_load=first_load,
+        last_load=last_load,
+        progression_percent=progression,
+        pr_load=pr_load,
+        pr_recorded_at=pr_recorded_at,
+        e1rm_last=e1rm[ends - 1],
+        e1rm_trend=trend,
+        rolling_load=rolling[ends - 1],
+        weeks=weeks.astype(np.float64),
+        weekly_volume=weekly_volume,
+        sorted_recorded_at=t,
+        sorted_load=w,
+        sorted_rolling=rolling,
+        sorted_e1rm=e1rm,
+        group_start=starts,
+    )
@@ -0,0 +1,144 @@
+import base64
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+# Tolerância para diferença de relógio entre o dispositivo e o GoTrue
+CLOCK_SKEW_SECONDS = 30
+# Com menos tempo restante que isso, o token é conferido/renovado na rede
+REVALIDATE_BEFORE_EXPIRY = 60
+# Fração da vida do token após a qual ele é renovado em segundo plano
+REFRESH_AT_LIFETIME = 0.8
+# Intervalo mínimo entre tentativas de renovação (segundos)
+MIN_REFRESH_DELAY = 5
+# Espera antes de tentar de novo após uma renovação que falhou (segundos)
+REFRESH_RETRY_DELAY = 30
+
+
+def decode_jwt_claims(token: str) -> Optional[Dict]:
+    """
+    Lê as claims de um JWT sem verificar a assinatura. A assinatura é
+    validada pelo Supabase em cada requisição; aqui só interessam `sub`,
+    `iat` e `exp` para decidir localmente se a sessão ainda vale.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except Exception:
+        return None
+
+
+@dataclass(frozen=True)
+class AuthState:
+    """Estado de autenticação derivado do access token atual."""
+
+    user_id: str
+    issued_at: float
+    expires_at: float
+
+    @classmethod
+    def from_access_token(cls, access_token: Optional[str]) -> Optional["AuthState"]:
+        claims = decode_jwt_claims(access_token) if access_token else None
+        if not claims or not claims.get("sub") or not claims.get("exp"):
+            return None
+        expires_at = float(claims["exp"])
+        return cls(
+            user_id=claims["sub"],
+            issued_at=float(claims.get("iat") or time.time()),
+            expires_at=expires_at,
+        )
+
+    def seconds_left(self, now: Optional[float] = None) -> float:
+        """Tempo de validade restante, já descontada a tolerância de relógio."""
+        now = time.time() if now is None else now
+        return self.expires_at - CLOCK_SKEW_SECONDS - now
+
+    def is_valid(self, now: Optional[float] = None) -> bool:
+        """True se o token pode ser aceito sem consultar o GoTrue."""
+        return self.seconds_left(now) > REVALIDATE_BEFORE_EXPIRY
+
+
+@dataclass
+class SessionState:
+    """
+    Resultado único da autenticação na inicialização: usuário, tokens e
+    perfil (do ProfileStore). Compartilhado pela escolha da rota
+    inicial e por apply_user_preferences, sem novas consultas.
+    """
+
+    user_id: Optional[str] = None
+    email: Optional[str] = None
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    profile: Optional[Dict] = None
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.user_id is not None
+
+    @property
+    def has_profile(self) -> bool:
+        return self.profile is not None
+
+
+class TokenRefreshScheduler:
+    """
+    Renova o access token em segundo plano antes de ele expirar.
+
+    A renovação é agendada para `REFRESH_AT_LIFETIME` da vida do token
+    (ex.: 48 min de um token de 1 h) e reagendada a cada novo token. Uma
+    renovação que falha é tentada de novo enquanto o token ainda vale.
+    """
+
+    def __init__(self, refresh: Callable[[], bool]):
+        self.refresh = refresh
+        self._timer: Optional[threading.Timer] = None
+        self._state: Optional[AuthState] = None
+        self._lock = threading.Lock()
+
+    def schedule(self, state: Optional[AuthState], now: Optional[float] = None) -> None:
+        """Agenda a renovação do token descrito por `state`."""
+        if state is None:
+            self.cancel()
+            return
+        now = time.time() if now is None else now
+        lifetime = state.expires_at - state.issued_at
+        refresh_at = state.issued_at + lifetime * REFRESH_AT_LIFETIME
+        # Nunca depois do limite em que is_authenticated deixaria de aceitá-lo
+        refresh_at = min(
+            refresh_at,
+            state.expires_at - CLOCK_SKEW_SECONDS - REVALIDATE_BEFORE_EXPIRY,
+        )
+        self._start(state, max(refresh_at - now, MIN_REFRESH_DELAY))
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = None
+            self._state = None
+
+    def _start(self, state: AuthState, delay: float) -> None:
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._state = state
+            self._timer = threading.Timer(delay, self._run, args=(state,))
+            self._timer.daemon = True
+            self._timer.start()
+        print(f"INFO - auth: Renovação do token agendada em {delay:.0f}s")
+
+    def _run(self, state: AuthState) -> None:
+        with self._lock:
+            if self._state is not state:
+                # Um token novo chegou (login/renovação) e já foi reagendado
+                return
+            self._timer = None
+        if self.refresh():
+            return
+        if state.seconds_left() > REFRESH_RETRY_DELAY:
+            print("WARNING - auth: Falha ao renovar token. Nova tentativa agendada.")
+            self._start(state, REFRESH_RETRY_DELAY)
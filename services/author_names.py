@@ -0,0 +1,116 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Tempo (segundos) em que um nome de autor é reutilizado sem nova busca
+AUTHOR_NAME_TTL = 1800
+# Quantidade máxima de autores mantidos em memória (LRU)
+AUTHOR_NAME_MAX_ENTRIES = 2000
+# Espera máxima (segundos) por uma busca do mesmo autor já em andamento
+AUTHOR_NAME_WAIT_TIMEOUT = 10
+
+
+class AuthorNameCache:
+    """
+    Cache de nomes de autores da comunidade, compartilhado pelo processo.
+
+    Guarda também a ausência de nome (None) para não repetir a busca de
+    usuários sem perfil público. Somente ids desconhecidos ou vencidos são
+    buscados, e um id já em busca por outra thread não é buscado de novo
+    (rajadas de eventos em tempo real do mesmo autor). O cache é invalidado
+    quando o usuário altera o próprio nome.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(
+        self, ttl: float = AUTHOR_NAME_TTL, max_entries: int = AUTHOR_NAME_MAX_ENTRIES
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+
+    def _lookup(self, user_id: str):
+        """Retorna (encontrado, nome) respeitando o TTL."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False, None
+        name, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[user_id]
+            return False, None
+        self._entries.move_to_end(user_id)
+        return True, name
+
+    def put_many(self, names: Dict[str, Optional[str]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for user_id, name in names.items():
+                self._entries[user_id] = (name, now)
+                self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def resolve(
+        self,
+        user_ids: Iterable[str],
+        fetcher: Callable[[List[str]], Optional[Dict[str, str]]],
+    ) -> Dict[str, Optional[str]]:
+        """
+        Nomes dos `user_ids`, buscando apenas os desconhecidos com `fetcher`.
+        Um `fetcher` que retorna None sinaliza falha e nada é armazenado.
+        """
+        result: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+        waiting: List[tuple] = []
+        with self._lock:
+            for user_id in dict.fromkeys(user_ids):
+                found, name = self._lookup(user_id)
+                if found:
+                    result[user_id] = name
+                elif user_id in self._inflight:
+                    waiting.append((user_id, self._inflight[user_id]))
+                else:
+                    missing.append(user_id)
+            done = threading.Event()
+            for user_id in missing:
+                self._inflight[user_id] = done
+
+        if missing:
+            print(f"INFO - author_names: Buscando {len(missing)} autores desconhecidos")
+            try:
+                fetched = fetcher(missing)
+                if fetched is not None:
+                    resolved = {user_id: fetched.get(user_id) for user_id in missing}
+                    self.put_many(resolved)
+                    result.update(resolved)
+            finally:
+                with self._lock:
+                    for user_id in missing:
+                        self._inflight.pop(user_id, None)
+                done.set()
+
+        for user_id, event in waiting:
+            event.wait(AUTHOR_NAME_WAIT_TIMEOUT)
+            with self._lock:
+                found, name = self._lookup(user_id)
+            if found:
+                result[user_id] = name
+        return result
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Descarta o nome de um autor (ou todos, sem argumento)."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
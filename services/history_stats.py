@@ -0,0 +1,247 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import numpy as np
+from services.analytics import analyze_progress
+
+# Janela colunar baixada uma única vez; os períodos até ela são recortes locais
+HISTORY_WINDOW_DAYS = 90
+# Teto de linhas da janela colunar: acima dele o servidor devolve `truncated`
+# e cada período vem agregado pela RPC get_history_stats
+HISTORY_MAX_ROWS = 5000
+RECENT_ACTIVITIES_LIMIT = 10
+
+DAYS_MAP = {
+    "segunda": "Segunda",
+    "terça": "Terça",
+    "quarta": "Quarta",
+    "quinta": "Quinta",
+    "sexta": "Sexta",
+    "sábado": "Sábado",
+    "domingo": "Domingo",
+}
+
+
+class HistoryStats:
+    """
+    Estatísticas do histórico sobre arrays colunares.
+
+    O progresso da janela inteira fica em três arrays NumPy ordenados por
+    data (timestamps, índice do exercício e carga). Um período é resolvido
+    com busca binária no índice de tempo seguida de reduções vetorizadas,
+    sem nova consulta ao Supabase.
+
+    Períodos além da janela ("Todo período") e janelas truncadas (usuário
+    acima de HISTORY_MAX_ROWS registros) não são cobertos: para eles a tela
+    usa os agregados do servidor (`aggregate_statistics`).
+
+    `pending` recebe o progresso gravado localmente e ainda não enviado
+    (LocalStore.get_pending_progress), somado à janela do servidor para que
+    as cargas registradas sem conexão já apareçam no histórico.
+    """
+
+    def __init__(self, payload: Dict, pending: Optional[List[Dict]] = None):
+        payload = payload or {}
+        self.truncated = bool(payload.get("truncated"))
+        self.plans_summary = {
+            "total_plans": payload.get("total_plans", 0),
+            "total_exercises": payload.get("total_exercises", 0),
+            "plans_by_day": payload.get("plans_by_day") or {},
+            "exercises_by_muscle": payload.get("exercises_by_muscle") or {},
+        }
+
+        exercises = list(payload.get("exercises") or [])
+        recorded_at = list(payload.get("recorded_at") or [])
+        exercise_idx = list(payload.get("exercise_idx") or [])
+        load = list(payload.get("load") or [])
+        if pending and not self.truncated:
+            positions = {str(e.get("id")): i for i, e in enumerate(exercises)}
+            for row in pending:
+                exercise_id = str(row.get("exercise_id"))
+                if exercise_id not in positions:
+                    positions[exercise_id] = len(exercises)
+                    exercises.append(_pending_exercise(row))
+                recorded_at.append(_epoch(row.get("recorded_at")))
+                exercise_idx.append(positions[exercise_id])
+                load.append(float(row.get("load") or 0))
+
+        self.names: List[str] = [e.get("nome", "Exercício") for e in exercises]
+        groups = [e.get("grupo_muscular", "Outros") for e in exercises]
+        self.group_names: List[str] = sorted(set(groups))
+        group_index = {name: i for i, name in enumerate(self.group_names)}
+        self.exercise_group = np.array(
+            [group_index[g] for g in groups], dtype=np.int32
+        )
+
+        self.recorded_at = np.asarray(recorded_at, dtype=np.float64)
+        self.exercise_idx = np.asarray(exercise_idx, dtype=np.int32)
+        self.load = np.asarray(load, dtype=np.float64)
+        if pending and not self.truncated:
+            # O índice de tempo precisa continuar ordenado para a busca binária
+            order = np.argsort(self.recorded_at, kind="stable")
+            self.recorded_at = self.recorded_at[order]
+            self.exercise_idx = self.exercise_idx[order]
+            self.load = self.load[order]
+
+    def __len__(self) -> int:
+        return len(self.recorded_at)
+
+    def covers(self, period_days: Optional[int]) -> bool:
+        """Se o período pode ser recortado localmente da janela carregada."""
+        return (
+            not self.truncated
+            and period_days is not None
+            and period_days <= HISTORY_WINDOW_DAYS
+        )
+
+    def _window_start(self, period_days: int, now: Optional[float]) -> int:
+        """Primeira posição com data dentro do período (busca binária)."""
+        cutoff = (now if now is not None else time.time()) - period_days * 86400
+        return int(np.searchsorted(self.recorded_at, cutoff, side="left"))
+
+    def progress_stats(self, period_days: int, now: Optional[float] = None) -> Dict:
+        """Agregados de progresso do período (carga, frequência, recentes)."""
+        start = self._window_start(period_days, now)
+        times = self.recorded_at[start:]
+        idx = self.exercise_idx[start:]
+        loads = self.load[start:]
+        total = len(idx)
+
+        stats = {
+            "total_progress_records": total,
+            "muscle_group_frequency": {},
+            "load_progression": {},
+            "recent_activities": [],
+        }
+        if total == 0:
+            return stats
+
+        group_counts = np.bincount(
+            self.exercise_group[idx], minlength=len(self.group_names)
+        )
+        stats["muscle_group_frequency"] = {
+            self.group_names[g]: int(group_counts[g])
+            for g in np.flatnonzero(group_counts)
+        }
+
+        analytics = analyze_progress(times, idx, loads)
+        valid = (analytics.count >= 2) & (analytics.first_load > 0)
+
+        # Mais registros primeiro, como no card "Progressão de Carga"
+        for i in sorted(
+            np.flatnonzero(valid),
+            key=lambda i: (-analytics.count[i], self.names[analytics.exercise_idx[i]]),
+        ):
+            stats["load_progression"][self.names[analytics.exercise_idx[i]]] = {
+                "progression_percent": round(float(analytics.progression_percent[i]), 1),
+                "first_load": float(analytics.first_load[i]),
+                "last_load": float(analytics.last_load[i]),
+                "records_count": int(analytics.count[i]),
+                "pr_load": float(analytics.pr_load[i]),
+                "e1rm_trend": round(float(analytics.e1rm_trend[i]), 2),
+            }
+
+        for pos in range(total - 1, max(total - RECENT_ACTIVITIES_LIMIT, 0) - 1, -1):
+            exercise = int(idx[pos])
+            stats["recent_activities"].append(
+                {
+                    "exercise_name": self.names[exercise],
+                    "load": float(loads[pos]),
+                    "date": datetime.fromtimestamp(
+                        times[pos], tz=timezone.utc
+                    ).isoformat(),
+                    "muscle_group": self.group_names[self.exercise_group[exercise]],
+                }
+            )
+        return stats
+
+    def statistics(self, period_days: int, now: Optional[float] = None) -> Dict:
+        """Estatísticas completas do período no formato usado pelos cards."""
+        stats = dict(self.plans_summary)
+        stats.update(self.progress_stats(period_days, now))
+        return _with_plan_fields(stats)
+
+
+def aggregate_statistics(payload: Dict, pending: Optional[List[Dict]] = None) -> Dict:
+    """
+    Converte o retorno da RPC get_history_stats para o formato dos cards.
+
+    O servidor devolve `load_progression` como lista ordenada (mais
+    registros primeiro); aqui ela vira o dicionário por exercício. O
+    progresso ainda não enviado (`pending`) entra nas contagens e nas
+    atividades recentes; a progressão de carga fica com o que o servidor viu.
+    """
+    payload = payload or {}
+    stats = {
+        "total_plans": payload.get("total_plans", 0),
+        "total_exercises": payload.get("total_exercises", 0),
+        "total_progress_records": payload.get("total_progress_records", 0),
+        "plans_by_day": payload.get("plans_by_day") or {},
+        "exercises_by_muscle": payload.get("exercises_by_muscle") or {},
+        "muscle_group_frequency": payload.get("muscle_group_frequency") or {},
+        "load_progression": {
+            item["exercise_name"]: {
+                "progression_percent": float(item["progression_percent"]),
+                "first_load": item["first_load"],
+                "last_load": item["last_load"],
+                "records_count": item["records_count"],
+                "pr_load": item.get("pr_load"),
+            }
+            for item in payload.get("load_progression") or []
+        },
+        "recent_activities": payload.get("recent_activities") or [],
+    }
+    if pending:
+        frequency = dict(stats["muscle_group_frequency"])
+        activities = []
+        for row in reversed(pending):
+            exercise = _pending_exercise(row)
+            group = exercise["grupo_muscular"]
+            frequency[group] = frequency.get(group, 0) + 1
+            activities.append(
+                {
+                    "exercise_name": exercise["nome"],
+                    "load": float(row.get("load") or 0),
+                    "date": row.get("recorded_at"),
+                    "muscle_group": group,
+                }
+            )
+        stats["total_progress_records"] += len(pending)
+        stats["muscle_group_frequency"] = frequency
+        stats["recent_activities"] = (activities + stats["recent_activities"])[
+            :RECENT_ACTIVITIES_LIMIT
+        ]
+    return _with_plan_fields(stats)
+
+
+def _pending_exercise(row: Dict) -> Dict:
+    """Entrada do dicionário de exercícios para uma linha local de progresso."""
+    exercise = row.get("exercicios") or {}
+    return {
+        "id": row.get("exercise_id"),
+        "nome": exercise.get("nome") or "Exercício",
+        "grupo_muscular": exercise.get("grupo_muscular") or "Outros",
+    }
+
+
+def _epoch(iso: Optional[str]) -> float:
+    if not iso:
+        return time.time()
+    parsed = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _with_plan_fields(stats: Dict) -> Dict:
+    """Campos derivados dos planos: frequência por dia e média por plano."""
+    stats["workout_frequency"] = {
+        DAYS_MAP.get(day_key, day_key.title()): len(day_plans)
+        for day_key, day_plans in stats["plans_by_day"].items()
+    }
+    stats["avg_exercises_per_plan"] = (
+        round(stats["total_exercises"] / stats["total_plans"], 1)
+        if stats["total_plans"] > 0
+        else 0
+    )
+    return stats
@@ -0,0 +1,576 @@
+import os
+import json
+import uuid
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_plans (
+    plan_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    day_key TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_user_plans_user ON user_plans (user_id, day_key);
+
+CREATE TABLE IF NOT EXISTS plan_exercises (
+    plan_exercise_id TEXT PRIMARY KEY,
+    plan_id TEXT NOT NULL,
+    exercise_id TEXT,
+    position INTEGER,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plan_exercises_plan ON plan_exercises (plan_id, position);
+
+CREATE TABLE IF NOT EXISTS exercicios (
+    id TEXT PRIMARY KEY,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS progress (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    exercise_id TEXT NOT NULL,
+    plan_id TEXT,
+    load REAL,
+    recorded_at TEXT,
+    updated_at TEXT,
+    pending INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_progress_exercise ON progress (user_id, exercise_id);
+
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    cursor TEXT,
+    PRIMARY KEY (scope, table_name)
+);
+"""
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def app_data_dir() -> str:
+    """Diretório gravável do app (definido pelo flet build) ou ~/.supafit."""
+    base = os.getenv("FLET_APP_STORAGE_DATA") or os.path.join(
+        os.path.expanduser("~"), ".supafit"
+    )
+    os.makedirs(base, exist_ok=True)
+    return base
+
+
+def default_db_path() -> str:
+    return os.path.join(app_data_dir(), "supafit_local.db")
+
+
+def _chunks(items: List, size: int = 500):
+    """Fatias de até `size` itens (limite de parâmetros do SQLite)."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def is_newer(a: Optional[str], b: Optional[str]) -> bool:
+    """True se o timestamp ISO `a` for mais recente que `b`."""
+    if not b:
+        return True
+    if not a:
+        return False
+    try:
+        return datetime.fromisoformat(a.replace("Z", "+00:00")) >= datetime.fromisoformat(
+            b.replace("Z", "+00:00")
+        )
+    except ValueError:
+        return a >= b
+
+
+class LocalStore:
+    """
+    Espelho local (SQLite) dos planos, exercícios e progresso do usuário.
+
+    As leituras das telas de treino são feitas aqui primeiro; as escritas de
+    progresso entram na tabela `outbox` e são enviadas pelo SyncEngine.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or default_db_path()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+        print(f"INFO - local_store: Banco local em {self.db_path}")
+
+    # ------------------------------------------------------------------
+    # Aplicação de linhas remotas (pull)
+    # ------------------------------------------------------------------
+    def _current_updated_at(self, table: str, key_column: str, key: str):
+        row = self._conn.execute(
+            f"SELECT updated_at FROM {table} WHERE {key_column} = ?", (key,)
+        ).fetchone()
+        return row["updated_at"] if row else None
+
+    def upsert_plans(self, rows: List[Dict]) -> int:
+        applied = 0
+        with self._lock:
+            for row in rows:
+                local = self._current_updated_at("user_plans", "plan_id", row["plan_id"])
+                if local and not is_newer(row.get("updated_at"), local):
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO user_plans VALUES (?, ?, ?, ?, ?)",
+                    (
+                        row["plan_id"],
+                        row.get("user_id"),
+                        (row.get("day") or "").strip().lower(),
+                        row.get("updated_at"),
+                        json.dumps(row, ensure_ascii=False, default=str),
+                    ),
+                )
+                applied += 1
+            self._conn.commit()
+        return applied
+
+    def upsert_plan_exercises(self, rows: List[Dict]) -> int:
+        applied = 0
+        with self._lock:
+            for row in rows:
+                row = {k: v for k, v in row.items() if k != "exercicios"}
+                local = self._current_updated_at(
+                    "plan_exercises", "plan_exercise_id", row["plan_exercise_id"]
+                )
+                if local and not is_newer(row.get("updated_at"), local):
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO plan_exercises VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        row["plan_exercise_id"],
+                        row.get("plan_id"),
+                        row.get("exercise_id"),
+                        row.get("order") or 0,
+                        row.get("updated_at"),
+                        json.dumps(row, ensure_ascii=False, default=str),
+                    ),
+                )
+                applied += 1
+            self._conn.commit()
+        return applied
+
+    def upsert_exercises(self, rows: List[Dict]) -> int:
+        applied = 0
+        with self._lock:
+            for row in rows:
+                local = self._current_updated_at("exercicios", "id", str(row["id"]))
+                if local and not is_newer(row.get("updated_at"), local):
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO exercicios VALUES (?, ?, ?)",
+                    (
+                        str(row["id"]),
+                        row.get("updated_at"),
+                        json.dumps(row, ensure_ascii=False, default=str),
+                    ),
+                )
+                applied += 1
+            self._conn.commit()
+        return applied
+
+    def upsert_progress(self, rows: List[Dict]) -> int:
+        """Aplica linhas de progresso do servidor (última escrita vence)."""
+        applied = 0
+        with self._lock:
+            for row in rows:
+                row = {k: v for k, v in row.items() if k != "exercicios"}
+                row_id = str(row["id"])
+                updated_at = row.get("updated_at") or row.get("recorded_at")
+                local = self._current_updated_at("progress", "id", row_id)
+                if local and not is_newer(updated_at, local):
+                    continue
+                self._write_progress(row_id, row, updated_at, pending=False)
+                applied += 1
+            self._conn.commit()
+        return applied
+
+    def _write_progress(self, row_id, row, updated_at, pending: bool) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                row_id,
+                row.get("user_id"),
+                str(row.get("exercise_id")),
+                row.get("plan_id"),
+                float(row.get("load") or 0),
+                row.get("recorded_at"),
+                updated_at,
+                1 if pending else 0,
+                json.dumps(row, ensure_ascii=False, default=str),
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Leituras locais
+    # ------------------------------------------------------------------
+    def has_plans(self, user_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM user_plans WHERE user_id = ? LIMIT 1", (user_id,)
+            ).fetchone()
+        return row is not None
+
+    def get_plans(self, user_id: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM user_plans WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        return [json.loads(r["data"]) for r in rows]
+
+    def get_plan_ids(self, user_id: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT plan_id FROM user_plans WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        return [r["plan_id"] for r in rows]
+
+    def get_referenced_exercise_ids(self, user_id: str) -> List[str]:
+        """Ids do catálogo usados pelos planos do usuário e já presentes localmente."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT e.id FROM plan_exercises pe "
+                "JOIN user_plans up ON up.plan_id = pe.plan_id "
+                "JOIN exercicios e ON e.id = pe.exercise_id "
+                "WHERE up.user_id = ?",
+                (user_id,),
+            ).fetchall()
+        return [r["id"] for r in rows]
+
+    def get_missing_exercise_ids(self, user_id: str) -> List[str]:
+        """Ids referenciados pelos planos que ainda não estão no catálogo local."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT pe.exercise_id FROM plan_exercises pe "
+                "JOIN user_plans up ON up.plan_id = pe.plan_id "
+                "LEFT JOIN exercicios e ON e.id = pe.exercise_id "
+                "WHERE up.user_id = ? AND e.id IS NULL AND pe.exercise_id IS NOT NULL",
+                (user_id,),
+            ).fetchall()
+        return [r["exercise_id"] for r in rows]
+
+    def get_plans_with_exercises(self, user_id: str) -> List[Dict]:
+        """Planos do usuário com `plan_exercises` (e `exercicios`) aninhados."""
+        plans = self.get_plans(user_id)
+        for plan in plans:
+            plan["plan_exercises"] = self.get_plan_exercises(plan["plan_id"])
+        return plans
+
+    def get_plan_exercises(self, plan_id: str) -> List[Dict]:
+        """Exercícios do plano em ordem, com o exercício aninhado em `exercicios`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pe.data AS pe_data, e.data AS ex_data FROM plan_exercises pe "
+                "LEFT JOIN exercicios e ON e.id = pe.exercise_id "
+                "WHERE pe.plan_id = ? ORDER BY pe.position",
+                (plan_id,),
+            ).fetchall()
+        result = []
+        for r in rows:
+            item = json.loads(r["pe_data"])
+            item["exercicios"] = json.loads(r["ex_data"]) if r["ex_data"] else {}
+            result.append(item)
+        return result
+
+    def get_day_plan(self, user_id: str, day: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM user_plans WHERE user_id = ? AND day_key = ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (user_id, day.strip().lower()),
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_latest_load(self, user_id: str, exercise_id: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT load FROM progress WHERE user_id = ? AND exercise_id = ? "
+                "ORDER BY COALESCE(updated_at, recorded_at) DESC LIMIT 1",
+                (user_id, str(exercise_id)),
+            ).fetchone()
+        return row["load"] if row else None
+
+    def get_progress_since(self, user_id: str, since_iso: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM progress WHERE user_id = ? AND recorded_at >= ? "
+                "ORDER BY recorded_at",
+                (user_id, since_iso),
+            ).fetchall()
+        return [json.loads(r["data"]) for r in rows]
+
+    def get_pending_progress(self, user_id: str) -> List[Dict]:
+        """
+        Progresso gravado localmente e ainda não enviado, em ordem de data,
+        com o exercício aninhado em `exercicios` (quando presente no catálogo).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.data AS p_data, e.data AS ex_data FROM progress p "
+                "LEFT JOIN exercicios e ON e.id = p.exercise_id "
+                "WHERE p.user_id = ? AND p.pending = 1 ORDER BY p.recorded_at",
+                (user_id,),
+            ).fetchall()
+        result = []
+        for r in rows:
+            item = json.loads(r["p_data"])
+            item["exercicios"] = json.loads(r["ex_data"]) if r["ex_data"] else {}
+            result.append(item)
+        return result
+
+    # ------------------------------------------------------------------
+    # Escritas locais e outbox
+    # ------------------------------------------------------------------
+    def record_progress(
+        self, user_id: str, plan_id: Optional[str], exercise_id: str, load: float
+    ) -> Dict:
+        """Grava a carga localmente e enfileira o envio ao servidor."""
+        now = utc_now()
+        row = {
+            "id": f"local-{uuid.uuid4()}",
+            "user_id": user_id,
+            "plan_id": plan_id,
+            "exercise_id": exercise_id,
+            "load": float(load),
+            "recorded_at": now,
+            "updated_at": now,
+        }
+        payload = {k: v for k, v in row.items() if k != "id"}
+        payload["local_id"] = row["id"]
+        with self._lock:
+            self._write_progress(row["id"], row, now, pending=True)
+            self._conn.execute(
+                "INSERT INTO outbox (op, payload, created_at) VALUES (?, ?, ?)",
+                ("save_progress", json.dumps(payload), now),
+            )
+            self._conn.commit()
+        return row
+
+    def pending_operations(
+        self, limit: int = 50, user_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Operações da fila em ordem; com `user_id`, só as desse usuário."""
+        where, params = self._outbox_filter(user_id)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT seq, op, payload, attempts FROM outbox{where} "
+                "ORDER BY seq LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [
+            {
+                "seq": r["seq"],
+                "op": r["op"],
+                "payload": json.loads(r["payload"]),
+                "attempts": r["attempts"],
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    def _outbox_filter(user_id: Optional[str]):
+        if not user_id:
+            return "", ()
+        return " WHERE json_extract(payload, '$.user_id') = ?", (user_id,)
+
+    def has_pending_operations(self, user_id: Optional[str] = None) -> bool:
+        where, params = self._outbox_filter(user_id)
+        with self._lock:
+            return (
+                self._conn.execute(
+                    f"SELECT 1 FROM outbox{where} LIMIT 1", params
+                ).fetchone()
+                is not None
+            )
+
+    def complete_operation(self, seq: int, local_id: str = None, server_row=None):
+        """Remove a operação da fila e troca a linha local pela do servidor."""
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE seq = ?", (seq,))
+            if local_id:
+                self._conn.execute("DELETE FROM progress WHERE id = ?", (local_id,))
+            if server_row:
+                server_row = {k: v for k, v in server_row.items() if k != "exercicios"}
+                self._write_progress(
+                    str(server_row["id"]),
+                    server_row,
+                    server_row.get("updated_at") or utc_now(),
+                    pending=False,
+                )
+            self._conn.commit()
+
+    def fail_operation(self, seq: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1 WHERE seq = ?", (seq,)
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Perfil (cópia do ProfileStore para abrir o app sem conexão)
+    # ------------------------------------------------------------------
+    def get_profile(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM profiles WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def save_profile(self, user_id: str, profile: Optional[Dict]) -> None:
+        """Grava o perfil do usuário; None apaga a cópia."""
+        with self._lock:
+            if profile is None:
+                self._conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO profiles VALUES (?, ?)",
+                    (user_id, json.dumps(profile, ensure_ascii=False, default=str)),
+                )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Reconciliação de exclusões
+    # ------------------------------------------------------------------
+    def remove_plans_except(self, user_id: str, plan_ids: List[str]) -> int:
+        """Apaga os planos (e seus exercícios) do usuário que o servidor não tem mais."""
+        with self._lock:
+            missing = self._missing_keys(
+                "SELECT plan_id AS key FROM user_plans WHERE user_id = ?",
+                (user_id,),
+                plan_ids,
+            )
+            for chunk in _chunks(missing):
+                marks = ", ".join("?" * len(chunk))
+                self._conn.execute(
+                    f"DELETE FROM plan_exercises WHERE plan_id IN ({marks})", chunk
+                )
+                self._conn.execute(
+                    f"DELETE FROM user_plans WHERE plan_id IN ({marks})", chunk
+                )
+            self._conn.commit()
+        return len(missing)
+
+    def remove_plan_exercises_except(
+        self, plan_ids: List[str], plan_exercise_ids: List[str]
+    ) -> int:
+        """Apaga os exercícios desses planos que o servidor não tem mais."""
+        removed = 0
+        with self._lock:
+            for plans in _chunks(plan_ids):
+                marks = ", ".join("?" * len(plans))
+                missing = self._missing_keys(
+                    "SELECT plan_exercise_id AS key FROM plan_exercises "
+                    f"WHERE plan_id IN ({marks})",
+                    tuple(plans),
+                    plan_exercise_ids,
+                )
+                for chunk in _chunks(missing):
+                    self._conn.execute(
+                        "DELETE FROM plan_exercises WHERE plan_exercise_id IN "
+                        f"({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                removed += len(missing)
+            self._conn.commit()
+        return removed
+
+    def remove_progress_except(
+        self, user_id: str, since_iso: str, progress_ids: List[str]
+    ) -> int:
+        """
+        Apaga o progresso já sincronizado da janela que o servidor não tem
+        mais. Linhas pendentes (ainda na outbox) ficam.
+        """
+        with self._lock:
+            missing = self._missing_keys(
+                "SELECT id AS key FROM progress "
+                "WHERE user_id = ? AND recorded_at >= ? AND pending = 0",
+                (user_id, since_iso),
+                progress_ids,
+            )
+            for chunk in _chunks(missing):
+                self._conn.execute(
+                    f"DELETE FROM progress WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            self._conn.commit()
+        return len(missing)
+
+    def _missing_keys(self, sql: str, params: tuple, server_keys: List[str]) -> List[str]:
+        keep = {str(k) for k in server_keys}
+        return [
+            r["key"] for r in self._conn.execute(sql, params).fetchall()
+            if str(r["key"]) not in keep
+        ]
+
+    # ------------------------------------------------------------------
+    # Cursores de sincronização
+    # ------------------------------------------------------------------
+    def get_cursor(self, scope: str, table_name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor FROM sync_state WHERE scope = ? AND table_name = ?",
+                (scope, table_name),
+            ).fetchone()
+        return row["cursor"] if row else None
+
+    def set_cursor(self, scope: str, table_name: str, cursor: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (scope, table_name, cursor),
+            )
+            self._conn.commit()
+
+    def clear(self, keep_outbox: bool = False) -> None:
+        """
+        Apaga todos os dados locais (logout). Com `keep_outbox`, a fila de
+        envio fica: cada operação carrega a linha inteira e é enviada quando
+        o mesmo usuário voltar a entrar.
+        """
+        tables = [
+            "user_plans",
+            "plan_exercises",
+            "exercicios",
+            "progress",
+            "profiles",
+            "sync_state",
+        ]
+        if not keep_outbox:
+            tables.append("outbox")
+        with self._lock:
+            for table in tables:
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.commit()
+        if keep_outbox:
+            print("INFO - local_store: Dados locais apagados (fila de envio mantida)")
+        else:
+            print("INFO - local_store: Dados locais apagados")
@@ -380,4 +380,5 @@ class OpenAIService:
             f"- Nunca mencione 'UUID', 'ID técnico' ou campos internos.\n"
             f"- Sempre prefira nome de exercício e contexto real.\n"
             f"- Se o nome for ambíguo, use get_exercise_details para detalhar opções antes de seguir.\n"
+            f"- Se get_exercise_details trouxer thumbnail_url, mostre a imagem: ![nome](thumbnail_url).\n"
         )
@@ -0,0 +1,126 @@
+import threading
+from typing import Dict, Optional
+from supabase import Client
+from services import query_specs
+from services.local_store import LocalStore
+from services.sync_engine import is_network_error
+
+_MISSING = object()
+
+
+class ProfileStore:
+    """
+    Cópia em memória do perfil (`user_profiles`) compartilhada pelas telas.
+
+    A linha é buscada uma única vez por usuário com PROFILE_STORE e servida
+    a login, inicialização, treino, treinador e configurações. Cada escrita
+    (`put`) ou invalidação incrementa a versão do usuário; uma busca iniciada
+    antes disso não sobrescreve o dado mais novo.
+
+    Com um LocalStore ligado (`attach`), cada perfil buscado ou gravado
+    também vai para o banco local: sem conexão, `get` e `cached` servem essa
+    cópia (tema, fonte e cor na abertura offline).
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self._profiles: Dict[str, Optional[dict]] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._local: Optional[LocalStore] = None
+
+    def attach(self, local_store: LocalStore) -> None:
+        """Liga a cópia persistente dos perfis."""
+        self._local = local_store
+
+    def cached(self, user_id: str) -> Optional[dict]:
+        """Perfil em memória ou a cópia persistida, sem acessar a rede."""
+        profile = self._profiles.get(user_id, _MISSING)
+        if profile is not _MISSING:
+            return dict(profile) if profile is not None else None
+        return self._local.get_profile(user_id) if self._local else None
+
+    def version(self, user_id: str) -> int:
+        return self._versions.get(user_id, 0)
+
+    def get(self, client: Client, user_id: str) -> Optional[dict]:
+        """
+        Perfil do usuário (cópia) ou None se ele ainda não criou o perfil.
+        Erros da consulta são propagados e nada é armazenado.
+        """
+        profile = self._profiles.get(user_id, _MISSING)
+        if profile is not _MISSING:
+            return dict(profile) if profile is not None else None
+
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(user_id, threading.Lock())
+        # Telas abertas ao mesmo tempo compartilham uma única consulta
+        with fetch_lock:
+            profile = self._profiles.get(user_id, _MISSING)
+            if profile is not _MISSING:
+                return dict(profile) if profile is not None else None
+            version = self.version(user_id)
+            print(f"INFO - profile_store: Buscando perfil de user_id {user_id}")
+            try:
+                response = (
+                    client.table("user_profiles")
+                    .select(query_specs.PROFILE_STORE.select)
+                    .eq("user_id", user_id)
+                    .execute()
+                )
+            except Exception as e:
+                stored = self._local.get_profile(user_id) if self._local else None
+                if stored is None or not is_network_error(e):
+                    raise
+                # Sem conexão: a cópia persistida serve, sem ficar em memória,
+                # para a próxima chamada com rede buscar o perfil atual
+                print(f"WARNING - profile_store: Sem conexão, usando perfil local de {user_id}")
+                return stored
+            profile = response.data[0] if response.data else None
+            with self._lock:
+                if self.version(user_id) == version:
+                    self._profiles[user_id] = profile
+                    self._persist(user_id, profile)
+        return dict(profile) if profile is not None else None
+
+    def put(self, user_id: str, profile: Optional[dict]) -> None:
+        """
+        Grava a linha devolvida por insert/upsert (nova versão). Só as
+        colunas de PROFILE_STORE entram: a cópia tem o mesmo formato da
+        consulta, qualquer que seja a linha devolvida pela escrita.
+        """
+        if profile is not None:
+            columns = query_specs.PROFILE_STORE.columns
+            profile = {k: v for k, v in profile.items() if k in columns}
+        with self._lock:
+            self._versions[user_id] = self.version(user_id) + 1
+            if profile is None:
+                self._profiles.pop(user_id, None)
+            else:
+                merged = dict(self._profiles.get(user_id) or {})
+                merged.update(profile)
+                self._profiles[user_id] = merged
+            self._persist(user_id, self._profiles.get(user_id))
+
+    def _persist(self, user_id: str, profile: Optional[dict]) -> None:
+        if self._local:
+            try:
+                self._local.save_profile(user_id, profile)
+            except Exception as e:
+                print(f"ERROR - profile_store: Erro ao gravar perfil local: {e}")
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Descarta o perfil de um usuário (ou todos, sem argumento)."""
+        with self._lock:
+            user_ids = [user_id] if user_id else list(self._profiles)
+            for uid in user_ids:
+                self._versions[uid] = self.version(uid) + 1
+                self._profiles.pop(uid, None)
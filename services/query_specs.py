@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Tuple
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    Colunas que uma tela lê de uma tabela.
+
+    `embeds` descreve relações aninhadas do PostgREST (ex.: `exercicios(...)`).
+    Cada tela declara aqui apenas os campos que efetivamente usa, para que a
+    resposta não carregue colunas como `url_video` ou descrições completas.
+    """
+
+    columns: Tuple[str, ...]
+    embeds: Tuple[Tuple[str, "Projection"], ...] = ()
+
+    @property
+    def select(self) -> str:
+        """String para `.select()` do PostgREST."""
+        parts = list(self.columns)
+        parts.extend(f"{name}({embed.select})" for name, embed in self.embeds)
+        return ", ".join(parts)
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """Campos projetados, com relações no formato `relacao.campo`."""
+        result = set(self.columns)
+        for name, embed in self.embeds:
+            result.add(name)
+            result.update(f"{name}.{field}" for field in embed.fields)
+        return frozenset(result)
+
+    def with_columns(self, *columns: str) -> "Projection":
+        """Nova projeção com colunas adicionais (ex.: cursor de sincronização)."""
+        extra = tuple(c for c in columns if c not in self.columns)
+        return Projection(self.columns + extra, self.embeds)
+
+
+# ----------------------------------------------------------------------
+# user_profiles
+# ----------------------------------------------------------------------
+# Contexto do treinador virtual (prompt e avatar do chat)
+PROFILE_TRAINER = Projection(
+    ("name", "age", "weight", "height", "gender", "goal", "level", "restrictions")
+)
+# Cópia compartilhada do ProfileStore: uma linha por usuário serve o
+# treinador (acima), os formulários de /profile_settings, as preferências
+# visuais, o descanso de /treino, o nível do login e a ferramenta
+# get_user_profile. tests/test_projections.py confere os campos lidos.
+PROFILE_STORE = Projection(
+    (
+        "user_id",
+        *PROFILE_TRAINER.columns,
+        "rest_duration",
+        "theme",
+        "font_family",
+        "primary_color",
+    )
+)
+
+# ----------------------------------------------------------------------
+# Catálogo de exercícios
+# ----------------------------------------------------------------------
+# Gerador de treino: categorização e montagem dos dias
+EXERCISE_CATALOG = Projection(
+    (
+        "id",
+        "nome",
+        "grupo_muscular",
+        "tipo_movimento",
+        "equipamento",
+        "url_video",
+        "thumbnail_url",
+    )
+)
+# Job de pôsteres (services/thumbnail_job.py)
+EXERCISE_THUMBNAIL_JOB = Projection(("id", "nome", "url_video", "thumbnail_url"))
+
+# ----------------------------------------------------------------------
+# Planos (espelhados no banco local para /home e /treino)
+# ----------------------------------------------------------------------
+PLAN_SYNC = Projection(
+    ("plan_id", "user_id", "day", "title", "created_at", "updated_at")
+)
+PLAN_EXERCISE_SYNC = Projection(
+    ("plan_exercise_id", "plan_id", "exercise_id", "sets", "reps", "order", "updated_at")
+)
+# /treino exibe o pôster e o vídeo; /home e /history só usam nome e grupo
+EXERCISE_SYNC = Projection(
+    ("id", "nome", "grupo_muscular", "url_video", "thumbnail_url", "updated_at")
+)
+PROGRESS_SYNC = Projection(
+    ("id", "user_id", "exercise_id", "plan_id", "load", "recorded_at", "updated_at")
+)
+
+PLAN_EXERCISES_WITH_EXERCISE = Projection(
+    ("plan_exercise_id", "plan_id", "exercise_id", "sets", "reps", "order"),
+    (
+        (
+            "exercicios",
+            Projection(("id", "nome", "grupo_muscular", "url_video", "thumbnail_url")),
+        ),
+    ),
+)
+
+# ----------------------------------------------------------------------
+# Comunidade
+# ----------------------------------------------------------------------
+# View community_feed: vitória + autor + contagem + curtida do usuário
+COMMUNITY_FEED = Projection(
+    (
+        "id",
+        "user_id",
+        "content",
+        "category",
+        "created_at",
+        "likes_count",
+        "author_name",
+        "liked_by_me",
+    )
+)
@@ -0,0 +1,135 @@
+from typing import Callable, Dict, Optional
+import flet as ft
+from realtime import AsyncRealtimeClient, RealtimeSubscribeStates
+
+REALTIME_FEED_SESSION_KEY = "supafit.realtime_feed"
+
+# listener(evento, tabela, registro, registro_antigo)
+FeedListener = Callable[[str, str, Dict, Dict], None]
+
+
+class FeedRealtime:
+    """
+    Assinatura Supabase Realtime das mudanças do feed da comunidade.
+
+    Um canal por sessão recebe INSERT/UPDATE/DELETE de `victories` e os
+    INSERT de `victory_likes` do próprio usuário; a contagem de curtidas
+    chega pelo UPDATE de `victories.likes_count`. Cada evento é repassado ao `listener`
+    registrado pela aba aberta, em uma thread, para que ele possa consultar
+    o Supabase sem bloquear o loop de eventos.
+    """
+
+    def __init__(self, supabase_service):
+        self.supabase = supabase_service
+        self.listener: Optional[FeedListener] = None
+        self._client: Optional[AsyncRealtimeClient] = None
+        self._user_id: Optional[str] = None
+
+    @classmethod
+    def get_instance(cls, supabase_service) -> "FeedRealtime":
+        """Assinatura da sessão atual (uma por página)."""
+        page: ft.Page = supabase_service.page
+        feed = page.session.get(REALTIME_FEED_SESSION_KEY)
+        if feed is None:
+            feed = cls(supabase_service)
+            page.session.set(REALTIME_FEED_SESSION_KEY, feed)
+        return feed
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self._client and self._client.is_connected)
+
+    async def start(self, user_id: str) -> None:
+        """Conecta e assina o canal do feed, se ainda não estiver ativo."""
+        if self.is_connected and self._user_id == user_id:
+            return
+        await self.close()
+        try:
+            client = AsyncRealtimeClient(
+                self.supabase.client.realtime_url,
+                self.supabase.client.supabase_key,
+                auto_reconnect=True,
+            )
+            await client.connect()
+            session = self.supabase.client.auth.get_session()
+            if session:
+                # O token do usuário aplica as políticas RLS aos eventos
+                await client.set_auth(session.access_token)
+
+            channel = client.channel("community-feed")
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                channel.on_postgres_changes(
+                    event,
+                    lambda payload: self._dispatch("victories", payload),
+                    table="victories",
+                    schema="public",
+                )
+            # Só as curtidas do próprio usuário importam (estado `liked`). O
+            # Realtime não filtra DELETE, que exporia quem descurtiu o quê:
+            # descurtidas chegam só como UPDATE de likes_count
+            channel.on_postgres_changes(
+                "INSERT",
+                lambda payload: self._dispatch("victory_likes", payload),
+                table="victory_likes",
+                schema="public",
+                filter=f"user_id=eq.{user_id}",
+            )
+            await channel.subscribe(self._on_status)
+            self._client = client
+            self._user_id = user_id
+        except Exception as e:
+            print(f"ERROR - realtime_feed: Erro ao assinar o feed: {str(e)}")
+
+    async def set_auth(self, access_token: str) -> None:
+        """Repassa ao canal o token renovado (sem ele o Realtime desconecta)."""
+        if not self.is_connected:
+            return
+        try:
+            await self._client.set_auth(access_token)
+        except Exception as e:
+            print(f"ERROR - realtime_feed: Erro ao renovar o token: {str(e)}")
+
+    def _on_status(self, status, error: Optional[Exception] = None) -> None:
+        if status == RealtimeSubscribeStates.SUBSCRIBED:
+            print("INFO - realtime_feed: Feed da comunidade em tempo real ativo")
+        elif error:
+            print(f"ERROR - realtime_feed: Canal do feed: {status} - {error}")
+
+    def _dispatch(self, table: str, payload: Dict) -> None:
+        data = payload.get("data") or {}
+        event = (data.get("type") or "").upper()
+        record = data.get("record") or {}
+        old_record = data.get("old_record") or {}
+        listener = self.listener
+        if not listener or not event:
+            return
+        self.supabase.page.run_thread(listener, event, table, record, old_record)
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        self._user_id = None
+        if client:
+            try:
+                await client.remove_all_channels()
+                await client.close()
+            except Exception as e:
+                print(f"ERROR - realtime_feed: Erro ao encerrar o feed: {str(e)}")
+
+
+def refresh_feed_auth(page: Optional[ft.Page], access_token: str) -> None:
+    """Atualiza o token da assinatura da sessão (login e renovação)."""
+    if not page:
+        return
+    feed = page.session.get(REALTIME_FEED_SESSION_KEY)
+    if feed:
+        page.run_task(feed.set_auth, access_token)
+
+
+def stop_feed_realtime(page: Optional[ft.Page]) -> None:
+    """Encerra a assinatura da sessão (usado no logout)."""
+    if not page:
+        return
+    feed = page.session.get(REALTIME_FEED_SESSION_KEY)
+    if feed:
+        feed.listener = None
+        page.run_task(feed.close)
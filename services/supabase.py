@@ -1,8 +1,24 @@
 import os
+import time
+import threading
 import flet as ft
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 from utils.alerts import CustomSnackBar, CustomAlertDialog
+from core.view_cache import invalidate_views
+from services.swr_cache import SWRCache
+from services.local_store import LocalStore
+from services.sync_engine import SyncEngine, is_network_error
+from services.realtime_feed import refresh_feed_auth, stop_feed_realtime
+from services.auth_state import AuthState, SessionState, TokenRefreshScheduler
+from services.profile_store import ProfileStore
+from typing import Optional
+from postgrest import APIResponse
+from services import query_specs
+from services.query_specs import Projection
+
+# Intervalo mínimo entre tentativas de renovar a sessão sem conexão (segundos)
+OFFLINE_REFRESH_INTERVAL = 30
 
 
 class SupabaseService:
@@ -26,11 +42,111 @@ class SupabaseService:
         load_dotenv()
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_KEY")
-        self.client: Client = create_client(self.url, self.key)
+        # A renovação do token é só do TokenRefreshScheduler: com o timer do
+        # gotrue ligado, dois ciclos disputariam o mesmo refresh token (que é
+        # de uso único) e a renovação do gotrue não atualizaria o
+        # client_storage nem o auth_state
+        self.client: Client = create_client(
+            self.url, self.key, options=ClientOptions(auto_refresh_token=False)
+        )
         self.page = page
+        self.local_store = LocalStore()
+        self.sync_engine = SyncEngine(self, self.local_store)
+        self.profiles = ProfileStore.get_instance()
+        self.profiles.attach(self.local_store)
+        # Claims do access token atual: is_authenticated sem ida à rede
+        self.auth_state: Optional[AuthState] = None
+        self._refresh_lock = threading.Lock()
+        # Sessão guardada mantida sem conexão: a renovação usa este refresh
+        # token até o GoTrue voltar a responder
+        self.offline = False
+        self._offline_refresh_token: Optional[str] = None
+        self._last_offline_refresh = 0.0
+        self._offline_refresh_lock = threading.Lock()
+        self.token_refresher = TokenRefreshScheduler(
+            lambda: self.refresh_session(clear_on_failure=False)
+        )
+        # Preenchido por resolve_startup_session na inicialização do app
+        self.session_state: Optional[SessionState] = None
         print("INFO: Cliente Supabase inicializado com sucesso.")
-        if page:
-            self._restore_session()
+
+    def resolve_startup_session(self) -> SessionState:
+        """
+        Resolve a autenticação da inicialização em no máximo duas requisições:
+        `set_session` (valida ou renova os tokens guardados) e o perfil, que
+        fica no ProfileStore para as demais telas. O resultado fica em
+        `session_state`.
+        """
+        state = SessionState()
+        self.session_state = state
+        if not self.page:
+            print("WARNING: Página não fornecida. Ignorando restauração de sessão.")
+            return state
+
+        access_token = self.page.client_storage.get("supafit.access_token")
+        refresh_token = self.page.client_storage.get("supafit.refresh_token")
+        if not (access_token and refresh_token):
+            print("INFO: Nenhum token de sessão encontrado.")
+            self._clear_session()
+            return state
+
+        try:
+            response = self.client.auth.set_session(access_token, refresh_token)
+        except Exception as e:
+            if is_network_error(e):
+                return self._resume_offline(state, access_token, refresh_token)
+            print(f"WARNING: Não foi possível restaurar a sessão: {str(e)}")
+            response = None
+        if not response or not response.session:
+            self._clear_session()
+            self._safe_show_snackbar("Sessão expirada. Faça login novamente.")
+            return state
+
+        session, user = response.session, response.user
+        self._update_client_storage(response, check_profile=False)
+        state.user_id = user.id
+        state.email = user.email
+        state.access_token = session.access_token
+        state.refresh_token = session.refresh_token
+
+        try:
+            state.profile = self.load_profile(user.id)
+            self._save_profile_flags(state.profile)
+        except Exception as e:
+            print(f"ERROR: Erro ao verificar perfil: {str(e)}")
+        print("INFO: Sessão restaurada com sucesso.")
+        return state
+
+    def _resume_offline(
+        self, state: SessionState, access_token: str, refresh_token: str
+    ) -> SessionState:
+        """
+        Sem conexão na inicialização: mantém a sessão guardada e abre o app
+        com os dados locais. A renovação e a outbox tentam de novo sozinhas
+        quando a rede voltar; só um erro de autenticação encerra a sessão.
+        """
+        user_id = self.page.client_storage.get("supafit.user_id")
+        auth_state = AuthState.from_access_token(access_token)
+        if not user_id or not auth_state or auth_state.user_id != user_id:
+            print("WARNING: Sessão guardada incompleta. Necessário novo login.")
+            return state
+        print("WARNING: Sem conexão. Mantendo a sessão guardada (modo offline).")
+        self.offline = True
+        self._offline_refresh_token = refresh_token
+        self.auth_state = auth_state
+        if auth_state.is_valid():
+            self.token_refresher.schedule(auth_state)
+        state.user_id = user_id
+        state.email = self.page.client_storage.get("supafit.email")
+        state.access_token = access_token
+        state.refresh_token = refresh_token
+        if self.page.client_storage.get("supafit.profile_created"):
+            # Cópia persistida do perfil: tema, fonte e cor como no último uso
+            state.profile = self.profiles.cached(user_id) or {
+                "level": self.page.client_storage.get("supafit.level") or "iniciante"
+            }
+        self.sync_engine.start(user_id)
+        return state
 
     def _restore_session(self) -> None:
         """Restaura a sessão do Supabase a partir do client_storage."""
@@ -82,8 +198,11 @@ class SupabaseService:
         else:
             print("WARNING: Página não pronta para exibir snackbar.")
 
-    def _update_client_storage(self, response) -> None:
-        """Atualiza dados de autenticação no client_storage."""
+    def _update_client_storage(self, response, check_profile: bool = True) -> None:
+        """
+        Atualiza dados de autenticação no client_storage. Com
+        `check_profile=False` quem chama já resolve o perfil.
+        """
         if not self.page or not response.session:
             return
         try:
@@ -93,7 +212,14 @@ class SupabaseService:
             self.page.client_storage.set("supafit.refresh_token", session.refresh_token)
             self.page.client_storage.set("supafit.user_id", user.id)
             self.page.client_storage.set("supafit.email", user.email)
-            self._check_and_save_user(user.id)
+            self.auth_state = AuthState.from_access_token(session.access_token)
+            self.offline = False
+            self._offline_refresh_token = None
+            self.token_refresher.schedule(self.auth_state)
+            refresh_feed_auth(self.page, session.access_token)
+            if check_profile:
+                self._check_and_save_user(user.id)
+            self.sync_engine.start(user.id)
             print(f"INFO: Client storage atualizado para user: {user.email}")
         except Exception as e:
             print(f"ERROR: Erro ao atualizar client_storage: {str(e)}")
@@ -102,24 +228,29 @@ class SupabaseService:
     def _check_and_save_user(self, user_id: str) -> None:
         """Verifica e salva informações do perfil no client_storage."""
         try:
-            profile_response = self.get_profile(user_id)
-            profile_exists = bool(
-                profile_response.data and len(profile_response.data) > 0
-            )
-            self.page.client_storage.set("supafit.profile_created", profile_exists)
-            if profile_exists:
-                level = profile_response.data[0].get("level", "iniciante")
-                self.page.client_storage.set("supafit.level", level)
-                print(f"INFO: Perfil encontrado - nível: {level}")
-            else:
-                print("INFO: Perfil não encontrado - necessário criar perfil")
+            self._save_profile_flags(self.load_profile(user_id))
         except Exception as e:
             print(f"ERROR: Erro ao verificar perfil: {str(e)}")
             self._safe_show_snackbar(f"Erro ao verificar perfil: {str(e)}")
 
+    def _save_profile_flags(self, profile: Optional[dict]) -> None:
+        """Grava no client_storage se o perfil existe e o nível do usuário."""
+        self.page.client_storage.set("supafit.profile_created", profile is not None)
+        if profile is not None:
+            level = profile.get("level", "iniciante")
+            self.page.client_storage.set("supafit.level", level)
+            print(f"INFO: Perfil encontrado - nível: {level}")
+        else:
+            print("INFO: Perfil não encontrado - necessário criar perfil")
+
     def _clear_session(self) -> None:
         """Limpa dados de sessão no Supabase."""
         try:
+            self.auth_state = None
+            self.offline = False
+            self._offline_refresh_token = None
+            self.token_refresher.cancel()
+            self.profiles.invalidate()
             self.client.auth.sign_out()
             if self.page:
                 auth_keys = [
@@ -132,6 +263,9 @@ class SupabaseService:
                 ]
                 for key in auth_keys:
                     self.page.client_storage.remove(key)
+                invalidate_views(self.page)
+                SWRCache.get_instance(self.page).clear()
+                stop_feed_realtime(self.page)
             print("INFO: Sessão concluída com sucesso.")
         except Exception as e:
             print(f"ERROR: Erro ao concluir sessão: {str(e)}")
@@ -145,8 +279,25 @@ class SupabaseService:
             print(f"ERROR: Erro ao obter usuário atual: {str(e)}")
             return None
 
-    def is_authenticated(self) -> bool:
-        """Verifica se há uma sessão válida."""
+    def is_authenticated(self, revalidate: bool = False) -> bool:
+        """
+        Verifica se há uma sessão válida.
+
+        Enquanto o access token não estiver perto de expirar (claim `exp` com
+        margem de relógio), a verificação é local. A rede só é consultada
+        perto da expiração, sem estado local ou com `revalidate=True`.
+        """
+        state = self.auth_state
+        if state and not revalidate:
+            if state.is_valid():
+                return True
+            if self.offline:
+                # Sem conexão, a sessão guardada continua valendo para os dados
+                # locais: a renovação vai para segundo plano, sem bloquear aqui
+                self.retry_offline_refresh()
+                return True
+            print("INFO: Access token perto de expirar. Renovando sessão.")
+            return self.refresh_session() or self.offline
         try:
             user = self.get_current_user()
             if user:
@@ -156,6 +307,7 @@ class SupabaseService:
                     else None
                 )
                 if stored_user_id == user.id:
+                    self._sync_auth_state()
                     return True
                 self._restore_session()
                 user = self.get_current_user()
@@ -166,6 +318,13 @@ class SupabaseService:
             self._safe_show_snackbar(f"Erro ao verificar autenticação: {str(e)}")
             return False
 
+    def _sync_auth_state(self) -> None:
+        """Atualiza o estado local a partir da sessão em memória do cliente."""
+        session = self.client.auth.get_session()
+        self.auth_state = (
+            AuthState.from_access_token(session.access_token) if session else None
+        )
+
     def login(self, email: str, password: str):
         """Realiza login com email e senha."""
         print(f"INFO: Tentando login para: {email}")
@@ -184,33 +343,79 @@ class SupabaseService:
             self._safe_show_snackbar(f"Erro no login: {str(e)}")
             raise
 
-    def refresh_session(self) -> bool:
-        """Renova a sessão atual."""
-        try:
-            session = self.client.auth.refresh_session()
-            if session and session.session:
-                self._update_client_storage(session)
-                print("INFO: Sessão renovada com sucesso.")
+    def retry_offline_refresh(self) -> bool:
+        """
+        Agenda em segundo plano uma nova tentativa de renovar a sessão
+        retomada sem conexão, no máximo uma a cada OFFLINE_REFRESH_INTERVAL.
+        Retorna se a tentativa foi agendada.
+        """
+        now = time.monotonic()
+        with self._offline_refresh_lock:
+            if now - self._last_offline_refresh < OFFLINE_REFRESH_INTERVAL:
+                return False
+            self._last_offline_refresh = now
+        print("INFO: Sem conexão. Nova tentativa de renovar a sessão em segundo plano.")
+        self._run_in_background(self.refresh_session)
+        return True
+
+    def refresh_session(self, clear_on_failure: bool = True) -> bool:
+        """
+        Renova a sessão atual. Chamadas simultâneas (agendador, rotas, retry
+        após 42501) compartilham uma única renovação: quem esperava pelo lock
+        reaproveita o token renovado pela outra thread.
+        """
+        state_before = self.auth_state
+        with self._refresh_lock:
+            state = self.auth_state
+            if state is not state_before and state and state.is_valid():
                 return True
-            else:
-                print("WARNING: Falha ao renovar sessão.")
-                self._clear_session()
-                self._safe_show_snackbar("Falha ao renovar sessão.")
+            try:
+                session = self.client.auth.refresh_session(self._offline_refresh_token)
+                if session and session.session:
+                    self._update_client_storage(session)
+                    print("INFO: Sessão renovada com sucesso.")
+                    return True
+                else:
+                    print("WARNING: Falha ao renovar sessão.")
+                    if clear_on_failure:
+                        self._clear_session()
+                        self._safe_show_snackbar("Falha ao renovar sessão.")
+                    return False
+            except Exception as e:
+                if is_network_error(e):
+                    print(f"WARNING: Sem conexão para renovar a sessão: {str(e)}")
+                    self.offline = True
+                    return False
+                print(f"ERROR: Erro ao renovar sessão: {str(e)}")
+                if clear_on_failure:
+                    self._clear_session()
+                    self._safe_show_snackbar(f"Erro ao renovar sessão: {str(e)}")
                 return False
-        except Exception as e:
-            print(f"ERROR: Erro ao renovar sessão: {str(e)}")
-            self._clear_session()
-            self._safe_show_snackbar(f"Erro ao renovar sessão: {str(e)}")
-            return False
 
     def logout(self):
         """Realiza logout do usuário."""
         try:
+            # Envia o que estiver pendente antes de apagar os dados locais
+            user_id = self.sync_engine.user_id
+            self.sync_engine.push()
+            unsent = bool(user_id) and self.local_store.has_pending_operations(user_id)
+            self.sync_engine.stop()
+            # O que não foi enviado fica na fila até o próximo login
+            self.local_store.clear(keep_outbox=unsent)
             self._clear_session()
+            if unsent:
+                print("WARNING: Logout com registros não enviados; mantidos na fila.")
             if self.page:
-                snackbar = CustomSnackBar(
-                    message="Logout realizado com sucesso!", bgcolor=ft.Colors.GREEN_700
-                )
+                if unsent:
+                    snackbar = CustomSnackBar(
+                        message="Sem conexão: seus últimos registros serão enviados no próximo login.",
+                        bgcolor=ft.Colors.ORANGE_700,
+                    )
+                else:
+                    snackbar = CustomSnackBar(
+                        message="Logout realizado com sucesso!",
+                        bgcolor=ft.Colors.GREEN_700,
+                    )
                 snackbar.show(self.page)
                 self.page.go("/login")
             print("INFO: Logout concluído com sucesso.")
@@ -225,6 +430,9 @@ class SupabaseService:
         try:
             profile_data["user_id"] = user_id
             response = self.client.table("user_profiles").insert(profile_data).execute()
+            self.profiles.put(
+                user_id, response.data[0] if response.data else profile_data
+            )
             if self.page:
                 self.page.client_storage.set("supafit.profile_created", True)
                 self.page.client_storage.set(
@@ -237,43 +445,22 @@ class SupabaseService:
             self._safe_show_snackbar(f"Erro ao criar perfil: {str(e)}")
             raise
 
-    def get_profile(self, user_id: str):
-        """Recupera perfil do usuário."""
-        print(f"INFO: Recuperando perfil para user_id: {user_id}")
+    def load_profile(self, user_id: str) -> Optional[dict]:
+        """Perfil do ProfileStore (consulta só na primeira leitura)."""
         try:
-            response = (
-                self.client.table("user_profiles")
-                .select("*")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            return response
+            return self.profiles.get(self.client, user_id)
         except Exception as e:
             print(f"ERROR: Erro ao recuperar perfil: {str(e)}")
             self._safe_show_snackbar(f"Erro ao recuperar perfil: {str(e)}")
             raise
 
-    def get_workouts(self, user_id: str):
-        """Recupera treinos do usuário."""
-        print(f"INFO: Recuperando treinos para user_id: {user_id}")
-        try:
-            response = (
-                self.client.table("daily_workouts")
-                .select("*")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            return response
-        except Exception as e:
-            print(f"ERROR: Erro ao recuperar treinos: {str(e)}")
-            self._safe_show_snackbar(f"Erro ao recuperar treinos: {str(e)}")
-            raise
-
-    def get_all_exercises(self):
+    def get_all_exercises(self, projection: Projection = query_specs.EXERCISE_CATALOG):
         """Recupera todos os exercícios disponíveis."""
         print("INFO: Recuperando todos os exercícios")
         try:
-            response = self.client.table("exercicios").select("*").execute()
+            response = (
+                self.client.table("exercicios").select(projection.select).execute()
+            )
             print(f"INFO: {len(response.data)} exercícios recuperados")
             return response.data
         except Exception as e:
@@ -286,6 +473,8 @@ class SupabaseService:
         print(f"INFO: Criando plano de treino: {plan_data.get('title', 'Sem título')}")
         try:
             response = self.client.table("user_plans").insert(plan_data).execute()
+            invalidate_views(self.page, "plans")
+            self.invalidate_plan_queries(plan_data.get("user_id"))
             print("INFO: Plano de treino criado com sucesso.")
             return response.data
         except Exception as e:
@@ -293,6 +482,24 @@ class SupabaseService:
             self._safe_show_snackbar(f"Erro ao criar plano de treino: {str(e)}")
             raise
 
+    def invalidate_plan_queries(self, user_id: str = None) -> None:
+        """Descarta do cache SWR as consultas que dependem dos planos."""
+        cache = SWRCache.get_instance(self.page)
+        suffix = f"{user_id}" if user_id else ""
+        for query in (
+            "home.workouts",
+            "treino.exercises",
+            "history.columns",
+            "history.stats",
+        ):
+            cache.invalidate(f"{query}:{suffix}")
+
+    def invalidate_progress_queries(self, user_id: str) -> None:
+        """Descarta do cache SWR as consultas do servidor que leem o progresso."""
+        cache = SWRCache.get_instance(self.page)
+        for query in ("history.columns", "history.stats"):
+            cache.invalidate(f"{query}:{user_id}")
+
     def create_plan_exercise(self, exercise_data: dict):
         """Cria um exercício do plano."""
         print(f"INFO: Criando exercício do plano: {exercise_data.get('exercise_id')}")
@@ -300,6 +507,8 @@ class SupabaseService:
             response = (
                 self.client.table("plan_exercises").insert(exercise_data).execute()
             )
+            invalidate_views(self.page, "plans")
+            self.invalidate_plan_queries()
             print("INFO: Exercício do plano criado com sucesso.")
             return response.data
         except Exception as e:
@@ -307,29 +516,43 @@ class SupabaseService:
             self._safe_show_snackbar(f"Erro ao criar exercício do plano: {str(e)}")
             raise
 
-    def get_user_plans(self, user_id: str):
-        """Recupera planos de treino do usuário."""
+    def get_user_plans(self, user_id: str, projection: Projection = None):
+        """
+        Recupera planos de treino do usuário a partir do banco local sincronizado.
+
+        O espelho local guarda as colunas de `query_specs.PLAN_SYNC`; com
+        `projection`, cada plano é reduzido às colunas informadas.
+        """
         print(f"INFO: Recuperando planos de treino para user_id: {user_id}")
         try:
-            response = (
-                self.client.table("user_plans")
-                .select("*")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            return response
+            if self.local_store.has_plans(user_id):
+                # Delta em segundo plano: sem alterações, zero linhas trafegam
+                self.sync_engine.request_sync()
+            else:
+                self.sync_engine.pull_plans(user_id)
+            plans = self.local_store.get_plans(user_id)
+            if projection:
+                plans = [
+                    {k: v for k, v in plan.items() if k in projection.columns}
+                    for plan in plans
+                ]
+            return APIResponse(data=plans, count=None)
         except Exception as e:
             print(f"ERROR: Erro ao recuperar planos de treino: {str(e)}")
             self._safe_show_snackbar(f"Erro ao recuperar planos de treino: {str(e)}")
             raise
 
-    def get_plan_exercises(self, plan_id: str):
+    def get_plan_exercises(
+        self,
+        plan_id: str,
+        projection: Projection = query_specs.PLAN_EXERCISES_WITH_EXERCISE,
+    ):
         """Recupera exercícios de um plano específico."""
         print(f"INFO: Recuperando exercícios do plano: {plan_id}")
         try:
             response = (
                 self.client.table("plan_exercises")
-                .select("*, exercicios(*)")
+                .select(projection.select)
                 .eq("plan_id", plan_id)
                 .order("order")
                 .execute()
@@ -343,7 +566,12 @@ class SupabaseService:
     def save_exercise_progress(
         self, user_id: str, plan_id: str, exercise_id: str, load: float
     ):
-        """Salva ou atualiza o progresso de carga de um exercício."""
+        """
+        Salva o progresso de carga de um exercício.
+
+        A carga é gravada no banco local e enfileirada; o envio é tentado na
+        hora e, sem conexão, fica para a próxima sincronização.
+        """
         print(
             f"INFO: Salvando progresso - user_id: {user_id}, plan_id: {plan_id}, exercise_id: {exercise_id}, load: {load}kg"
         )
@@ -356,52 +584,17 @@ class SupabaseService:
             if load < 0:
                 raise ValueError("load não pode ser negativo")
 
-            # Primeiro, verifica se já existe um registro para este exercício
-            existing_response = (
-                self.client.table("progress")
-                .select("id")
-                .eq("user_id", user_id)
-                .eq("exercise_id", exercise_id)
-                .order("recorded_at", desc=True)
-                .limit(1)
-                .execute()
-            )
-
-            progress_data = {
-                "user_id": user_id,
-                "exercise_id": exercise_id,
-                "load": float(load),
-            }
-
-            # Adiciona plan_id apenas se fornecido
-            if plan_id:
-                progress_data["plan_id"] = plan_id
-
-            print(f"INFO: Dados a serem processados: {progress_data}")
+            row = self.local_store.record_progress(user_id, plan_id, exercise_id, load)
+            invalidate_views(self.page, "progress")
+            # O treino é montado do banco local e já vê a carga nova. O
+            # histórico vem do servidor: é invalidado quando o envio termina
+            # (SyncEngine -> invalidate_progress_queries) e, até lá, soma as
+            # linhas pendentes do banco local
+            SWRCache.get_instance(self.page).invalidate(f"treino.exercises:{user_id}")
 
-            # Se existe um registro, atualiza. Senão, insere novo
-            if existing_response.data and len(existing_response.data) > 0:
-                # Atualiza o registro mais recente
-                existing_id = existing_response.data[0]["id"]
-                print(f"INFO: Atualizando registro existente: {existing_id}")
-
-                response = (
-                self.client.table("progress")
-                .update({"load": float(load)})
-                .eq("id", existing_id)
-                .execute()
-            )
-            else:
-                # Insere novo registro
-                print("INFO: Inserindo novo registro")
-                response = self.client.table("progress").insert(progress_data).execute()
-
-            if response.data:
-                print(f"INFO: Progresso salvo com sucesso: {response.data}")
-                return response.data
-            else:
-                print("WARNING: Resposta vazia do banco de dados")
-                return None
+            # Envio fora do handler da interface; sem conexão, fica na outbox
+            self._run_in_background(self._push_progress)
+            return [row]
 
         except Exception as e:
             print(f"ERROR: Erro ao salvar progresso: {str(e)}")
@@ -411,11 +604,26 @@ class SupabaseService:
             self._safe_show_snackbar(f"Erro ao salvar progresso: {str(e)}")
             raise
 
+    def _push_progress(self) -> None:
+        if self.sync_engine.push():
+            print("INFO: Progresso salvo e sincronizado")
+        else:
+            print("INFO: Sem conexão. Progresso salvo localmente para envio posterior")
+
+    def _run_in_background(self, task) -> None:
+        if self.page:
+            self.page.run_thread(task)
+        else:
+            threading.Thread(target=task, daemon=True).start()
+
     def get_latest_exercise_load(self, user_id: str, exercise_id: str):
         """Recupera a última carga registrada para um exercício."""
         print(
             f"INFO: Recuperando última carga para user_id: {user_id}, exercise_id: {exercise_id}"
         )
+        local_load = self.local_store.get_latest_load(user_id, exercise_id)
+        if local_load is not None:
+            return local_load
         try:
             response = (
                 self.client.table("progress")
@@ -0,0 +1,228 @@
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import flet as ft
+
+STORAGE_PREFIX = "supafit.swr."
+SWR_CACHE_SESSION_KEY = "supafit.swr_cache"
+
+
+@dataclass
+class QueryPolicy:
+    """Configuração de cache de um tipo de consulta."""
+
+    # Segundos em que o resultado é considerado fresco (sem revalidação)
+    ttl: float = 60.0
+    # Quantidade máxima de chaves mantidas para essa consulta (LRU)
+    max_entries: int = 8
+    # Persiste o último resultado no client_storage para aberturas a frio
+    persist: bool = True
+
+
+# Políticas por consulta. A chave de cache tem o formato "<consulta>:<parâmetros>".
+QUERY_POLICIES: Dict[str, QueryPolicy] = {
+    "home.workouts": QueryPolicy(ttl=300, max_entries=2),
+    "treino.exercises": QueryPolicy(ttl=300, max_entries=7),
+    # Janela colunar: pode passar de centenas de KB, fica só na memória
+    "history.columns": QueryPolicy(ttl=120, max_entries=1, persist=False),
+    # Agregados de períodos longos: poucos KB por período, persistidos
+    "history.stats": QueryPolicy(ttl=120, max_entries=4),
+    "community.victories": QueryPolicy(ttl=30, max_entries=5, persist=False),
+}
+
+DEFAULT_POLICY = QueryPolicy()
+
+
+class SWRCache:
+    """
+    Cache stale-while-revalidate para o carregamento das telas.
+
+    `read` devolve imediatamente o último resultado conhecido (memória ou
+    client_storage) e, se ele estiver vencido, revalida em segundo plano,
+    chamando `on_update` com os dados novos quando forem diferentes. Só há
+    bloqueio na rede quando não existe nenhum resultado em cache.
+
+    Há um cache por sessão (em `page.session`), como o ViewCache: dados e
+    `clear()` de um usuário não alcançam outra sessão do mesmo processo.
+    """
+
+    @classmethod
+    def get_instance(cls, page: ft.Page = None) -> "SWRCache":
+        """Cache da sessão da página (sem página, um cache descartável)."""
+        if page is None or page.session is None:
+            return cls(page)
+        cache = page.session.get(SWR_CACHE_SESSION_KEY)
+        if cache is None:
+            cache = cls(page)
+            page.session.set(SWR_CACHE_SESSION_KEY, cache)
+        return cache
+
+    def __init__(self, page: ft.Page = None):
+        self.page = page
+        self._entries: Dict[str, "OrderedDict[str, dict]"] = {}
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split_key(key: str) -> tuple[str, str]:
+        query, _, params = key.partition(":")
+        return query, params
+
+    def _policy(self, query: str) -> QueryPolicy:
+        return QUERY_POLICIES.get(query, DEFAULT_POLICY)
+
+    def _get_entry(self, key: str) -> Optional[dict]:
+        query, _ = self._split_key(key)
+        with self._lock:
+            bucket = self._entries.get(query)
+            if bucket and key in bucket:
+                bucket.move_to_end(key)
+                return bucket[key]
+
+        if not self._policy(query).persist or not self.page:
+            return None
+        try:
+            stored = self.page.client_storage.get(STORAGE_PREFIX + key)
+        except Exception as e:
+            print(f"ERROR - swr_cache: Erro ao ler client_storage para {key}: {e}")
+            return None
+        if isinstance(stored, dict) and "data" in stored:
+            self._put_memory(key, stored)
+            return stored
+        return None
+
+    def _put_memory(self, key: str, entry: dict) -> None:
+        query, _ = self._split_key(key)
+        policy = self._policy(query)
+        with self._lock:
+            bucket = self._entries.setdefault(query, OrderedDict())
+            bucket[key] = entry
+            bucket.move_to_end(key)
+            while len(bucket) > policy.max_entries:
+                evicted, _ = bucket.popitem(last=False)
+                self._remove_persisted(evicted)
+
+    def _store(self, key: str, data: Any) -> None:
+        entry = {"data": data, "fetched_at": time.time()}
+        self._put_memory(key, entry)
+        query, _ = self._split_key(key)
+        if self._policy(query).persist and self.page:
+            try:
+                self.page.client_storage.set(STORAGE_PREFIX + key, entry)
+            except Exception as e:
+                print(f"ERROR - swr_cache: Erro ao persistir {key}: {e}")
+
+    def _remove_persisted(self, key: str) -> None:
+        if not self.page:
+            return
+        try:
+            self.page.client_storage.remove(STORAGE_PREFIX + key)
+        except Exception:
+            pass
+
+    def read(
+        self,
+        key: str,
+        fetcher: Callable[[], Any],
+        on_update: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        Retorna os dados da consulta `key`.
+
+        Com cache: retorna o valor em cache e, se vencido, agenda a
+        revalidação. Sem cache: executa `fetcher` e armazena o resultado.
+        Um `fetcher` que retorna None sinaliza falha e não sobrescreve o cache.
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            print(f"INFO - swr_cache: Cache vazio para {key}, buscando na rede")
+            data = fetcher()
+            if data is not None:
+                self._store(key, data)
+            return data
+
+        query, _ = self._split_key(key)
+        age = time.time() - entry.get("fetched_at", 0)
+        if age > self._policy(query).ttl:
+            self._revalidate(key, fetcher, on_update, entry["data"])
+        return entry["data"]
+
+    def _revalidate(self, key, fetcher, on_update, current) -> None:
+        with self._lock:
+            if key in self._inflight:
+                return
+            self._inflight.add(key)
+
+        def task():
+            try:
+                data = fetcher()
+                if data is None:
+                    return
+                self._store(key, data)
+                if data != current and on_update:
+                    print(f"INFO - swr_cache: Dados novos para {key}, atualizando tela")
+                    on_update(data)
+            except Exception as e:
+                print(f"ERROR - swr_cache: Erro ao revalidar {key}: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+
+        if self.page:
+            self.page.run_thread(task)
+        else:
+            threading.Thread(target=task, daemon=True).start()
+
+    def patch(self, prefix: str, transform: Callable[[Any], Any]) -> int:
+        """
+        Aplica `transform` aos dados em memória cujas chaves começam com
+        `prefix`, sem mudar a idade da entrada (ex.: um evento em tempo real
+        que altera um item já em cache). Retorna quantas entradas mudaram.
+        """
+        changed = {}
+        with self._lock:
+            for bucket in self._entries.values():
+                for key, entry in bucket.items():
+                    if not key.startswith(prefix):
+                        continue
+                    data = transform(entry["data"])
+                    if data is not entry["data"]:
+                        bucket[key] = changed[key] = {**entry, "data": data}
+        for key, entry in changed.items():
+            if self.page and self._policy(self._split_key(key)[0]).persist:
+                try:
+                    self.page.client_storage.set(STORAGE_PREFIX + key, entry)
+                except Exception as e:
+                    print(f"ERROR - swr_cache: Erro ao persistir {key}: {e}")
+        return len(changed)
+
+    def invalidate(self, prefix: str) -> None:
+        """Descarta as entradas cuja chave começa com `prefix`."""
+        with self._lock:
+            removed = [
+                key
+                for bucket in self._entries.values()
+                for key in list(bucket)
+                if key.startswith(prefix)
+            ]
+            for key in removed:
+                self._entries[self._split_key(key)[0]].pop(key, None)
+        for key in removed:
+            self._remove_persisted(key)
+        if self.page:
+            try:
+                for stored in self.page.client_storage.get_keys(
+                    STORAGE_PREFIX + prefix
+                ):
+                    self.page.client_storage.remove(stored)
+            except Exception as e:
+                print(f"ERROR - swr_cache: Erro ao invalidar {prefix}: {e}")
+
+    def clear(self) -> None:
+        """Limpa todo o cache (memória e client_storage)."""
+        with self._lock:
+            self._entries.clear()
+        self.invalidate("")
+        print("INFO - swr_cache: Cache limpo")
@@ -0,0 +1,418 @@
+import json
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import httpx
+from core.view_cache import invalidate_views
+from services import query_specs
+from services.local_store import LocalStore, is_newer
+
+# Intervalo entre ciclos de sincronização (segundos)
+SYNC_INTERVAL = 60
+# Intervalo de nova tentativa enquanto houver escritas pendentes sem conexão
+OFFLINE_RETRY_INTERVAL = 15
+# Janela de progresso espelhada na primeira sincronização
+PROGRESS_WINDOW_DAYS = 90
+PULL_PAGE_SIZE = 500
+# Intervalo entre conferências de exclusões no servidor (segundos)
+RECONCILE_INTERVAL = 15 * 60
+
+
+def encode_cursor(updated_at: str, key: str) -> str:
+    return json.dumps([updated_at, key])
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(updated_at, chave) do cursor salvo; cursores antigos têm só o timestamp."""
+    if not cursor:
+        return None, None
+    if cursor.startswith("["):
+        updated_at, key = json.loads(cursor)
+        return updated_at, key
+    return cursor, None
+
+
+def is_network_error(error: Exception) -> bool:
+    """Erros de transporte (sem conexão, timeout) em vez de erros da API."""
+    return isinstance(error, (httpx.TransportError, OSError))
+
+
+class SyncEngine:
+    """
+    Sincroniza o LocalStore com o Supabase.
+
+    - pull: busca apenas linhas com `updated_at` maior que o cursor salvo;
+    - push: envia a outbox em ordem; sem conexão, a fila fica para depois;
+    - conflitos: a escrita com `updated_at` mais recente vence;
+    - exclusões: o cursor de updated_at não vê linhas apagadas no servidor
+      (admin, ON DELETE CASCADE); a cada RECONCILE_INTERVAL os ids de cada
+      escopo são conferidos e o que sumiu do servidor sai do banco local.
+    """
+
+    def __init__(self, supabase_service, store: LocalStore):
+        self.supabase = supabase_service
+        self.store = store
+        self.user_id: Optional[str] = None
+        self.online = True
+        self._wake = threading.Event()
+        self._sync_lock = threading.Lock()
+        self._push_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self._reconciled_at = {}
+
+    # ------------------------------------------------------------------
+    # Ciclo em segundo plano
+    # ------------------------------------------------------------------
+    def start(self, user_id: str) -> None:
+        """Inicia (ou redireciona) o ciclo de sincronização para o usuário."""
+        self.user_id = user_id
+        self._stopped = False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="supafit-sync", daemon=True
+            )
+            self._thread.start()
+            print(f"INFO - sync: Sincronização iniciada para user_id {user_id}")
+        self.request_sync()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self.user_id = None
+        self._wake.set()
+
+    def request_sync(self) -> None:
+        """Acorda o ciclo para sincronizar imediatamente (ex.: app retomado)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped:
+            if self.user_id:
+                self.sync()
+            interval = (
+                OFFLINE_RETRY_INTERVAL
+                if not self.online and self.store.has_pending_operations(self.user_id)
+                else SYNC_INTERVAL
+            )
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def sync(self) -> bool:
+        """Executa push seguido de pull. Retorna False se estiver offline."""
+        if not self.user_id:
+            return False
+        # Renova o token vencido antes: com ele a API recusaria a outbox
+        if not self.supabase.is_authenticated():
+            return False
+        state = self.supabase.auth_state
+        if self.supabase.offline and not (state and state.is_valid()):
+            # Sessão retomada sem conexão com o token vencido: a renovação
+            # corre em segundo plano e, ao concluir, pede um novo ciclo
+            return False
+        with self._sync_lock:
+            return self.push() and self.pull(self.user_id)
+
+    # ------------------------------------------------------------------
+    # Push (outbox)
+    # ------------------------------------------------------------------
+    def push(self) -> bool:
+        """
+        Envia as operações pendentes do usuário atual em ordem. Para no
+        primeiro erro de rede. Operações de outro usuário (mantidas num
+        logout sem conexão) esperam que ele entre de novo.
+        """
+        if not self.user_id:
+            return False
+        with self._push_lock:
+            return self._push_pending()
+
+    def _push_pending(self) -> bool:
+        synced = 0
+        try:
+            for operation in self.store.pending_operations(user_id=self.user_id):
+                local_id = operation["payload"].get("local_id")
+                try:
+                    if operation["op"] == "save_progress":
+                        self._push_progress(operation)
+                        synced += 1
+                    else:
+                        print(f"WARNING - sync: Operação desconhecida: {operation['op']}")
+                        self.store.complete_operation(operation["seq"])
+                except Exception as e:
+                    if is_network_error(e):
+                        self._set_online(False)
+                        return False
+                    # Erro da API: a operação não será aceita em uma nova tentativa
+                    print(f"ERROR - sync: Operação {operation['seq']} rejeitada: {e}")
+                    self.store.fail_operation(operation["seq"])
+                    if operation["attempts"] >= 2:
+                        self.store.complete_operation(operation["seq"], local_id)
+            self._set_online(True)
+            return True
+        finally:
+            # Só agora o servidor tem as cargas: invalidar antes faria a
+            # revalidação do histórico guardar a versão sem elas
+            if synced:
+                self.supabase.invalidate_progress_queries(self.user_id)
+
+    def _push_progress(self, operation: dict) -> None:
+        payload = operation["payload"]
+        local_id = payload.get("local_id")
+        client = self.supabase.client
+
+        latest = (
+            client.table("progress")
+            .select("id, updated_at, recorded_at")
+            .eq("user_id", payload["user_id"])
+            .eq("exercise_id", payload["exercise_id"])
+            .order("recorded_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+
+        if latest.data:
+            server = latest.data[0]
+            server_updated = server.get("updated_at") or server.get("recorded_at")
+            if server_updated and not is_newer(payload["updated_at"], server_updated):
+                # Escrita mais recente feita em outro dispositivo vence
+                print(
+                    f"INFO - sync: Carga local de {payload['exercise_id']} descartada (servidor mais recente)"
+                )
+                self.store.complete_operation(operation["seq"], local_id)
+                return
+            response = (
+                client.table("progress")
+                .update({"load": payload["load"], "updated_at": payload["updated_at"]})
+                .eq("id", server["id"])
+                .execute()
+            )
+        else:
+            data = {
+                "user_id": payload["user_id"],
+                "exercise_id": payload["exercise_id"],
+                "load": payload["load"],
+                "recorded_at": payload["recorded_at"],
+                "updated_at": payload["updated_at"],
+            }
+            if payload.get("plan_id"):
+                data["plan_id"] = payload["plan_id"]
+            response = client.table("progress").insert(data).execute()
+
+        server_row = response.data[0] if response.data else None
+        self.store.complete_operation(operation["seq"], local_id, server_row)
+        print(f"INFO - sync: Progresso de {payload['exercise_id']} sincronizado")
+
+    # ------------------------------------------------------------------
+    # Pull (delta por updated_at)
+    # ------------------------------------------------------------------
+    def pull(self, user_id: str) -> bool:
+        try:
+            self.pull_plans(user_id)
+            since = (
+                datetime.now(timezone.utc) - timedelta(days=PROGRESS_WINDOW_DAYS)
+            ).isoformat()
+            self._pull_table(
+                user_id,
+                "progress",
+                "id",
+                query_specs.PROGRESS_SYNC,
+                lambda q: q.eq("user_id", user_id).gte("recorded_at", since),
+                self.store.upsert_progress,
+            )
+            if time.monotonic() - self._reconciled_at.get(user_id, 0) >= RECONCILE_INTERVAL:
+                self.reconcile(user_id, since)
+                self._reconciled_at[user_id] = time.monotonic()
+            self._set_online(True)
+            return True
+        except Exception as e:
+            if is_network_error(e):
+                self._set_online(False)
+            else:
+                print(f"ERROR - sync: Erro ao sincronizar: {e}")
+            return False
+
+    def pull_plans(self, user_id: str) -> int:
+        """
+        Sincroniza os planos do usuário por cursor de updated_at.
+
+        Sem alterações no servidor, cada consulta devolve zero linhas; os
+        exercícios do catálogo só são baixados quando um plano passa a
+        referenciar um id ainda desconhecido localmente.
+        """
+        changed = self._pull_table(
+            user_id,
+            "user_plans",
+            "plan_id",
+            query_specs.PLAN_SYNC,
+            lambda q: q.eq("user_id", user_id),
+            self.store.upsert_plans,
+        )
+        plan_ids = self.store.get_plan_ids(user_id)
+        if plan_ids:
+            changed += self._pull_table(
+                user_id,
+                "plan_exercises",
+                "plan_exercise_id",
+                query_specs.PLAN_EXERCISE_SYNC,
+                lambda q: q.in_("plan_id", plan_ids),
+                self.store.upsert_plan_exercises,
+            )
+
+        missing_ids = self.store.get_missing_exercise_ids(user_id)
+        if missing_ids:
+            rows = (
+                self.supabase.client.table("exercicios")
+                .select(query_specs.EXERCISE_SYNC.select)
+                .in_("id", missing_ids)
+                .execute()
+                .data
+                or []
+            )
+            changed += self.store.upsert_exercises(rows)
+            if rows and not self.store.get_cursor(user_id, "exercicios"):
+                # Primeira carga: tudo o que é referenciado acabou de chegar
+                latest = max(
+                    (r.get("updated_at") or "", str(r["id"])) for r in rows
+                )
+                if latest[0]:
+                    self.store.set_cursor(user_id, "exercicios", encode_cursor(*latest))
+
+        known_ids = self.store.get_referenced_exercise_ids(user_id)
+        if known_ids:
+            changed += self._pull_table(
+                user_id,
+                "exercicios",
+                "id",
+                query_specs.EXERCISE_SYNC,
+                lambda q: q.in_("id", known_ids),
+                self.store.upsert_exercises,
+            )
+
+        if changed:
+            print(f"INFO - sync: {changed} linhas de planos atualizadas localmente")
+            self.supabase.invalidate_plan_queries(user_id)
+            invalidate_views(self.supabase.page, "plans")
+        return changed
+
+    def reconcile(self, user_id: str, progress_since: str) -> int:
+        """
+        Remove do banco local as linhas apagadas no servidor, comparando só
+        os ids de cada escopo (planos do usuário, exercícios dos planos e a
+        janela de progresso espelhada).
+        """
+        removed = self.store.remove_plans_except(
+            user_id,
+            self._server_ids("user_plans", "plan_id", lambda q: q.eq("user_id", user_id)),
+        )
+        plan_ids = self.store.get_plan_ids(user_id)
+        if plan_ids:
+            removed += self.store.remove_plan_exercises_except(
+                plan_ids,
+                self._server_ids(
+                    "plan_exercises",
+                    "plan_exercise_id",
+                    lambda q: q.in_("plan_id", plan_ids),
+                ),
+            )
+        plans_removed = removed
+        # Com o push bloqueado: uma carga enviada entre a leitura dos ids e a
+        # remoção pareceria apagada no servidor
+        with self._push_lock:
+            removed += self.store.remove_progress_except(
+                user_id,
+                progress_since,
+                self._server_ids(
+                    "progress",
+                    "id",
+                    lambda q: q.eq("user_id", user_id).gte("recorded_at", progress_since),
+                ),
+            )
+
+        if plans_removed:
+            self.supabase.invalidate_plan_queries(user_id)
+            invalidate_views(self.supabase.page, "plans")
+        if removed > plans_removed:
+            invalidate_views(self.supabase.page, "progress")
+        if removed:
+            print(f"INFO - sync: {removed} linhas apagadas no servidor removidas localmente")
+        return removed
+
+    def _server_ids(self, table, key, apply_filters) -> list:
+        """Todos os valores de `key` no escopo, paginados por keyset."""
+        ids = []
+        while True:
+            query = apply_filters(self.supabase.client.table(table).select(key))
+            if ids:
+                query = query.gt(key, ids[-1])
+            rows = query.order(key).limit(PULL_PAGE_SIZE).execute().data or []
+            ids.extend(row[key] for row in rows)
+            if len(rows) < PULL_PAGE_SIZE:
+                return ids
+
+    def ensure_plans(self, user_id: str) -> bool:
+        """Garante que os planos existam localmente (primeira abertura)."""
+        if self.store.has_plans(user_id):
+            return True
+        try:
+            self.pull_plans(user_id)
+            self._set_online(True)
+        except Exception as e:
+            if is_network_error(e):
+                self._set_online(False)
+            else:
+                print(f"ERROR - sync: Erro ao baixar planos: {e}")
+        return self.store.has_plans(user_id)
+
+    def _pull_table(
+        self, scope, table, key, projection, apply_filters, upsert
+    ) -> int:
+        """
+        Busca as linhas alteradas desde o cursor e avança o cursor.
+
+        A paginação é por keyset em (updated_at, chave): muitas linhas podem
+        ter o mesmo updated_at (a migração preencheu todas com now()), então
+        só o timestamp não basta para passar à página seguinte.
+        """
+        updated_at, last_key = decode_cursor(self.store.get_cursor(scope, table))
+        columns = projection.with_columns("updated_at", key).select
+        applied = 0
+        while True:
+            query = apply_filters(self.supabase.client.table(table).select(columns))
+            if updated_at and last_key is not None:
+                query = query.or_(
+                    f'updated_at.gt."{updated_at}",'
+                    f'and(updated_at.eq."{updated_at}",{key}.gt."{last_key}")'
+                )
+            elif updated_at:
+                # Cursor antigo, só com timestamp: reaplicar empates é inofensivo
+                query = query.gte("updated_at", updated_at)
+            rows = (
+                query.order("updated_at")
+                .order(key)
+                .limit(PULL_PAGE_SIZE)
+                .execute()
+                .data
+                or []
+            )
+            if not rows:
+                break
+            applied += upsert(rows)
+            last = rows[-1]
+            if last.get("updated_at"):
+                updated_at, last_key = last["updated_at"], str(last[key])
+                self.store.set_cursor(
+                    scope, table, encode_cursor(updated_at, last_key)
+                )
+            if len(rows) < PULL_PAGE_SIZE:
+                break
+        return applied
+
+    def _set_online(self, online: bool) -> None:
+        if online != self.online:
+            print(
+                "INFO - sync: Conexão restabelecida"
+                if online
+                else "WARNING - sync: Sem conexão, escritas ficarão na fila"
+            )
+        self.online = online
@@ -0,0 +1,146 @@
+"""
+Gera os pôsteres (thumbnails) dos vídeos de exercícios.
+
+Para cada exercício com `url_video` e sem `thumbnail_url`, o ffmpeg extrai
+um quadro (por padrão em 1s), reduzido e comprimido em WebP. O arquivo vai
+para o bucket público `exercise-thumbnails` como `<exercise_id>.webp` e a URL
+pública é gravada em `exercicios.thumbnail_url`, de onde o catálogo e o
+sync a levam ao app.
+
+Roda fora do app, com a chave de serviço (SUPABASE_SERVICE_ROLE_KEY):
+
+    python -m services.thumbnail_job [--force] [--at SEGUNDOS]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from supabase import Client, create_client
+from services import query_specs
+
+THUMBNAIL_BUCKET = "exercise-thumbnails"
+# Momento do vídeo usado como pôster (segundos)
+POSTER_AT_SECONDS = 1.0
+THUMBNAIL_WIDTH = 480
+WEBP_QUALITY = 70
+FFMPEG_TIMEOUT = 60
+
+
+def thumbnail_path(exercise_id: str) -> str:
+    return f"{exercise_id}.webp"
+
+
+def extract_poster(
+    video_url: str,
+    output_path: str,
+    at: float = POSTER_AT_SECONDS,
+    width: int = THUMBNAIL_WIDTH,
+    quality: int = WEBP_QUALITY,
+) -> bool:
+    """Extrai um quadro de `video_url` em `at` segundos como WebP."""
+    command = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-y",
+        # -ss antes de -i: busca pelo índice, sem decodificar o início
+        "-ss", str(at),
+        "-i", video_url,
+        "-frames:v", "1",
+        "-vf", f"scale={width}:-2",
+        "-c:v", "libwebp",
+        "-quality", str(quality),
+        output_path,
+    ]
+    try:
+        result = subprocess.run(
+            command, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        print(f"ERROR - thumbnails: Tempo esgotado ao ler {video_url}")
+        return False
+    if result.returncode != 0 or not os.path.exists(output_path):
+        print(f"ERROR - thumbnails: ffmpeg falhou para {video_url}: {result.stderr.strip()}")
+        return False
+    return True
+
+
+def publish_thumbnail(client: Client, exercise_id: str, image_path: str) -> str:
+    """Envia o WebP ao Storage e retorna a URL pública (com versão)."""
+    path = thumbnail_path(exercise_id)
+    with open(image_path, "rb") as f:
+        client.storage.from_(THUMBNAIL_BUCKET).upload(
+            path,
+            f.read(),
+            {"content-type": "image/webp", "cache-control": "31536000", "upsert": "true"},
+        )
+    public_url = client.storage.from_(THUMBNAIL_BUCKET).get_public_url(path)
+    # A versão na URL invalida caches de imagem quando o pôster é refeito
+    return f"{public_url.rstrip('?')}?v={int(time.time())}"
+
+
+def run(client: Client, force: bool = False, at: float = POSTER_AT_SECONDS) -> Dict[str, int]:
+    """Gera os pôsteres que faltam (ou todos, com `force`)."""
+    rows = (
+        client.table("exercicios")
+        .select(query_specs.EXERCISE_THUMBNAIL_JOB.select)
+        .execute()
+        .data
+        or []
+    )
+    counts = {"generated": 0, "skipped": 0, "failed": 0}
+    with tempfile.TemporaryDirectory() as workdir:
+        for row in rows:
+            if not row.get("url_video") or (row.get("thumbnail_url") and not force):
+                counts["skipped"] += 1
+                continue
+            output = os.path.join(workdir, thumbnail_path(row["id"]))
+            try:
+                if not extract_poster(row["url_video"], output, at):
+                    counts["failed"] += 1
+                    continue
+                url = publish_thumbnail(client, row["id"], output)
+                client.table("exercicios").update({"thumbnail_url": url}).eq(
+                    "id", row["id"]
+                ).execute()
+                counts["generated"] += 1
+                print(
+                    f"INFO - thumbnails: {row['nome']} "
+                    f"({os.path.getsize(output) // 1024} KB)"
+                )
+            except Exception as e:
+                counts["failed"] += 1
+                print(f"ERROR - thumbnails: Falha em {row['nome']}: {str(e)}")
+    print(
+        f"INFO - thumbnails: {counts['generated']} gerados, "
+        f"{counts['skipped']} ignorados, {counts['failed']} com erro"
+    )
+    return counts
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera pôsteres WebP dos exercícios.")
+    parser.add_argument("--force", action="store_true", help="refaz todos os pôsteres")
+    parser.add_argument("--at", type=float, default=POSTER_AT_SECONDS, help="segundo do quadro")
+    args = parser.parse_args(argv)
+
+    if not shutil.which("ffmpeg"):
+        print("ERROR - thumbnails: ffmpeg não encontrado no PATH")
+        return 1
+    load_dotenv()
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        print("ERROR - thumbnails: Defina SUPABASE_URL e SUPABASE_SERVICE_ROLE_KEY")
+        return 1
+    counts = run(create_client(url, key), force=args.force, at=args.at)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
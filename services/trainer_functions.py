@@ -3,6 +3,7 @@ import json
 import uuid
 from supabase import Client
 from typing import List, Dict, Any
+from services.profile_store import ProfileStore
 from utils.logger import get_logger
 logger = get_logger("supafit.trainer_functions")
 
@@ -159,16 +160,10 @@ def get_user_profile(supabase: Client, user_id: str) -> Dict[str, Any]:
         if not is_valid_uuid(user_id):
             print(f"ERROR: ID de usuário inválido: {user_id}")
             return {"error": "ID de usuário inválido"}
-        response = (
-            supabase.table("user_profiles")
-            .select("*")
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        )
-        if response.data:
+        profile = ProfileStore.get_instance().get(supabase, user_id)
+        if profile:
             print(f"INFO: Perfil encontrado para user_id: {user_id}")
-            return response.data
+            return profile
         print(f"WARNING: Perfil não encontrado para user_id: {user_id}")
         return {"error": "Perfil não encontrado"}
     except Exception as e:
@@ -398,7 +393,7 @@ def get_exercise_details(
                 return {"error": f"ID de exercício inválido: {exercise_id}"}
             response = (
                 supabase.table("exercicios")
-                .select("id, nome, grupo_muscular")
+                .select("id, nome, grupo_muscular, thumbnail_url")
                 .eq("id", exercise_id)
                 .execute()
             )
@@ -410,7 +405,7 @@ def get_exercise_details(
         elif exercise_name:
             response = (
                 supabase.table("exercicios")
-                .select("id, nome, grupo_muscular")
+                .select("id, nome, grupo_muscular, thumbnail_url")
                 .ilike("nome", f"%{exercise_name}%")
                 .limit(3)  
                 .execute()
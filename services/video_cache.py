@@ -0,0 +1,256 @@
+import hashlib
+import os
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+import httpx
+from services.local_store import app_data_dir
+
+# Espaço máximo em disco dos vídeos (bytes)
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+DOWNLOAD_TIMEOUT = 30.0
+CHUNK_SIZE = 256 * 1024
+
+
+def default_cache_dir() -> str:
+    path = os.path.join(app_data_dir(), "video_cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+
+class VideoCache:
+    """
+    Cache em disco dos vídeos de exercícios (Supabase Storage).
+
+    Cada arquivo é nomeado por hash(URL) + hash(ETag); uma ETag nova no
+    servidor gera outro arquivo e descarta a versão antiga. A ETag é
+    conferida uma vez por execução do app; sem conexão, a cópia local é
+    usada como está. O uso recente é a data de modificação do arquivo
+    (tocada a cada leitura) e, acima de `max_bytes`, os menos usados saem
+    primeiro (LRU). Downloads rodam em uma thread de fundo, um por vez.
+
+    Arquivos em reprodução ficam fixados (`source_for(pin=True)` até
+    `unpin`) e nem a limpeza por espaço nem a troca de versão os apagam.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._queue: deque = deque()
+        self._queued: Set[str] = set()
+        self._validated: Set[str] = set()
+        # Caminho -> quantidade de players usando o arquivo
+        self._pinned: Dict[str, int] = {}
+        self._worker: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def _url_key(self, url: str) -> str:
+        return _digest(url)
+
+    def _extension(self, url: str) -> str:
+        ext = os.path.splitext(urlparse(url).path)[1]
+        return ext if 0 < len(ext) <= 5 else ".mp4"
+
+    def _path_for(self, url: str, etag: Optional[str]) -> str:
+        name = f"{self._url_key(url)}-{_digest(etag or '')[:12]}{self._extension(url)}"
+        return os.path.join(self.cache_dir, name)
+
+    def _cached_files(self, url: str) -> List[str]:
+        prefix = f"{self._url_key(url)}-"
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [
+            os.path.join(self.cache_dir, n)
+            for n in names
+            if n.startswith(prefix) and not n.endswith(".part")
+        ]
+
+    def local_path(self, url: str) -> Optional[str]:
+        """Arquivo local do vídeo, se já baixado (sem acessar a rede)."""
+        files = self._cached_files(url)
+        if not files:
+            return None
+        path = max(files, key=os.path.getmtime)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def source_for(self, url: str, pin: bool = False) -> str:
+        """
+        Fonte para o player: o arquivo local se houver; senão a própria URL
+        (streaming), e o vídeo entra na fila para as próximas vezes. Com
+        `pin`, o arquivo local fica fixado até `unpin(caminho)`.
+        """
+        with self._lock:
+            path = self.local_path(url)
+            if path and pin:
+                self._pinned[path] = self._pinned.get(path, 0) + 1
+        if path:
+            if url not in self._validated:
+                self.prefetch([url])
+            return path
+        self.prefetch([url])
+        return url
+
+    def unpin(self, path: str) -> None:
+        """Libera um arquivo fixado por `source_for(pin=True)`."""
+        with self._lock:
+            count = self._pinned.get(path, 0) - 1
+            if count > 0:
+                self._pinned[path] = count
+            else:
+                self._pinned.pop(path, None)
+
+    # ------------------------------------------------------------------
+    # Download
+    # ------------------------------------------------------------------
+    def prefetch(self, urls: Iterable[Optional[str]]) -> None:
+        """Enfileira os vídeos para download em segundo plano."""
+        added = 0
+        with self._lock:
+            for url in urls:
+                if not url or url in self._queued:
+                    continue
+                if url in self._validated and self._cached_files(url):
+                    continue
+                self._queue.append(url)
+                self._queued.add(url)
+                added += 1
+            start = added and (self._worker is None or not self._worker.is_alive())
+            if start:
+                self._worker = threading.Thread(
+                    target=self._run, name="supafit-video-cache", daemon=True
+                )
+                self._worker.start()
+        if added:
+            print(f"INFO - video_cache: {added} vídeo(s) na fila de download")
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._worker = None
+                    return
+                url = self._queue.popleft()
+            try:
+                self.fetch(url)
+            except Exception as e:
+                print(f"ERROR - video_cache: Falha ao baixar {url}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._queued.discard(url)
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Garante a versão atual do vídeo em disco e retorna o caminho.
+        Sem conexão, retorna a cópia local (se houver).
+        """
+        cached = self.local_path(url)
+        try:
+            with httpx.Client(timeout=DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
+                head = client.head(url)
+                head.raise_for_status()
+                etag = head.headers.get("etag")
+                path = self._path_for(url, etag)
+                if cached == path:
+                    self._validated.add(url)
+                    return path
+                self._download(client, url, path)
+        except (httpx.TransportError, OSError) as e:
+            print(f"WARNING - video_cache: Sem conexão para {url}: {str(e)}")
+            return cached
+
+        # Versões antigas do mesmo vídeo (ETag anterior) saem do cache; a
+        # que estiver tocando sai numa limpeza depois de liberada
+        with self._lock:
+            for old in self._cached_files(url):
+                if old != path and old not in self._pinned:
+                    self._remove(old)
+        self._validated.add(url)
+        self.evict()
+        return path
+
+    def _download(self, client: httpx.Client, url: str, path: str) -> None:
+        partial = f"{path}.part"
+        with client.stream("GET", url) as response:
+            response.raise_for_status()
+            with open(partial, "wb") as f:
+                for chunk in response.iter_bytes(CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(partial, path)
+        print(
+            f"INFO - video_cache: Vídeo salvo ({os.path.getsize(path) // 1024} KB): {url}"
+        )
+
+    # ------------------------------------------------------------------
+    # Espaço em disco
+    # ------------------------------------------------------------------
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self) -> int:
+        """
+        Remove os vídeos menos usados até caber em `max_bytes`. Arquivos
+        fixados contam no total, mas não saem.
+        """
+        with self._lock:
+            entries = [
+                e for e in os.scandir(self.cache_dir)
+                if e.is_file() and not e.name.endswith(".part")
+            ]
+            stats = {e.path: e.stat() for e in entries}
+            total = sum(s.st_size for s in stats.values())
+            removed = 0
+            for path in sorted(stats, key=lambda p: stats[p].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                if path in self._pinned:
+                    continue
+                self._remove(path)
+                total -= stats[path].st_size
+                removed += 1
+        if removed:
+            print(f"INFO - video_cache: {removed} vídeo(s) removidos (LRU)")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and entry.path not in self._pinned:
+                    self._remove(entry.path)
+        self._validated.clear()
+
+
+def prefetch_day_videos(supabase_service, user_id: str, day: str) -> None:
+    """Enfileira os vídeos do treino do dia a partir do banco local."""
+    store = supabase_service.local_store
+    plan = store.get_day_plan(user_id, day)
+    if not plan:
+        return
+    VideoCache.get_instance().prefetch(
+        (ex.get("exercicios") or {}).get("url_video")
+        for ex in store.get_plan_exercises(plan["plan_id"])
+    )
@@ -567,6 +567,9 @@ def save_workout_to_database(page, supabase_service, user_id):
             for plan_exercise in plan_data["plan_exercises"]:
                 supabase_service.create_plan_exercise(plan_exercise)
 
+        # Traz os planos recém-criados para o banco local
+        supabase_service.sync_engine.pull_plans(user_id)
+
         clear_temporary_workout(page)
 
         logger.info(f"Treino salvo no banco para user_id: {user_id}")
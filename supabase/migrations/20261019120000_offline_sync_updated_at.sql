@@ -0,0 +1,30 @@
+-- Colunas updated_at mantidas pelo banco para o pull incremental do app
+-- (services/sync_engine.py busca apenas linhas com updated_at > cursor).
+
+create extension if not exists moddatetime schema extensions;
+
+alter table public.user_plans add column if not exists updated_at timestamptz not null default now();
+alter table public.plan_exercises add column if not exists updated_at timestamptz not null default now();
+alter table public.exercicios add column if not exists updated_at timestamptz not null default now();
+alter table public.progress add column if not exists updated_at timestamptz not null default now();
+
+drop trigger if exists user_plans_updated_at on public.user_plans;
+create trigger user_plans_updated_at before update on public.user_plans
+    for each row execute procedure extensions.moddatetime (updated_at);
+
+drop trigger if exists plan_exercises_updated_at on public.plan_exercises;
+create trigger plan_exercises_updated_at before update on public.plan_exercises
+    for each row execute procedure extensions.moddatetime (updated_at);
+
+drop trigger if exists exercicios_updated_at on public.exercicios;
+create trigger exercicios_updated_at before update on public.exercicios
+    for each row execute procedure extensions.moddatetime (updated_at);
+
+drop trigger if exists progress_updated_at on public.progress;
+create trigger progress_updated_at before update on public.progress
+    for each row execute procedure extensions.moddatetime (updated_at);
+
+create index if not exists user_plans_user_updated_idx on public.user_plans (user_id, updated_at);
+create index if not exists plan_exercises_plan_updated_idx on public.plan_exercises (plan_id, updated_at);
+create index if not exists exercicios_updated_idx on public.exercicios (updated_at);
+create index if not exists progress_user_updated_idx on public.progress (user_id, updated_at);
@@ -0,0 +1,95 @@
+-- Dados da página /history em formato colunar.
+-- O app baixa uma única vez a janela mais larga (365 dias) e calcula os
+-- períodos menores localmente (services/history_stats.py), sem nova consulta
+-- ao trocar o período.
+
+create index if not exists progress_user_recorded_idx on public.progress (user_id, recorded_at desc);
+
+create or replace function public.get_history_columns(p_days integer default 365)
+returns jsonb
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+with plans as (
+    select p.plan_id,
+           lower(trim(coalesce(p.day, ''))) as day,
+           p.title,
+           p.created_at,
+           count(pe.plan_exercise_id) as exercises
+    from user_plans p
+    left join plan_exercises pe on pe.plan_id = p.plan_id
+    where p.user_id = auth.uid()
+    group by p.plan_id, p.day, p.title, p.created_at
+),
+plan_muscles as (
+    select coalesce(e.grupo_muscular, 'Outros') as muscle_group,
+           count(distinct e.nome) as total
+    from user_plans p
+    join plan_exercises pe on pe.plan_id = p.plan_id
+    join exercicios e on e.id = pe.exercise_id
+    where p.user_id = auth.uid()
+    group by 1
+),
+prog as (
+    select pr.id, pr.exercise_id, pr.load, pr.recorded_at
+    from progress pr
+    where pr.user_id = auth.uid()
+      and (p_days is null or pr.recorded_at >= now() - make_interval(days => p_days))
+),
+ex as (
+    -- Dicionário de exercícios: as linhas de progresso referenciam a posição
+    select e.id,
+           coalesce(e.nome, 'Exercício') as nome,
+           coalesce(e.grupo_muscular, 'Outros') as grupo_muscular,
+           (row_number() over (order by e.id)) - 1 as idx
+    from exercicios e
+    where e.id in (select distinct exercise_id from prog)
+)
+select jsonb_build_object(
+    'total_plans', (select count(*) from plans),
+    'total_exercises', (select coalesce(sum(exercises), 0) from plans),
+    'plans_by_day', coalesce((
+        select jsonb_object_agg(day, items)
+        from (
+            select day,
+                   jsonb_agg(
+                       jsonb_build_object(
+                           'plan_id', plan_id,
+                           'title', title,
+                           'exercises', exercises,
+                           'created_at', created_at
+                       )
+                       order by created_at
+                   ) as items
+            from plans
+            group by day
+        ) d
+    ), '{}'::jsonb),
+    'exercises_by_muscle', coalesce((
+        select jsonb_object_agg(muscle_group, total) from plan_muscles
+    ), '{}'::jsonb),
+    'exercises', coalesce((
+        select jsonb_agg(
+            jsonb_build_object('id', id, 'nome', nome, 'grupo_muscular', grupo_muscular)
+            order by idx
+        )
+        from ex
+    ), '[]'::jsonb),
+    'recorded_at', coalesce((
+        select jsonb_agg(extract(epoch from p.recorded_at) order by p.recorded_at, p.id)
+        from prog p join ex on ex.id = p.exercise_id
+    ), '[]'::jsonb),
+    'exercise_idx', coalesce((
+        select jsonb_agg(ex.idx order by p.recorded_at, p.id)
+        from prog p join ex on ex.id = p.exercise_id
+    ), '[]'::jsonb),
+    'load', coalesce((
+        select jsonb_agg(p.load order by p.recorded_at, p.id)
+        from prog p join ex on ex.id = p.exercise_id
+    ), '[]'::jsonb)
+);
+$$;
+
+grant execute on function public.get_history_columns(integer) to authenticated;
@@ -0,0 +1,8 @@
+-- Índices para a paginação por keyset do feed da comunidade
+-- (order by created_at desc, id desc, com filtro opcional por categoria).
+
+create index if not exists victories_feed_idx
+    on public.victories (created_at desc, id desc);
+
+create index if not exists victories_category_feed_idx
+    on public.victories (category, created_at desc, id desc);
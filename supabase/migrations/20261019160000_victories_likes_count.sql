@@ -0,0 +1,38 @@
+-- Contagem de likes mantida por trigger em victories.likes_count.
+-- O feed recebe um inteiro por vitória em vez de todas as linhas de
+-- victory_likes (antes contadas no app).
+
+alter table public.victories add column if not exists likes_count integer not null default 0;
+
+update public.victories v
+set likes_count = coalesce(l.total, 0)
+from (
+    select victory_id, count(*)::integer as total
+    from public.victory_likes
+    group by victory_id
+) l
+where l.victory_id = v.id;
+
+-- security definer: quem curte não tem permissão de update na vitória alheia
+create or replace function public.victory_likes_count_trigger()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if tg_op = 'INSERT' then
+        update victories set likes_count = likes_count + 1 where id = new.victory_id;
+    elsif tg_op = 'DELETE' then
+        update victories set likes_count = greatest(likes_count - 1, 0) where id = old.victory_id;
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists victory_likes_count on public.victory_likes;
+create trigger victory_likes_count after insert or delete on public.victory_likes
+    for each row execute function public.victory_likes_count_trigger();
+
+-- Busca das curtidas do próprio usuário entre as vitórias visíveis
+create index if not exists victory_likes_user_victory_idx on public.victory_likes (user_id, victory_id);
@@ -0,0 +1,24 @@
+-- Feed da comunidade em uma única consulta: cada vitória já vem com o nome
+-- do autor, a contagem de likes e se o usuário da requisição curtiu.
+-- security_invoker: as políticas RLS das tabelas base continuam valendo.
+
+create or replace view public.community_feed
+with (security_invoker = true) as
+select v.id,
+       v.user_id,
+       v.content,
+       v.category,
+       v.created_at,
+       v.likes_count,
+       coalesce(nullif(ppi.name, ''), nullif(up.name, '')) as author_name,
+       exists (
+           select 1
+           from public.victory_likes vl
+           where vl.victory_id = v.id
+             and vl.user_id = auth.uid()
+       ) as liked_by_me
+from public.victories v
+left join public.public_profile_info ppi on ppi.user_id = v.user_id
+left join public.user_profiles up on up.user_id = v.user_id;
+
+grant select on public.community_feed to authenticated;
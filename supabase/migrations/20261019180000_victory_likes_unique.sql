@@ -0,0 +1,11 @@
+-- Uma curtida por usuário e vitória: permite gravar o like com upsert
+-- (on_conflict victory_id,user_id) a partir da fila com debounce do app.
+
+delete from public.victory_likes a
+using public.victory_likes b
+where a.victory_id = b.victory_id
+  and a.user_id = b.user_id
+  and a.ctid > b.ctid;
+
+create unique index if not exists victory_likes_victory_user_key
+    on public.victory_likes (victory_id, user_id);
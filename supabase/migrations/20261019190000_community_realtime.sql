@@ -0,0 +1,30 @@
+-- Feed da comunidade em tempo real (services/realtime_feed.py).
+-- victories e victory_likes passam a publicar mudanças no Supabase Realtime.
+-- O app assina só os INSERT de victory_likes filtrados pelo próprio
+-- user_id. victory_likes fica com a replica identity padrão: o DELETE não
+-- é filtrado pelo Realtime e, com o registro antigo completo, revelaria a
+-- todos quem descurtiu o quê.
+
+alter table public.victory_likes replica identity default;
+
+do $$
+begin
+    if not exists (
+        select 1 from pg_publication_tables
+        where pubname = 'supabase_realtime'
+          and schemaname = 'public'
+          and tablename = 'victories'
+    ) then
+        alter publication supabase_realtime add table public.victories;
+    end if;
+
+    if not exists (
+        select 1 from pg_publication_tables
+        where pubname = 'supabase_realtime'
+          and schemaname = 'public'
+          and tablename = 'victory_likes'
+    ) then
+        alter publication supabase_realtime add table public.victory_likes;
+    end if;
+end
+$$;
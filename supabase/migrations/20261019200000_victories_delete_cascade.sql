@@ -0,0 +1,76 @@
+-- Exclusão de vitórias em uma única requisição:
+-- DELETE ... RETURNING guardado por RLS (só o autor) e curtidas removidas
+-- pelo banco via on delete cascade.
+
+delete from public.victory_likes vl
+where not exists (select 1 from public.victories v where v.id = vl.victory_id);
+
+do $$
+declare
+    fk record;
+begin
+    for fk in
+        select conname
+        from pg_constraint
+        where conrelid = 'public.victory_likes'::regclass
+          and confrelid = 'public.victories'::regclass
+          and contype = 'f'
+    loop
+        execute format('alter table public.victory_likes drop constraint %I', fk.conname);
+    end loop;
+end
+$$;
+
+alter table public.victory_likes
+    add constraint victory_likes_victory_id_fkey
+    foreign key (victory_id) references public.victories (id) on delete cascade;
+
+-- Ligar RLS sem políticas para as demais operações bloquearia o feed
+-- (community_feed é security_invoker), as publicações e as edições. Cada
+-- política só é criada se ainda não houver uma para a operação.
+do $$
+begin
+    if not exists (
+        select 1 from pg_policies
+        where schemaname = 'public' and tablename = 'victories'
+          and cmd in ('SELECT', 'ALL')
+    ) then
+        create policy "Vitórias visíveis a usuários autenticados" on public.victories
+            for select to authenticated
+            using (true);
+    end if;
+
+    if not exists (
+        select 1 from pg_policies
+        where schemaname = 'public' and tablename = 'victories'
+          and cmd in ('INSERT', 'ALL')
+    ) then
+        create policy "Autor publica a própria vitória" on public.victories
+            for insert to authenticated
+            with check (user_id = auth.uid());
+    end if;
+
+    if not exists (
+        select 1 from pg_policies
+        where schemaname = 'public' and tablename = 'victories'
+          and cmd in ('UPDATE', 'ALL')
+    ) then
+        create policy "Autor edita a própria vitória" on public.victories
+            for update to authenticated
+            using (user_id = auth.uid())
+            with check (user_id = auth.uid());
+    end if;
+
+    if not exists (
+        select 1 from pg_policies
+        where schemaname = 'public' and tablename = 'victories'
+          and cmd in ('DELETE', 'ALL')
+    ) then
+        create policy "Autor exclui a própria vitória" on public.victories
+            for delete to authenticated
+            using (user_id = auth.uid());
+    end if;
+end
+$$;
+
+alter table public.victories enable row level security;
@@ -0,0 +1,52 @@
+-- Histórico do chat do treinador em páginas.
+-- O histórico fica em um único array JSON por usuário (trainer_qa.message);
+-- a função devolve só uma janela dele, com a posição de cada mensagem
+-- (seq, 1-based) como cursor. Mensagens de ferramenta e vazias ficam de
+-- fora e não contam na posição, o mesmo filtro que o app aplica ao regravar
+-- o histórico (save_conversation_history), então seq não muda entre
+-- gravações. Versões antigas gravaram o array como string JSON.
+--   p_before: mensagens anteriores a essa posição (nulo = as mais recentes)
+--   p_after:  mensagens posteriores a essa posição, da mais antiga em diante
+-- As linhas saem sempre em ordem cronológica.
+
+create or replace function public.get_trainer_history_page(
+    p_before integer default null,
+    p_after integer default null,
+    p_limit integer default 20
+)
+returns table (seq integer, message jsonb)
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+with history as (
+    select case jsonb_typeof(q.message::jsonb)
+               when 'array' then q.message::jsonb
+               when 'string' then (q.message::jsonb #>> '{}')::jsonb
+               else '[]'::jsonb
+           end as messages
+    from trainer_qa q
+    where q.user_id = auth.uid()
+),
+items as (
+    select (row_number() over (order by m.ord))::integer as seq, m.message
+    from history h
+    cross join lateral jsonb_array_elements(h.messages) with ordinality as m(message, ord)
+    where m.message->>'role' in ('user', 'assistant')
+      and coalesce(m.message->>'content', '') <> ''
+),
+window_rows as (
+    select i.seq, i.message
+    from items i
+    where (p_before is null or i.seq < p_before)
+      and (p_after is null or i.seq > p_after)
+    order by case when p_after is null then -i.seq else i.seq end
+    limit least(greatest(coalesce(p_limit, 20), 1), 100)
+)
+select w.seq, w.message
+from window_rows w
+order by w.seq;
+$$;
+
+grant execute on function public.get_trainer_history_page(integer, integer, integer) to authenticated;
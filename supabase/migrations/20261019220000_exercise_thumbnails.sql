@@ -0,0 +1,11 @@
+-- Pôsteres dos vídeos de exercícios.
+-- services/thumbnail_job.py extrai um quadro de cada url_video, grava
+-- <exercise_id>.webp no bucket público exercise-thumbnails e preenche
+-- exercicios.thumbnail_url. A atualização muda updated_at, então o pull
+-- incremental leva a nova coluna aos bancos locais.
+
+alter table public.exercicios add column if not exists thumbnail_url text;
+
+insert into storage.buckets (id, name, public, allowed_mime_types)
+values ('exercise-thumbnails', 'exercise-thumbnails', true, array['image/webp'])
+on conflict (id) do nothing;
@@ -0,0 +1,221 @@
+-- Estatísticas agregadas da página /history para períodos longos e usuários
+-- com muito progresso.
+--
+-- get_history_columns passa a cobrir só a janela curta (7/30/90 dias, trocados
+-- localmente) e ganha um teto de linhas: acima dele devolve 'truncated' com os
+-- arrays vazios. Nesses casos, e em "Todo período", o app pede
+-- get_history_stats(p_days), que devolve só os agregados (alguns KB) em vez de
+-- uma linha por registro. p_days nulo = todo o histórico.
+
+drop function if exists public.get_history_columns(integer);
+
+create or replace function public.get_history_columns(
+    p_days integer default 90,
+    p_max_rows integer default 5000
+)
+returns jsonb
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+with plans as (
+    select p.plan_id,
+           lower(trim(coalesce(p.day, ''))) as day,
+           p.title,
+           p.created_at,
+           count(pe.plan_exercise_id) as exercises
+    from user_plans p
+    left join plan_exercises pe on pe.plan_id = p.plan_id
+    where p.user_id = auth.uid()
+    group by p.plan_id, p.day, p.title, p.created_at
+),
+plan_muscles as (
+    select coalesce(e.grupo_muscular, 'Outros') as muscle_group,
+           count(distinct e.nome) as total
+    from user_plans p
+    join plan_exercises pe on pe.plan_id = p.plan_id
+    join exercicios e on e.id = pe.exercise_id
+    where p.user_id = auth.uid()
+    group by 1
+),
+window_rows as (
+    select pr.id, pr.exercise_id, pr.load, pr.recorded_at
+    from progress pr
+    where pr.user_id = auth.uid()
+      and (p_days is null or pr.recorded_at >= now() - make_interval(days => p_days))
+),
+truncated as (
+    -- Conta no máximo p_max_rows + 1 linhas: basta saber se passou do teto
+    select count(*) > p_max_rows as value
+    from (select 1 from window_rows limit p_max_rows + 1) t
+),
+prog as (
+    select w.* from window_rows w where not (select value from truncated)
+),
+ex as (
+    -- Dicionário de exercícios: as linhas de progresso referenciam a posição
+    select e.id,
+           coalesce(e.nome, 'Exercício') as nome,
+           coalesce(e.grupo_muscular, 'Outros') as grupo_muscular,
+           (row_number() over (order by e.id)) - 1 as idx
+    from exercicios e
+    where e.id in (select distinct exercise_id from prog)
+)
+select jsonb_build_object(
+    'truncated', (select value from truncated),
+    'total_plans', (select count(*) from plans),
+    'total_exercises', (select coalesce(sum(exercises), 0) from plans),
+    'plans_by_day', coalesce((
+        select jsonb_object_agg(day, items)
+        from (
+            select day,
+                   jsonb_agg(
+                       jsonb_build_object(
+                           'plan_id', plan_id,
+                           'title', title,
+                           'exercises', exercises,
+                           'created_at', created_at
+                       )
+                       order by created_at
+                   ) as items
+            from plans
+            group by day
+        ) d
+    ), '{}'::jsonb),
+    'exercises_by_muscle', coalesce((
+        select jsonb_object_agg(muscle_group, total) from plan_muscles
+    ), '{}'::jsonb),
+    'exercises', coalesce((
+        select jsonb_agg(
+            jsonb_build_object('id', id, 'nome', nome, 'grupo_muscular', grupo_muscular)
+            order by idx
+        )
+        from ex
+    ), '[]'::jsonb),
+    'recorded_at', coalesce((
+        select jsonb_agg(extract(epoch from p.recorded_at) order by p.recorded_at, p.id)
+        from prog p join ex on ex.id = p.exercise_id
+    ), '[]'::jsonb),
+    'exercise_idx', coalesce((
+        select jsonb_agg(ex.idx order by p.recorded_at, p.id)
+        from prog p join ex on ex.id = p.exercise_id
+    ), '[]'::jsonb),
+    'load', coalesce((
+        select jsonb_agg(p.load order by p.recorded_at, p.id)
+        from prog p join ex on ex.id = p.exercise_id
+    ), '[]'::jsonb)
+);
+$$;
+
+grant execute on function public.get_history_columns(integer, integer) to authenticated;
+
+create or replace function public.get_history_stats(p_days integer default null)
+returns jsonb
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+with plans as (
+    select p.plan_id,
+           lower(trim(coalesce(p.day, ''))) as day,
+           p.title,
+           p.created_at,
+           count(pe.plan_exercise_id) as exercises
+    from user_plans p
+    left join plan_exercises pe on pe.plan_id = p.plan_id
+    where p.user_id = auth.uid()
+    group by p.plan_id, p.day, p.title, p.created_at
+),
+plan_muscles as (
+    select coalesce(e.grupo_muscular, 'Outros') as muscle_group,
+           count(distinct e.nome) as total
+    from user_plans p
+    join plan_exercises pe on pe.plan_id = p.plan_id
+    join exercicios e on e.id = pe.exercise_id
+    where p.user_id = auth.uid()
+    group by 1
+),
+prog as (
+    select pr.exercise_id,
+           pr.load,
+           pr.recorded_at,
+           coalesce(e.nome, 'Exercício') as exercise_name,
+           coalesce(e.grupo_muscular, 'Outros') as muscle_group
+    from progress pr
+    left join exercicios e on e.id = pr.exercise_id
+    where pr.user_id = auth.uid()
+      and (p_days is null or pr.recorded_at >= now() - make_interval(days => p_days))
+),
+per_exercise as (
+    select exercise_name,
+           (array_agg(load order by recorded_at asc))[1] as first_load,
+           (array_agg(load order by recorded_at desc))[1] as last_load,
+           max(load) as pr_load,
+           count(*) as records_count
+    from prog
+    group by exercise_name
+    having count(*) >= 2
+)
+select jsonb_build_object(
+    'total_plans', (select count(*) from plans),
+    'total_exercises', (select coalesce(sum(exercises), 0) from plans),
+    'total_progress_records', (select count(*) from prog),
+    'plans_by_day', coalesce((
+        select jsonb_object_agg(day, items)
+        from (
+            select day,
+                   jsonb_agg(
+                       jsonb_build_object(
+                           'plan_id', plan_id,
+                           'title', title,
+                           'exercises', exercises,
+                           'created_at', created_at
+                       )
+                       order by created_at
+                   ) as items
+            from plans
+            group by day
+        ) d
+    ), '{}'::jsonb),
+    'exercises_by_muscle', coalesce((
+        select jsonb_object_agg(muscle_group, total) from plan_muscles
+    ), '{}'::jsonb),
+    'muscle_group_frequency', coalesce((
+        select jsonb_object_agg(muscle_group, total)
+        from (select muscle_group, count(*) as total from prog group by 1) m
+    ), '{}'::jsonb),
+    -- Lista (e não objeto) para preservar a ordem: mais registros primeiro
+    'load_progression', coalesce((
+        select jsonb_agg(
+            jsonb_build_object(
+                'exercise_name', exercise_name,
+                'first_load', first_load,
+                'last_load', last_load,
+                'pr_load', pr_load,
+                'records_count', records_count,
+                'progression_percent',
+                round(((last_load - first_load)::numeric / first_load::numeric) * 100, 1)
+            )
+            order by records_count desc, exercise_name
+        )
+        from per_exercise
+        where first_load > 0
+    ), '[]'::jsonb),
+    'recent_activities', coalesce((
+        select jsonb_agg(
+            jsonb_build_object(
+                'exercise_name', exercise_name,
+                'load', load,
+                'date', recorded_at,
+                'muscle_group', muscle_group
+            )
+            order by recorded_at desc
+        )
+        from (select * from prog order by recorded_at desc limit 10) r
+    ), '[]'::jsonb)
+);
+$$;
+
+grant execute on function public.get_history_stats(integer) to authenticated;
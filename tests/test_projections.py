@@ -0,0 +1,162 @@
+"""
+Confere se cada projeção de services/query_specs.py traz os campos que as
+suas telas consumidoras leem.
+
+Os acessos são lidos do código-fonte (AST): `var.get("campo")` e
+`var["campo"]` sobre as variáveis que recebem as linhas da projeção. Um
+campo lido e não projetado chega sempre como None/padrão, sem erro algum
+em tempo de execução; aqui ele falha o teste.
+
+Uso: python -m pytest tests/test_projections.py
+"""
+
+import ast
+import os
+import sys
+from typing import Dict, Optional, Set
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from services import query_specs  # noqa: E402
+from services.query_specs import Projection  # noqa: E402
+
+# Espelho local (LocalStore.get_plan_exercises): plan_exercises do sync com
+# o exercício do sync aninhado em `exercicios`
+LOCAL_PLAN_EXERCISES = Projection(
+    query_specs.PLAN_EXERCISE_SYNC.columns,
+    (("exercicios", query_specs.EXERCISE_SYNC),),
+)
+
+# projeção -> [(arquivo, função ou None para o arquivo todo, {variável: prefixo})]
+# O prefixo mapeia variáveis que guardam uma relação aninhada (`exercicios.`).
+CONSUMERS = {
+    "PROFILE_STORE": [
+        ("main.py", "handle_authentication", {"profile": ""}),
+        ("core/load_user_preferences.py", "apply_user_preferences", {"profile": ""}),
+        ("pages/profile_settings/profile_components.py", None, {"profile": ""}),
+        ("pages/training/treino.py", "load_rest_duration", {"profile": ""}),
+        ("pages/auth/login.py", "login", {"profile": ""}),
+        ("services/supabase.py", "_save_profile_flags", {"profile": ""}),
+    ],
+    "PROFILE_TRAINER": [
+        ("services/openai.py", "get_system_prompt", {"user_data": ""}),
+        ("pages/trainer_chat/chat_logic.py", None, {"user_data": ""}),
+        ("pages/trainer_chat/chat_window.py", None, {"user_data": ""}),
+        ("pages/trainer_chat/trainer_main.py", None, {"user_data": ""}),
+    ],
+    "COMMUNITY_FEED": [
+        ("pages/community/service.py", "_apply_feed_fields", {"v": "", "victory": ""}),
+    ],
+    "EXERCISE_CATALOG": [
+        ("services/workout_generator.py", "categorize_exercises", {"exercicio": ""}),
+        ("services/workout_generator.py", "create_workout_plan", {"exercicio": ""}),
+    ],
+    "EXERCISE_THUMBNAIL_JOB": [
+        ("services/thumbnail_job.py", "run", {"row": ""}),
+    ],
+    "LOCAL_PLAN_EXERCISES": [
+        (
+            "pages/training/treino.py",
+            "load_local_exercises",
+            {"plan_ex": "", "exercise": "exercicios."},
+        ),
+    ],
+}
+
+# Projeções servidas a partir de outra: a derivada precisa caber na de origem
+DERIVED = [("PROFILE_TRAINER", "PROFILE_STORE")]
+
+
+def _target_name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _string(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def accessed_fields(path: str, function: Optional[str], variables: Dict[str, str]) -> Set[str]:
+    """Campos lidos das variáveis em `function` (ou no arquivo inteiro)."""
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    if function:
+        scopes = [
+            node
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name == function
+        ]
+        assert scopes, f"{path}: função {function} não encontrada"
+    else:
+        scopes = [tree]
+
+    fields = set()
+    for scope in scopes:
+        for node in ast.walk(scope):
+            target = key = None
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr == "get"
+                and node.args
+            ):
+                target, key = node.func.value, _string(node.args[0])
+            elif isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Load):
+                target, key = node.value, _string(node.slice)
+            name = _target_name(target) if target is not None else None
+            if key and name in variables:
+                fields.add(variables[name] + key)
+    return fields
+
+
+def _projection(name: str) -> Projection:
+    if name == "LOCAL_PLAN_EXERCISES":
+        return LOCAL_PLAN_EXERCISES
+    return getattr(query_specs, name)
+
+
+def _where(path: str, function: Optional[str]) -> str:
+    return f"{path}:{function}" if function else path
+
+
+@pytest.mark.parametrize(
+    "spec_name, path, function, variables",
+    [
+        (spec_name, path, function, variables)
+        for spec_name, consumers in CONSUMERS.items()
+        for path, function, variables in consumers
+    ],
+    ids=lambda value: value if isinstance(value, str) else "",
+)
+def test_projection_covers_consumer(spec_name, path, function, variables):
+    read = accessed_fields(path, function, variables)
+    assert read, f"{_where(path, function)}: nenhum campo lido (consumidor renomeado?)"
+    missing = read - _projection(spec_name).fields
+    assert not missing, (
+        f"{_where(path, function)} lê campos fora de {spec_name}: {sorted(missing)}"
+    )
+
+
+@pytest.mark.parametrize("derived, source", DERIVED)
+def test_derived_projection_fits_source(derived, source):
+    missing = _projection(derived).fields - _projection(source).fields
+    assert not missing, f"{derived} não cabe em {source}: {sorted(missing)}"
+
+
+def test_no_select_star():
+    """Nenhuma projeção volta a pedir todas as colunas."""
+    star = [
+        name
+        for name, value in vars(query_specs).items()
+        if isinstance(value, Projection) and "*" in value.select
+    ]
+    assert not star, f"Projeções com select(\"*\"): {star}"